@@ -6,12 +6,13 @@ from dataclasses import dataclass, field
 import datetime
 from decimal import Decimal, InvalidOperation
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+from app.decimal_math import decimal_power, decimal_root
 from app.exceptions import OperationError
 
 
-@dataclass
+@dataclass(slots=True)
 class Calculation:
     """
     Value Object representing a single calculation.
@@ -20,6 +21,9 @@ class Calculation:
     operation performed, operands involved, the result, and the timestamp of the
     calculation. It provides methods for performing the calculation, serializing
     the data for storage, and deserializing data to recreate a Calculation instance.
+
+    Instances use __slots__ instead of a per-instance __dict__ to keep large
+    histories small in memory.
     """
 
     # Required fields
@@ -28,19 +32,21 @@ class Calculation:
     operand2: Decimal       # The second operand in the calculation
 
     # Fields with default values
-    result: Decimal = field(init=False)  # The result of the calculation, computed post-initialization
+    result: Optional[Decimal] = None  # The result of the calculation, computed post-initialization when not supplied
     timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)  # Time when the calculation was performed
 
     def __post_init__(self):
         """
         Post-initialization processing.
 
-        Automatically calculates the result of the operation after the Calculation
-        instance is created.
+        Calculates the result of the operation after the Calculation instance is
+        created, unless an already-computed result was supplied. Callers that have
+        just executed the operation pass the result in so it is evaluated only once.
         """
-        self.result = self.calculate()
+        if self.result is None:
+            self.result = self.calculate()
 
-    def calculate(self) -> Decimal:
+    def calculate(self, precision: Optional[int] = None) -> Decimal:
         """
         Execute calculation using the specified operation.
 
@@ -48,6 +54,10 @@ class Calculation:
         lambda functions, enabling dynamic execution of operations based on
         the operation name.
 
+        Args:
+            precision (Optional[int], optional): Significant digits for Power and
+                Root results. Defaults to the active decimal context precision.
+
         Returns:
             Decimal: The result of the calculation.
 
@@ -60,10 +70,10 @@ class Calculation:
             "Subtraction": lambda x, y: x - y,
             "Multiplication": lambda x, y: x * y,
             "Division": lambda x, y: x / y if y != 0 else self._raise_div_zero(),
-            "Power": lambda x, y: Decimal(pow(float(x), float(y))) if y >= 0 else self._raise_neg_power(),
+            "Power": lambda x, y: decimal_power(x, y, precision) if y >= 0 else self._raise_neg_power(),
             "Root": lambda x, y: (
-                Decimal(pow(float(x), 1 / float(y))) 
-                if x >= 0 and y != 0 
+                decimal_root(x, y, precision)
+                if x >= 0 and y != 0
                 else self._raise_invalid_root(x, y)
             ),
             
@@ -154,23 +164,28 @@ class Calculation:
             OperationError: If data is invalid or missing required fields.
         """
         try:
-            # Create the calculation object with the original operands
+            # Keep the saved result: Power and Root results are stored at the
+            # calculator's configured precision, not the context precision
+            saved_result = Decimal(data['result'])
             calc = Calculation(
                 operation=data['operation'],
                 operand1=Decimal(data['operand1']),
-                operand2=Decimal(data['operand2'])
+                operand2=Decimal(data['operand2']),
+                result=saved_result,
+                timestamp=datetime.datetime.fromisoformat(data['timestamp'])
             )
 
-            # Set the timestamp from the saved data
-            calc.timestamp = datetime.datetime.fromisoformat(data['timestamp'])
-
-            # Verify the result matches (helps catch data corruption)
-            saved_result = Decimal(data['result'])
-            if calc.result != saved_result:
+            # Verify the result matches (helps catch data corruption), at the
+            # precision the saved result was rounded to
+            precision = None
+            if calc.operation in ("Power", "Root") and saved_result.is_finite():
+                precision = len(saved_result.as_tuple().digits)
+            computed = calc.calculate(precision)
+            if computed != saved_result:
                 logging.warning(
-                    f"Loaded calculation result {saved_result} "
-                    f"differs from computed result {calc.result}"
-                )  # pragma: no cover
+                    "Loaded calculation result %s differs from computed result %s",
+                    saved_result, computed
+                )
 
             return calc
 
@@ -261,8 +276,46 @@ class CalculationFactory:
     Factory class to create Calculation instances based on operation name and inputs.
     """
 
-    @staticmethod
-    def create(operation_name: str, operand1: float, operand2: float) -> Calculation:
+    # Mapping of REPL command names to Calculation operation names
+    name_map: Dict[str, str] = {
+        "add": "Addition",
+        "subtract": "Subtraction",
+        "multiply": "Multiplication",
+        "divide": "Division",
+        "power": "Power",
+        "root": "Root",
+        "modulus": "Modulus"
+    }
+
+    @classmethod
+    def resolve_operation(cls, operation_name: str) -> str:
+        """
+        Resolve a command name to its Calculation operation name.
+
+        Checks that the operation is supported without evaluating anything.
+
+        Args:
+            operation_name (str): The name of the operation (e.g., "add", "subtract").
+
+        Returns:
+            str: The operation name used by Calculation (e.g., "Addition").
+
+        Raises:
+            OperationError: If the operation is not supported.
+        """
+        operation = cls.name_map.get(operation_name.lower())
+        if not operation:
+            raise OperationError(f"Unsupported operation: {operation_name}")    # pragma: no cover
+        return operation
+
+    @classmethod
+    def create(
+        cls,
+        operation_name: str,
+        operand1: float,
+        operand2: float,
+        result: Optional[Decimal] = None
+    ) -> Calculation:
         """
         Create a Calculation object with properly formatted operands.
 
@@ -270,27 +323,15 @@ class CalculationFactory:
             operation_name (str): The name of the operation (e.g., "add", "subtract").
             operand1 (float): First operand.
             operand2 (float): Second operand.
+            result (Optional[Decimal], optional): An already-computed result. When
+                given, the operation is not evaluated again. Defaults to None.
 
         Returns:
             Calculation: A new Calculation instance.
         """
-        name_map = {
-            "add": "Addition",
-            "subtract": "Subtraction",
-            "multiply": "Multiplication",
-            "divide": "Division",
-            "power": "Power",
-            "root": "Root",
-            "modulus": "Modulus"
-        }
-
-        operation = name_map.get(operation_name.lower())
-        if not operation:
-            raise OperationError(f"Unsupported operation: {operation_name}")    # pragma: no cover
-
         return Calculation(
-            operation=operation,
+            operation=cls.resolve_operation(operation_name),
             operand1=Decimal(operand1),
-            operand2=Decimal(operand2)
+            operand2=Decimal(operand2),
+            result=result
         )
-
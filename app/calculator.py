@@ -2,21 +2,42 @@
 # Calculator Class      #
 ########################
 
-from decimal import Decimal
+from collections import deque
+from contextlib import ExitStack
+import csv
+import datetime
+from decimal import Decimal, InvalidOperation, getcontext
+from itertools import count
 import logging
+from operator import itemgetter
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-
-import pandas as pd
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 from app.calculation import Calculation
 from app.calculator_config import CalculatorConfig
-from app.calculator_memento import CalculatorMemento
+from app.calculator_memento import CalculatorMemento, HistoryDelta
 from app.exceptions import OperationError, ValidationError
+from app.expression import compile_expression
 from app.history import HistoryObserver
+from app.history_binary import BinaryHistoryReader, read_csv_records, write_binary_history
+from app.history_export import EXPORT_FORMATS, write_records
+from app.history_frame import HistoryFrame
+from app.history_index import HistoryIndex
+from app.history_sqlite import SQLiteHistoryStore
+from app.history_buffer import HISTORY_COLUMNS, HistoryBuffer, HistoryRecord, LazyRow, calculation_record
 from app.input_validators import InputValidator
-from app.operations import Operation
+from app.instrumentation import StageTimer
+from app.lazy_import import LazyModule
+from app.logging_setup import configure_logging
+from app.observer_dispatcher import BackgroundDispatcher
+from app.operation_cache import OperationCache
+from app.operations import Operation, OperationFactory
+from app.parallel import evaluate_parallel
+
+# pandas is only imported when a pandas code path is used
+pd = LazyModule('pandas')
 
 # Type aliases for better readability
 Number = Union[int, float, Decimal]
@@ -58,15 +79,56 @@ class Calculator:
         self._setup_logging()
 
         # Initialize calculation history and operation strategy
-        self.history: List[Calculation] = []
+        self.history = HistoryBuffer(self.config.max_history_size)
         self.operation_strategy: Optional[Operation] = None
 
+        # Optional LRU cache of operation results
+        self.operation_cache: Optional[OperationCache] = (
+            OperationCache(self.config.cache_size) if self.config.cache_size else None
+        )
+
+        # Optional per-stage timing of perform_operation
+        self.timer: Optional[StageTimer] = StageTimer() if self.config.instrumentation else None
+
         # Initialize observer list for the Observer pattern
         self.observers: List[HistoryObserver] = []
 
-        # Initialize stacks for undo and redo functionality using the Memento pattern
-        self.undo_stack: List[CalculatorMemento] = []
-        self.redo_stack: List[CalculatorMemento] = []
+        # Optionally deliver observer notifications on a background thread
+        self._dispatcher: Optional[BackgroundDispatcher] = None
+        if self.config.observer_dispatch == 'async':
+            self._dispatcher = BackgroundDispatcher(
+                self.observers,
+                maxsize=self.config.observer_queue_size,
+                policy=self.config.observer_backpressure
+            )
+
+        # Initialize stacks of history changes for undo and redo functionality
+        self.undo_stack: List[HistoryDelta] = []
+        self.redo_stack: List[HistoryDelta] = []
+
+        # Track whether the history file mirrors the history so journal appends are safe
+        self._journal_in_sync = False
+        self._journal_appends = 0
+
+        # Number of completed full saves, so observers can tell their pending work was written
+        self.save_count = 0
+
+        # Serializes writes of the history file with changes to the history,
+        # which may come from different threads (e.g. an auto-save timer)
+        self._state_lock = threading.RLock()
+
+        # Secondary indexes for query_history(), built on first use
+        self._history_index: Optional[HistoryIndex] = None
+
+        # Column buffers for get_history_dataframe(), filled on first use
+        self._history_frame: Optional[HistoryFrame] = None
+
+        # Open SQLite history database, when history_format is 'sqlite'
+        self._history_db: Optional[SQLiteHistoryStore] = None
+
+        # The database keeps rows evicted from memory; the entry with sequence
+        # number s of self.history is its row number _history_db_base + s
+        self._history_db_base = 0
 
         # Create required directories for history management
         self._setup_directories()
@@ -76,7 +138,7 @@ class Calculator:
             self.load_history()
         except Exception as e:
             # Log a warning if history could not be loaded
-            logging.warning(f"Could not load existing history: {e}")
+            logging.warning("Could not load existing history: %s", e)
 
         # Log the successful initialization of the calculator
         logging.info("Calculator initialized with configuration")
@@ -85,21 +147,16 @@ class Calculator:
         """
         Configure the logging system.
 
-        Sets up logging to a file with a specified format and log level.
+        Sets up logging to a file with a specified format and log level. With
+        log_mode 'queue', records are written by a background listener thread.
         """
         try:
             # Ensure the log directory exists
             os.makedirs(self.config.log_dir, exist_ok=True)
-            log_file = self.config.log_file.resolve()
-
-            # Configure the basic logging settings
-            logging.basicConfig(
-                filename=str(log_file),
-                level=logging.INFO,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                force=True  # Overwrite any existing logging configuration
-            )
-            logging.info(f"Logging initialized at: {log_file}")
+
+            # Configure the log file handler, directly or behind a queue
+            configure_logging(self.config)
+            logging.info("Logging initialized at: %s", self.config.log_file.resolve())
         except Exception as e:  # pragma: no cover
             # Print an error message and re-raise the exception if logging setup fails  # pragma: no cover
             print(f"Error setting up logging: {e}")  # pragma: no cover
@@ -125,7 +182,7 @@ class Calculator:
             observer (HistoryObserver): The observer to be added.
         """
         self.observers.append(observer)
-        logging.info(f"Added observer: {observer.__class__.__name__}")
+        logging.info("Added observer: %s", observer.__class__.__name__)
 
     def remove_observer(self, observer: HistoryObserver) -> None:
         """
@@ -137,21 +194,85 @@ class Calculator:
             observer (HistoryObserver): The observer to be removed.
         """
         self.observers.remove(observer)
-        logging.info(f"Removed observer: {observer.__class__.__name__}")
+        logging.info("Removed observer: %s", observer.__class__.__name__)
 
     def notify_observers(self, calculation: Calculation) -> None:
         """
         Notify all observers of a new calculation.
 
         Iterates through the list of observers and calls their update method,
-        passing the new calculation as an argument.
+        passing the new calculation as an argument. In async dispatch mode the
+        calculation is queued and delivered on a background thread instead.
 
         Args:
             calculation (Calculation): The latest calculation performed.
         """
+        if self._dispatcher is not None:
+            self._dispatcher.submit(calculation)
+            return
         for observer in self.observers:
             observer.update(calculation)
 
+    def notify_observers_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Notify all observers of a batch of new calculations.
+
+        Each observer receives the whole batch in a single call, so observers
+        with per-event overhead (such as auto-save) only pay it once.
+
+        Args:
+            calculations (List[Calculation]): The calculations performed, in order.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.submit_batch(calculations)
+            return
+        for observer in self.observers:
+            observer.update_batch(calculations)
+
+    def flush_observers(self) -> None:
+        """
+        Wait until every queued observer notification has been delivered.
+
+        Does nothing when observers are notified synchronously.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.flush()
+
+    def run_on_observer_thread(self, callback: Callable[[], None]) -> None:
+        """
+        Run a callback where observer notifications are delivered.
+
+        In async dispatch mode the callback is queued to the dispatch worker,
+        so it runs after the notifications queued before it and never at the
+        same time as an observer; otherwise it runs immediately. Used by
+        observers whose deferred work (e.g. an auto-save deadline) is
+        triggered from another thread.
+
+        Args:
+            callback (Callable[[], None]): The function to run.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.submit_call(callback)
+            return
+        callback()
+
+    def close(self) -> None:
+        """
+        Release background resources.
+
+        Delivers any queued observer notifications and stops the dispatch
+        thread, then lets each observer complete deferred work (such as a
+        coalesced auto-save), and closes the SQLite history database if open.
+        Later notifications are delivered synchronously.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.close()
+        for observer in self.observers:
+            observer.flush()
+        if self._history_db is not None:
+            self._history_db.close()
+            self._history_db = None
+
     def set_operation(self, operation: Operation) -> None:
         """
         Set the current operation strategy.
@@ -163,8 +284,22 @@ class Calculator:
         Args:
             operation (Operation): The operation strategy to be set.
         """
-        self.operation_strategy = operation
-        logging.info(f"Set operation: {operation}")
+        self.operation_strategy = self._bind_precision(operation)
+        logging.info("Set operation: %s", operation)
+
+    def _bind_precision(self, operation: Operation) -> Operation:
+        """
+        Apply the configured precision to an operation that has none.
+
+        Args:
+            operation (Operation): The operation strategy.
+
+        Returns:
+            Operation: The same operation, now carrying a precision.
+        """
+        if operation.precision is None:
+            operation.precision = self.config.precision
+        return operation
 
     def perform_operation(
         self,
@@ -191,160 +326,803 @@ class Calculator:
         if not self.operation_strategy:
             raise OperationError("No operation set")
 
+        # Stage timing costs one truth test per stage when disabled
+        timer = self.timer
+        if timer:
+            timer.start()
+
         try:
             # Validate and convert inputs to Decimal
             validated_a = InputValidator.validate_number(a, self.config)
             validated_b = InputValidator.validate_number(b, self.config)
+            if timer:
+                timer.lap('validate')
 
             # Execute the operation strategy
-            result = self.operation_strategy.execute(validated_a, validated_b)
+            result = self._execute(self.operation_strategy, validated_a, validated_b)
+            if timer:
+                timer.lap('execute')
 
-            # Create a new Calculation instance with the operation details
+            # Record the calculation with the result already computed above
             calculation = Calculation(
                 operation=str(self.operation_strategy),
                 operand1=validated_a,
-                operand2=validated_b
+                operand2=validated_b,
+                result=result
             )
+            if timer:
+                timer.lap('calculation')
 
-            # Save the current state to the undo stack before making changes
-            self.undo_stack.append(CalculatorMemento(self.history.copy()))
-
-            # Clear the redo stack since new operation invalidates the redo history
-            self.redo_stack.clear()
-
-            # Append the new calculation to the history
-            self.history.append(calculation)
-
-            # Ensure the history does not exceed the maximum size
-            if len(self.history) > self.config.max_history_size:
-                self.history.pop(0) # pragma: no cover
+            # Append the calculation and record the change for undo
+            self._record_calculations([calculation])
+            if timer:
+                timer.lap('undo')
 
             # Notify all observers about the new calculation
             self.notify_observers(calculation)
+            if timer:
+                timer.lap('notify')
+                timer.stop()
 
             return result
 
         except ValidationError as e:
             # Log and re-raise validation errors
-            logging.error(f"Validation error: {str(e)}")
+            logging.error("Validation error: %s", e)
             raise
         except Exception as e:
             # Log and raise operation errors for any other exceptions
-            logging.error(f"Operation failed: {str(e)}")
+            logging.error("Operation failed: %s", e)
+            raise OperationError(f"Operation failed: {str(e)}")
+
+    def evaluate(
+        self,
+        operation: Operation,
+        a: Union[str, Number],
+        b: Union[str, Number]
+    ) -> Decimal:
+        """
+        Validate operands and compute a result without recording it.
+
+        Nothing is added to the history or the undo stack and observers are
+        not notified, so streaming many evaluations uses constant memory.
+
+        Args:
+            operation (Operation): The operation strategy.
+            a (Union[str, Number]): The first operand.
+            b (Union[str, Number]): The second operand.
+
+        Returns:
+            Decimal: The result of the operation.
+
+        Raises:
+            OperationError: If the operation fails.
+            ValidationError: If input validation fails.
+        """
+        self._bind_precision(operation)
+        validated_a = InputValidator.validate_number(a, self.config)
+        validated_b = InputValidator.validate_number(b, self.config)
+        try:
+            return self._execute(operation, validated_a, validated_b)
+        except ValidationError:
+            raise
+        except Exception as e:
+            raise OperationError(f"Operation failed: {str(e)}")
+
+    def evaluate_expression(
+        self,
+        expression: str,
+        variables: Optional[Mapping[str, Union[str, Number]]] = None
+    ) -> Decimal:
+        """
+        Evaluate an arithmetic expression such as `(3 + 4) * 2 ^ x root 3`.
+
+        The expression is compiled once per text and precision and cached, so
+        evaluating the same formula with different variable values skips
+        parsing. Numeric literals are validated like variable values when the
+        expression is compiled. Like evaluate(), the result is not recorded in
+        the history.
+
+        Args:
+            expression (str): The expression text.
+            variables (Optional[Mapping[str, Union[str, Number]]], optional):
+                Values for the variables used in the expression. Defaults to None.
+
+        Returns:
+            Decimal: The value of the expression.
+
+        Raises:
+            OperationError: If an operation fails.
+            ValidationError: If the expression is malformed, a literal or
+                variable is invalid, a variable is undefined, or an operation
+                rejects its operands.
+        """
+        bindings = {
+            name: InputValidator.validate_number(value, self.config)
+            for name, value in (variables or {}).items()
+        }
+        compiled = compile_expression(expression, self.config.precision, self.config)
+        try:
+            return compiled.evaluate(bindings)
+        except ValidationError:
+            raise
+        except Exception as e:
             raise OperationError(f"Operation failed: {str(e)}")
 
+    def _execute(self, operation: Operation, a: Decimal, b: Decimal) -> Decimal:
+        """
+        Execute an operation, going through the result cache when enabled.
+
+        Cache keys combine the operation type, its precision, the active
+        decimal context precision (which rounds Division and Multiplication
+        results) and the validated (normalized) operands.
+
+        Args:
+            operation (Operation): The operation strategy.
+            a (Decimal): The first validated operand.
+            b (Decimal): The second validated operand.
+
+        Returns:
+            Decimal: The result of the operation.
+        """
+        cache = self.operation_cache
+        if cache is None:
+            return operation.execute(a, b)
+        key = (type(operation), operation.precision, getcontext().prec, a, b)
+        result = cache.get(key)
+        if result is None:
+            result = operation.execute(a, b)
+            cache.put(key, result)
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-stage timings of perform_operation.
+
+        Stages are 'validate', 'execute', 'calculation', 'undo' (history and
+        undo bookkeeping), 'notify' and 'total'. Only successful calculations
+        are counted.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Histogram summaries (count, mean, min,
+                max and percentiles in nanoseconds) keyed by stage. Empty when
+                instrumentation is disabled.
+        """
+        if self.timer is None:
+            return {}
+        return self.timer.stats()
+
+    def dump_stats(self, path: Union[str, Path]) -> None:
+        """
+        Write the per-stage timings to a JSON file.
+
+        Args:
+            path (Union[str, Path]): The output file.
+
+        Raises:
+            OperationError: If instrumentation is disabled.
+        """
+        if self.timer is None:
+            raise OperationError("Instrumentation is disabled")
+        self.timer.dump(path)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Get operation result cache counters.
+
+        Returns:
+            Dict[str, int]: hits, misses, evictions, size and maxsize. All zero
+                when caching is disabled.
+        """
+        if self.operation_cache is None:
+            return {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 0}
+        return self.operation_cache.stats()
+
+    def _record_calculations(self, calculations: List[Calculation]) -> None:
+        """
+        Append calculations to the history and record the change for undo.
+
+        Evicts the oldest entries beyond the maximum history size and pushes a
+        single HistoryDelta describing the append and eviction onto the undo
+        stack. Any pending redo steps are discarded.
+
+        Args:
+            calculations (List[Calculation]): The calculations to append, in order.
+        """
+        with self._state_lock:
+            # Evict the oldest entries beyond the maximum size in O(1) per entry
+            maxlen = self.config.max_history_size
+            self.history.maxlen = maxlen
+            if len(calculations) > maxlen:
+                # Only the newest maxlen calculations survive; the rest never
+                # enter the history, so the delta neither appends nor evicts them
+                calculations = calculations[-maxlen:]
+            evicted = self.history.extend(calculations)
+
+            self.undo_stack.append(HistoryDelta(appended=list(calculations), evicted=evicted))
+
+            # Clear the redo stack since new operation invalidates the redo history
+            self.redo_stack.clear()
+
+    def perform_batch(
+        self,
+        operation: Union[str, Operation],
+        pairs: Iterable[Tuple[Union[str, Number], Union[str, Number]]],
+        workers: int = 1,
+        chunk_size: Optional[int] = None
+    ) -> List[Decimal]:
+        """
+        Perform one operation over many operand pairs in a single call.
+
+        All pairs are validated and executed before anything is recorded, so a
+        failing pair leaves the history untouched. The successful batch is then
+        added to the history with a single extend, a single undo checkpoint and
+        one batched observer notification.
+
+        With more than one worker the pairs are evaluated in chunks by a process
+        pool (see app.parallel); results keep their input order. The result
+        cache is bypassed in that case.
+
+        Args:
+            operation (Union[str, Operation]): The operation strategy, or its
+                factory name (e.g. 'add').
+            pairs (Iterable[Tuple[Union[str, Number], Union[str, Number]]]):
+                Operand pairs to evaluate.
+            workers (int, optional): Number of worker processes. Defaults to 1,
+                meaning evaluation in this process.
+            chunk_size (Optional[int], optional): Pairs per worker task. Defaults
+                to an even split.
+
+        Returns:
+            List[Decimal]: The results, in the same order as the input pairs.
+
+        Raises:
+            OperationError: If the operation is unknown or fails for any pair.
+            ValidationError: If any operand fails validation.
+        """
+        try:
+            if isinstance(operation, str):
+                operation = OperationFactory.create_operation(operation)
+        except ValueError as e:
+            raise OperationError(str(e))
+        self._bind_precision(operation)
+
+        operation_name = str(operation)
+
+        if workers > 1:
+            try:
+                rows = evaluate_parallel(operation, list(pairs), self.config, workers, chunk_size)
+            except (ValidationError, OperationError) as e:
+                logging.error("Parallel batch failed: %s", e)
+                raise
+        else:
+            rows = []
+            for index, (a, b) in enumerate(pairs):
+                try:
+                    validated_a = InputValidator.validate_number(a, self.config)
+                    validated_b = InputValidator.validate_number(b, self.config)
+                    result = self._execute(operation, validated_a, validated_b)
+                except ValidationError as e:
+                    logging.error("Validation error in batch at index %s: %s", index, e)
+                    raise ValidationError(f"Pair {index}: {str(e)}") from e
+                except Exception as e:
+                    logging.error("Batch operation failed at index %s: %s", index, e)
+                    raise OperationError(f"Operation failed for pair {index}: {str(e)}") from e
+                rows.append((validated_a, validated_b, result))
+
+        if not rows:
+            return []
+
+        calculations = [
+            Calculation(operation=operation_name, operand1=a, operand2=b, result=result)
+            for a, b, result in rows
+        ]
+
+        # One history extend and one undo checkpoint for the whole batch
+        self._record_calculations(calculations)
+
+        self.notify_observers_batch(calculations)
+        logging.info("Batch of %s %s calculations performed", len(calculations), operation_name)
+
+        return [result for _, _, result in rows]
+
     def save_history(self) -> None:
         """
-        Save calculation history to a CSV file using pandas.
+        Save calculation history to a file.
 
-        Serializes the history of calculations and writes them to a CSV file for
-        persistent storage. Utilizes pandas DataFrames for efficient data handling.
+        Serializes the history of calculations and writes them to the history
+        file for persistent storage. With config.history_format 'binary' the
+        file is written in the memory-mappable binary format, and with 'sqlite'
+        the rows of an SQLite database are replaced; otherwise it is a CSV file
+        written with the stdlib csv module or pandas depending on
+        config.history_backend.
 
         Raises:
             OperationError: If saving the history fails.
         """
+        # Deliver queued notifications first so no calculation events are lost
+        self.flush_observers()
+
+        with self._state_lock:
+            try:
+                # Ensure the history directory exists
+                self.config.history_dir.mkdir(parents=True, exist_ok=True)
+
+                # Serialize each entry to text; lazily loaded rows are written as read
+                records = self.history.records()
+
+                if self.config.history_format == 'binary':
+                    write_binary_history(self.config.history_file, records)
+                elif self.config.history_format == 'sqlite':
+                    # Keep the rows evicted from memory and rewrite the rest
+                    kept = self._open_history_db().replace(
+                        records, keep=self._history_db_base + self.history.start
+                    )
+                    self._history_db_base = kept - self.history.start
+                elif self._use_pandas():
+                    history_data = list(records)
+                    if history_data:
+                        # Create a pandas DataFrame from the history data
+                        df = pd.DataFrame(history_data, columns=HISTORY_COLUMNS)
+                        # Write the DataFrame to a CSV file without the index
+                        df.to_csv(self.config.history_file, index=False)
+                    else:
+                        # If history is empty, create an empty CSV with headers
+                        pd.DataFrame(columns=HISTORY_COLUMNS).to_csv(self.config.history_file, index=False)
+                else:
+                    with open(self.config.history_file, 'w', newline='', encoding='utf-8') as f:
+                        writer = csv.writer(f, lineterminator='\n')
+                        writer.writerow(HISTORY_COLUMNS)
+                        writer.writerows(records)
+                logging.info("History saved successfully to %s", self.config.history_file)
+
+                # The file now mirrors the history, so journal appends can resume
+                self._journal_in_sync = True
+                self._journal_appends = 0
+                self.save_count += 1
+
+            except Exception as e:  # pragma: no cover
+                # Log and raise an OperationError if saving fails   # pragma: no cover
+                logging.error("Failed to save history: %s", e)   # pragma: no cover
+                raise OperationError(f"Failed to save history: {e}")    # pragma: no cover
+
+    def export_history(
+        self,
+        path: Union[str, Path],
+        format: str = 'csv',
+        chunk_size: int = 10000,
+        source: str = 'history'
+    ) -> int:
+        """
+        Export calculation history to a CSV or JSONL file, streaming it in chunks.
+
+        Rows are converted and written chunk_size at a time, so no list of
+        rows or DataFrame of the whole history is built: exporting the history
+        in memory only adds a list of references to its entries, and exporting
+        the history file needs constant memory. Lazily loaded rows are written
+        as loaded, without being materialized.
+
+        Args:
+            path (Union[str, Path]): The file to write.
+            format (str, optional): 'csv' (with a header row) or 'jsonl' (one
+                object per row). Defaults to 'csv'.
+            chunk_size (int, optional): Rows per chunk. Defaults to 10000.
+            source (str, optional): 'history' to export the calculations in
+                memory, or 'file' to stream the history file (CSV, binary or
+                SQLite), which in journal mode may hold more rows than are
+                kept in memory. Defaults to 'history'.
+
+        Returns:
+            int: Number of rows exported.
+
+        Raises:
+            OperationError: If an argument is invalid or the export fails.
+        """
+        if source not in ('history', 'file'):
+            raise OperationError(f"Unknown export source: {source}")
+        if format not in EXPORT_FORMATS:
+            raise OperationError(f"Unknown export format: {format}")
+        if chunk_size <= 0:
+            raise OperationError("chunk_size must be positive")
+        # Deliver queued notifications first, as save_history() does
+        self.flush_observers()
+
         try:
-            # Ensure the history directory exists
-            self.config.history_dir.mkdir(parents=True, exist_ok=True)
-
-            history_data = []
-            for calc in self.history:
-                # Serialize each Calculation instance to a dictionary
-                history_data.append({
-                    'operation': str(calc.operation),
-                    'operand1': str(calc.operand1),
-                    'operand2': str(calc.operand2),
-                    'result': str(calc.result),
-                    'timestamp': calc.timestamp.isoformat()
-                })
-
-            if history_data:
-                # Create a pandas DataFrame from the history data
-                df = pd.DataFrame(history_data)
-                # Write the DataFrame to a CSV file without the index
-                df.to_csv(self.config.history_file, index=False)
-                logging.info(f"History saved successfully to {self.config.history_file}")
-            else:
-                # If history is empty, create an empty CSV with headers
-                pd.DataFrame(columns=['operation', 'operand1', 'operand2', 'result', 'timestamp']
-                           ).to_csv(self.config.history_file, index=False)
-                logging.info("Empty history saved")
+            with ExitStack() as stack:
+                if source == 'history':
+                    records: Iterable[HistoryRecord] = self.history.records()
+                elif not self.config.history_file.exists():
+                    records = []
+                elif self.config.history_format == 'binary':
+                    records = stack.enter_context(BinaryHistoryReader(self.config.history_file)).records()
+                elif self.config.history_format == 'sqlite':
+                    records = self._open_history_db().iter_records(chunk_size)
+                else:
+                    records = read_csv_records(self.config.history_file)
+                f = stack.enter_context(open(path, 'w', newline='', encoding='utf-8'))
+                rows = write_records(records, f, format, chunk_size)
+        except OperationError:
+            raise
+        except Exception as e:
+            logging.error("Failed to export history: %s", e)
+            raise OperationError(f"Failed to export history: {e}")
+        logging.info("Exported %s calculations to %s", rows, path)
+        return rows
 
-        except Exception as e:  # pragma: no cover
-            # Log and raise an OperationError if saving fails   # pragma: no cover
-            logging.error(f"Failed to save history: {e}")   # pragma: no cover
-            raise OperationError(f"Failed to save history: {e}")    # pragma: no cover
+    def _open_history_db(self) -> SQLiteHistoryStore:
+        """
+        Return the SQLite history database, opening it if needed.
+
+        The connection is kept open between saves. It is reopened when the
+        configured history file changes or has been removed.
 
-    def load_history(self) -> None:
+        Returns:
+            SQLiteHistoryStore: The database at config.history_file.
+        """
+        history_file = self.config.history_file
+        if self._history_db is not None and (
+            self._history_db.path != history_file or not history_file.exists()
+        ):
+            self._history_db.close()
+            self._history_db = None
+        if self._history_db is None:
+            self._history_db = SQLiteHistoryStore(history_file)
+        return self._history_db
+
+    def _use_pandas(self) -> bool:
         """
-        Load calculation history from a CSV file using pandas.
+        Decide whether history files are read and written with pandas.
 
-        Reads the calculation history from a CSV file and reconstructs the
-        Calculation instances, restoring the calculator's history.
+        Returns:
+            bool: True if the pandas backend is configured and installed.
+        """
+        if self.config.history_backend != 'pandas':
+            return False
+        if pd.available():
+            return True
+        logging.warning("pandas is not installed - using the csv history backend")
+        return False
+
+    def append_history(self, calculations: List[Calculation]) -> None:
+        """
+        Append new calculations to the history file as journal records.
+
+        Each calculation is written as one CSV row at the end of the file, so the
+        cost of auto-saving does not grow with the size of the history. The file
+        is compacted with a full save_history() when it no longer mirrors the
+        history (after undo, redo, clear or load), when it does not exist yet, or
+        every journal_compact_interval appended records. Binary history files
+        have a fixed layout and are always rewritten in full. SQLite history
+        databases get the rows inserted in one transaction and are never
+        trimmed to max_history_size, so they keep the full history for
+        query_history(source='file').
+
+        Args:
+            calculations (List[Calculation]): The new calculations, in order.
+
+        Raises:
+            OperationError: If writing to the history file fails.
+        """
+        # Deliver queued notifications first, as save_history() does
+        self.flush_observers()
+
+        with self._state_lock:
+            if (
+                self._journal_in_sync
+                and self.config.history_format == 'sqlite'
+                and self.config.history_file.exists()
+            ):
+                try:
+                    self._open_history_db().append(
+                        map(calculation_record, calculations)
+                    )
+                except Exception as e:  # pragma: no cover
+                    logging.error("Failed to append history: %s", e)  # pragma: no cover
+                    raise OperationError(f"Failed to append history: {e}")  # pragma: no cover
+                return
+
+            if (
+                not self._journal_in_sync
+                or self.config.history_format != 'csv'
+                or self._journal_appends + len(calculations) > self.config.journal_compact_interval
+                or not self.config.history_file.exists()
+            ):
+                self.save_history()
+                return
+
+            try:
+                with open(self.config.history_file, 'a', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f, lineterminator='\n')
+                    writer.writerows(
+                        (
+                            str(calc.operation),
+                            str(calc.operand1),
+                            str(calc.operand2),
+                            str(calc.result),
+                            calc.timestamp.isoformat()
+                        )
+                        for calc in calculations
+                    )
+                self._journal_appends += len(calculations)
+            except Exception as e:  # pragma: no cover
+                logging.error("Failed to append history: %s", e)  # pragma: no cover
+                raise OperationError(f"Failed to append history: {e}")  # pragma: no cover
+
+    def load_history(self, verify: Optional[str] = None) -> None:
+        """
+        Load calculation history from the history file.
+
+        Reads the calculation history from the CSV or binary history file and reconstructs the
+        Calculation instances, restoring the calculator's history. Columns are
+        parsed in bulk and only the newest max_history_size rows are converted.
+        Stored results are reused rather than recomputed; the verify mode decides
+        how many of them are checked against a fresh computation.
+
+        Args:
+            verify (Optional[str], optional): 'trust' to skip verification,
+                'sample' to recompute an evenly spaced sample of rows, or 'full'
+                to recompute every row. Defaults to config.history_verify.
 
         Raises:
             OperationError: If loading the history fails.
         """
-        try:
-            if self.config.history_file.exists():
-                # Read the CSV file into a pandas DataFrame
-                df = pd.read_csv(self.config.history_file)
-                if not df.empty:
-                    # Deserialize each row into a Calculation instance
-                    self.history = [
-                        Calculation.from_dict({
-                            'operation': row['operation'],
-                            'operand1': row['operand1'],
-                            'operand2': row['operand2'],
-                            'result': row['result'],
-                            'timestamp': row['timestamp']
-                        })
-                        for _, row in df.iterrows()
-                    ]
-                    logging.info(f"Loaded {len(self.history)} calculations from history")
+        verify = verify or self.config.history_verify
+        if verify not in ('trust', 'sample', 'full'):
+            raise OperationError(f"Unknown history verification mode: {verify}")
+
+        # Let queued auto-saves finish first, so they cannot mark the file in sync afterwards
+        self.flush_observers()
+
+        with self._state_lock:
+            try:
+                if self.config.history_file.exists():
+                    # Read the newest rows as raw text; Calculations are built on access
+                    newest, total = self._read_history_rows()
+                    if total:
+                        history = HistoryBuffer(self.config.max_history_size)
+                        history.extend_lazy(newest)
+                        self._verify_calculations(history, verify)
+                        self.history = history
+                        # Recorded undo/redo changes do not apply to the loaded history
+                        self.undo_stack.clear()
+                        self.redo_stack.clear()
+                        if self.config.history_format == 'sqlite':
+                            # The database keeps older rows in front of the loaded ones
+                            self._history_db_base = total - len(history) - history.start
+                            self._journal_in_sync = True
+                        else:
+                            # Journal appends may leave more rows on disk than the history
+                            # keeps, in which case the file is compacted on the next append
+                            self._journal_in_sync = len(self.history) == total
+                        logging.info("Loaded %s calculations from history", len(self.history))
+                    else:
+                        logging.info("Loaded empty history file")
                 else:
-                    logging.info("Loaded empty history file")
-            else:
-                # If no history file exists, start with an empty history
-                logging.info("No history file found - starting with empty history")
-        except Exception as e:  # pragma: no cover
-            # Log and raise an OperationError if loading fails  # pragma: no cover
-            logging.error(f"Failed to load history: {e}")   # pragma: no cover
-            raise OperationError(f"Failed to load history: {e}")    # pragma: no cover
+                    # If no history file exists, start with an empty history
+                    logging.info("No history file found - starting with empty history")
+            except Exception as e:  # pragma: no cover
+                # Log and raise an OperationError if loading fails  # pragma: no cover
+                logging.error("Failed to load history: %s", e)   # pragma: no cover
+                raise OperationError(f"Failed to load history: {e}")    # pragma: no cover
+
+    def _read_history_rows(self) -> Tuple[Iterable[HistoryRecord], int]:
+        """
+        Read the history file as text rows.
+
+        Only the newest max_history_size rows are kept. Blank lines are skipped.
 
-    def get_history_dataframe(self) -> pd.DataFrame:
+        Returns:
+            Tuple[Iterable[HistoryRecord], int]: The newest rows in file order,
+                and the total number of rows in the file.
+
+        Raises:
+            ValueError: If a history column is missing.
+            IndexError: If a row has too few fields.
+            OperationError: If a binary history file is invalid.
+            sqlite3.DatabaseError: If an SQLite history file is invalid.
+        """
+        keep = self.config.max_history_size
+        if self.config.history_format == 'binary':
+            # Only the newest rows are decoded from the mapped file
+            with BinaryHistoryReader(self.config.history_file) as reader:
+                total = len(reader)
+                return list(reader.records(max(0, total - keep))), total
+        if self.config.history_format == 'sqlite':
+            history_db = self._open_history_db()
+            return history_db.tail(keep), history_db.count()
+
+        if self._use_pandas():
+            # Keep values as text rather than letting pandas infer types
+            df = pd.read_csv(self.config.history_file, dtype=str, keep_default_na=False)
+            newest = df.tail(keep)
+            return zip(*(newest[column].tolist() for column in HISTORY_COLUMNS)), len(df)
+
+        with open(self.config.history_file, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if not header:
+                return [], 0
+            pick = itemgetter(*(header.index(column) for column in HISTORY_COLUMNS))
+            # A bounded deque keeps the newest rows; zip with a counter counts
+            # all of them without a Python-level loop
+            counter = count()
+            newest = deque(map(itemgetter(0), zip(filter(None, reader), counter)), maxlen=keep)
+            return list(map(pick, newest)), next(counter)
+
+    def _verify_calculations(self, history: HistoryBuffer, verify: str) -> int:
+        """
+        Recompute stored results and warn about any that differ.
+
+        Only the rows selected for checking are materialized.
+
+        Args:
+            history (HistoryBuffer): The loaded history.
+            verify (str): 'trust', 'sample' or 'full'.
+
+        Returns:
+            int: Number of mismatching results found.
+
+        Raises:
+            OperationError: If a checked row is invalid or cannot be recomputed.
+        """
+        if verify == 'trust' or not len(history):
+            return 0
+        step = 1
+        if verify == 'sample':
+            step = max(1, len(history) // self.config.history_verify_sample_size)
+
+        mismatches = 0
+        for calc in history[::step]:
+            computed = calc.calculate(self.config.precision)
+            if computed != calc.result:
+                mismatches += 1
+                logging.warning(
+                    "Loaded calculation result %s differs from computed result %s",
+                    calc.result, computed
+                )
+        return mismatches
+
+    def get_history_dataframe(self) -> 'pd.DataFrame':
         """
         Get calculation history as a pandas DataFrame.
 
-        Converts the list of Calculation instances into a pandas DataFrame for
-        advanced data manipulation or analysis.
+        Converts the calculation history into a pandas DataFrame for advanced
+        data manipulation or analysis. The columns are kept in buffers alongside
+        the history, so each call only converts the calculations added since
+        the previous one; undo, redo, clear and load cause a full conversion on
+        the next call.
+
+        Returns:
+            pd.DataFrame: DataFrame containing the calculation history, new
+                on each call. Its columns share memory with the buffers and
+                are read-only; use .copy() to change values in place.
+        """
+        if self._history_frame is None or self._history_frame.history is not self.history:
+            self._history_frame = HistoryFrame(self.history)
+        return self._history_frame.frame()
+
+    def query_history(
+        self,
+        operation: Optional[str] = None,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+        min_result: Optional[Number] = None,
+        max_result: Optional[Number] = None,
+        limit: Optional[int] = None,
+        source: str = 'history'
+    ) -> List[Calculation]:
+        """
+        Find calculations in the history matching all given filters.
+
+        With source 'history' the query is answered from indexes kept
+        alongside the in-memory history (per-operation position lists and
+        lists sorted by timestamp and by result), which are extended as
+        calculations are added, so a query does not scan the whole history.
+        After undo, redo, clear or load the indexes are rebuilt on the next
+        query.
+
+        With source 'file' the SQLite history database is queried instead,
+        including rows no longer held in memory. The operation and time
+        filters run in SQL on its indexes; result bounds are applied to the
+        rows returned.
+
+        Args:
+            operation (Optional[str], optional): Operation name as recorded,
+                e.g. 'Addition'. Defaults to None.
+            since (Optional[datetime.datetime], optional): Earliest timestamp,
+                inclusive. Defaults to None.
+            until (Optional[datetime.datetime], optional): Latest timestamp,
+                exclusive. Defaults to None.
+            min_result (Optional[Number], optional): Smallest result, inclusive.
+                Defaults to None.
+            max_result (Optional[Number], optional): Largest result, inclusive.
+                Defaults to None.
+            limit (Optional[int], optional): Return at most the newest limit
+                matches. Defaults to None.
+            source (str, optional): 'history' for the in-memory history or
+                'file' for the SQLite history database. Defaults to 'history'.
 
         Returns:
-            pd.DataFrame: DataFrame containing the calculation history.
+            List[Calculation]: The matching calculations, oldest first.
+
+        Raises:
+            ValidationError: If a result bound is not a number.
+            OperationError: If the source is unknown, source is 'file' and
+                history_format is not 'sqlite', or a stored row is invalid.
+        """
+        bounds = []
+        for bound in (min_result, max_result):
+            try:
+                bounds.append(None if bound is None else Decimal(str(bound)))
+            except InvalidOperation:
+                raise ValidationError(f"Invalid result bound: {bound}")
+        if source == 'file':
+            return self._query_history_file(operation, since, until, bounds[0], bounds[1], limit)
+        if source != 'history':
+            raise OperationError(f"Unknown history source: {source}")
+
+        if self._history_index is None or self._history_index.history is not self.history:
+            self._history_index = HistoryIndex(self.history)
+        return self._history_index.query(operation, since, until, bounds[0], bounds[1], limit)
+
+    def _query_history_file(
+        self,
+        operation: Optional[str],
+        since: Optional[datetime.datetime],
+        until: Optional[datetime.datetime],
+        min_result: Optional[Decimal],
+        max_result: Optional[Decimal],
+        limit: Optional[int]
+    ) -> List[Calculation]:
         """
-        history_data = []   # pragma: no cover
-        for calc in self.history:   # pragma: no cover
-            history_data.append({   # pragma: no cover
-                'operation': str(calc.operation),   # pragma: no cover
-                'operand1': str(calc.operand1), # pragma: no cover
-                'operand2': str(calc.operand2), # pragma: no cover
-                'result': str(calc.result), # pragma: no cover
-                'timestamp': calc.timestamp # pragma: no cover
-            })  # pragma: no cover
-        return pd.DataFrame(history_data)   # pragma: no cover
+        Answer query_history(source='file') from the SQLite history database.
 
-    def show_history(self) -> List[str]:
+        Raises:
+            OperationError: If history_format is not 'sqlite' or a stored row
+                is invalid.
+        """
+        if self.config.history_format != 'sqlite':
+            raise OperationError(
+                f"Querying the history file needs history_format 'sqlite', "
+                f"not '{self.config.history_format}'"
+            )
+        # Queued journal appends must reach the database before it is read
+        self.flush_observers()
+        by_result = min_result is not None or max_result is not None
+        rows = self._open_history_db().query(
+            operation, since, until, None if by_result else limit
+        )
+        calculations = [LazyRow(row).materialize() for row in rows]
+        if by_result:
+            calculations = [
+                calc for calc in calculations
+                if (min_result is None or calc.result >= min_result)
+                and (max_result is None or calc.result <= max_result)
+            ]
+            if limit is not None:
+                calculations = calculations[-limit:] if limit > 0 else []
+        return calculations
+
+    def show_history(self, limit: Optional[int] = None) -> List[str]:
         """
         Get formatted history of calculations.
 
         Returns a list of human-readable strings representing each calculation.
+        Only the entries being formatted are materialized from lazily loaded rows.
+
+        Args:
+            limit (Optional[int], optional): Format only the newest limit entries.
+                Defaults to None, meaning the whole history.
 
         Returns:
             List[str]: List of formatted calculation history entries.
         """
+        entries = self.history
+        if limit is not None:
+            entries = self.history[-limit:] if limit > 0 else []
         return [
             f"{calc.operation}({calc.operand1}, {calc.operand2}) = {calc.result}"
-            for calc in self.history
+            for calc in entries
         ]
 
     def clear_history(self) -> None:
@@ -353,46 +1131,91 @@ class Calculator:
 
         Empties the calculation history and clears the undo and redo stacks.
         """
-        self.history.clear()
-        self.undo_stack.clear()
-        self.redo_stack.clear()
-        logging.info("History cleared")
+        # Let queued auto-saves finish first, so they cannot mark the file in sync afterwards
+        self.flush_observers()
+        with self._state_lock:
+            self.history.clear()
+            # The next save empties the SQLite database too
+            self._history_db_base = -self.history.start
+            self.undo_stack.clear()
+            self.redo_stack.clear()
+            self._journal_in_sync = False
+            logging.info("History cleared")
 
     def undo(self) -> bool:
         """
         Undo the last operation.
 
-        Restores the calculator's history to the state before the last calculation
-        was performed.
+        Reverts the most recent change to the calculator's history, removing the
+        calculations it appended and restoring any it evicted.
 
         Returns:
             bool: True if an operation was undone, False if there was nothing to undo.
         """
-        if not self.undo_stack:
-            return False
-        # Pop the last state from the undo stack
-        memento = self.undo_stack.pop()
-        # Push the current state onto the redo stack
-        self.redo_stack.append(CalculatorMemento(self.history.copy()))
-        # Restore the history from the memento
-        self.history = memento.history.copy()
-        return True
+        # Let queued auto-saves finish first, so they cannot mark the file in sync afterwards
+        self.flush_observers()
+        with self._state_lock:
+            if not self.undo_stack:
+                return False
+            # Pop the last change from the undo stack and revert it
+            delta = self.undo_stack.pop()
+            delta.revert(self.history)
+            self._journal_in_sync = False
+            # Keep the change so it can be re-applied
+            self.redo_stack.append(delta)
+            return True
 
     def redo(self) -> bool:
         """
         Redo the previously undone operation.
 
-        Restores the calculator's history to the state before the last undo.
+        Re-applies the most recently undone change to the calculator's history.
 
         Returns:
             bool: True if an operation was redone, False if there was nothing to redo.
         """
-        if not self.redo_stack:
-            return False
-        # Pop the last state from the redo stack
-        memento = self.redo_stack.pop()
-        # Push the current state onto the undo stack
-        self.undo_stack.append(CalculatorMemento(self.history.copy()))
-        # Restore the history from the memento
-        self.history = memento.history.copy()
-        return True
+        # Let queued auto-saves finish first, so they cannot mark the file in sync afterwards
+        self.flush_observers()
+        with self._state_lock:
+            if not self.redo_stack:
+                return False
+            # Pop the last undone change from the redo stack and re-apply it
+            delta = self.redo_stack.pop()
+            delta.apply(self.history)
+            self._journal_in_sync = False
+            # Make the change undoable again
+            self.undo_stack.append(delta)
+            return True
+
+    def create_memento(self) -> CalculatorMemento:
+        """
+        Capture a full snapshot of the calculation history.
+
+        Undo and redo work on incremental changes; use this when a complete,
+        serializable copy of the history is explicitly needed.
+
+        Returns:
+            CalculatorMemento: A memento holding a copy of the current history.
+        """
+        return CalculatorMemento(list(self.history))
+
+    def restore_memento(self, memento: CalculatorMemento) -> None:
+        """
+        Restore the calculation history from a full snapshot.
+
+        The undo and redo stacks are cleared, since their recorded changes no
+        longer apply to the restored history.
+
+        Args:
+            memento (CalculatorMemento): The snapshot to restore.
+        """
+        # Let queued auto-saves finish first, so they cannot mark the file in sync afterwards
+        self.flush_observers()
+        with self._state_lock:
+            self.history.clear()
+            self._history_db_base = -self.history.start
+            self.history.extend(memento.history)
+            self.undo_stack.clear()
+            self.redo_stack.clear()
+            self._journal_in_sync = False
+            logging.info("History restored from memento with %s calculations", len(self.history))
@@ -0,0 +1,196 @@
+########################
+# Batch Mode           #
+########################
+
+import argparse
+import csv
+import json
+import logging
+import sys
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.calculator import Calculator
+from app.exceptions import OperationError, ValidationError
+from app.operations import Operation, OperationFactory
+
+BATCH_FORMATS = ('csv', 'jsonl')
+
+# Header names skipped when they appear in the first field of a CSV input row
+_CSV_HEADERS = ('op', 'operation')
+
+# A parsed input record: operation name, first operand, second operand
+BatchRecord = Tuple[str, str, str]
+
+
+def _parse_csv_row(row: List[str]) -> BatchRecord:
+    """
+    Parse an `op,a,b` CSV row.
+
+    Raises:
+        ValidationError: If the row does not have exactly three fields.
+    """
+    if len(row) != 3:
+        raise ValidationError(f"Expected 3 fields (op,a,b), got {len(row)}")
+    return row[0].strip(), row[1], row[2]
+
+
+def _parse_json_line(line: str) -> BatchRecord:
+    """
+    Parse a `{"op": ..., "a": ..., "b": ...}` JSON line.
+
+    Raises:
+        ValidationError: If the line is not a JSON object with op, a and b keys.
+    """
+    try:
+        record = json.loads(line)
+        return str(record['op']).strip(), str(record['a']), str(record['b'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValidationError(f"Invalid JSON record: {e}")
+
+
+def detect_format(path: str) -> str:
+    """
+    Guess the input format from a file name.
+
+    Args:
+        path (str): The input path; '-' means stdin.
+
+    Returns:
+        str: 'jsonl' for .jsonl/.ndjson/.json files, otherwise 'csv'.
+    """
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def run_batch(
+    calculator: Calculator,
+    source: IO[str],
+    sink: IO[str],
+    input_format: str = 'csv'
+) -> Tuple[int, int]:
+    """
+    Stream operation records from source through the calculator to sink.
+
+    Records are read, evaluated and written one at a time, so memory use does
+    not depend on the size of the input. Results are not added to the
+    calculator history. Each non-blank input record produces one output
+    record, in input order:
+
+    - csv: `op,a,b,result,error` rows (result empty on failure, error empty
+      on success). A leading `op,a,b` header row in the input is skipped.
+    - jsonl: objects with op, a, b and either result or error; malformed
+      lines produce an object with only line and error.
+
+    Args:
+        calculator (Calculator): The calculator providing configuration,
+            validation and the result cache.
+        source (IO[str]): Input stream of records.
+        sink (IO[str]): Output stream for results.
+        input_format (str, optional): 'csv' or 'jsonl'. Defaults to 'csv'.
+
+    Returns:
+        Tuple[int, int]: Number of records processed and number that failed.
+
+    Raises:
+        ValidationError: If the input format is unknown.
+    """
+    if input_format not in BATCH_FORMATS:
+        raise ValidationError(f"Unknown batch format: {input_format}")
+
+    records: Iterable[Any]
+    parse: Callable[[Any], BatchRecord]
+    if input_format == 'csv':
+        records = csv.reader(source)
+        parse = _parse_csv_row
+        writer = csv.writer(sink, lineterminator='\n')
+        write = writer.writerow
+    else:
+        records = source
+        parse = _parse_json_line
+
+        def write(fields: Dict[str, Any]) -> None:
+            sink.write(json.dumps(fields))
+            sink.write('\n')
+
+    operations: Dict[str, Operation] = {}
+    processed = failed = 0
+
+    for line_number, record in enumerate(records, 1):
+        # Skip blank lines and a CSV header row
+        if input_format == 'csv':
+            if not any(field.strip() for field in record):
+                continue
+            if line_number == 1 and record[0].strip().lower() in _CSV_HEADERS:
+                continue
+        elif not record.strip():
+            continue
+
+        processed += 1
+        try:
+            name, a, b = parse(record)
+        except ValidationError as e:
+            failed += 1
+            if input_format == 'csv':
+                write((record + ['', '', ''])[:3] + ['', str(e)])
+            else:
+                write({'line': line_number, 'error': str(e)})
+            continue
+
+        try:
+            operation = operations.get(name)
+            if operation is None:
+                try:
+                    operation = OperationFactory.create_operation(name)
+                except ValueError as e:
+                    raise OperationError(str(e))
+                operations[name] = operation
+            result, error = str(calculator.evaluate(operation, a, b)), ''
+        except (ValidationError, OperationError) as e:
+            failed += 1
+            result, error = '', str(e)
+
+        if input_format == 'csv':
+            write((name, a, b, result, error))
+        elif error:
+            write({'op': name, 'a': a, 'b': b, 'error': error})
+        else:
+            write({'op': name, 'a': a, 'b': b, 'result': result})
+
+    sink.flush()
+    logging.info("Batch processed %s records (%s failed)", processed, failed)
+    return processed, failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for batch mode.
+
+    Usage: `python main.py batch [INPUT] [--format csv|jsonl] [--output PATH]`.
+    INPUT and PATH default to '-' (stdin and stdout).
+
+    Args:
+        argv (Optional[List[str]], optional): Arguments after the `batch`
+            command. Defaults to sys.argv[2:].
+
+    Returns:
+        int: Exit status: 0 if every record succeeded, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Evaluate op,a,b records non-interactively and stream the results."
+    )
+    parser.add_argument('input', nargs='?', default='-', help="input file, or '-' for stdin")
+    parser.add_argument('--format', choices=BATCH_FORMATS, help="input format (default: from file name, else csv)")
+    parser.add_argument('--output', default='-', help="output file, or '-' for stdout")
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+
+    input_format = args.format or detect_format(args.input)
+    source = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        _, failed = run_batch(Calculator(), source, sink, input_format)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 1 if failed else 0
@@ -9,12 +9,34 @@ from pathlib import Path
 import os
 from typing import Optional
 
-from dotenv import load_dotenv
-
 from app.exceptions import ConfigurationError
 
-# Load environment variables from a .env file into the program's environment
-load_dotenv()
+# Default history file name for each history format
+HISTORY_FILE_NAMES = {
+    'csv': "calculator_history.csv",
+    'binary': "calculator_history.bin",
+    'sqlite': "calculator_history.db",
+}
+
+# Accepted values for log_level
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+# Whether the .env file has been loaded into the environment yet
+_dotenv_loaded = False
+
+
+def load_environment() -> None:
+    """
+    Load variables from a .env file into the program's environment, once.
+
+    Deferred until the first configuration is created so importing the
+    package stays cheap. Variables already set in the environment win.
+    """
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
 
 
 def get_project_root() -> Path:
@@ -33,6 +55,21 @@ def get_project_root() -> Path:
     return current_file.parent.parent
 
 
+@dataclass(frozen=True)
+class ConfigPaths:
+    """
+    Resolved file and directory locations of a configuration.
+
+    Immutable, so the paths a calculator uses cannot change underneath it;
+    CalculatorConfig.reload() replaces the whole snapshot instead.
+    """
+
+    log_dir: Path
+    log_file: Path
+    history_dir: Path
+    history_file: Path
+
+
 @dataclass
 class CalculatorConfig:
     """
@@ -53,7 +90,22 @@ class CalculatorConfig:
         auto_save: Optional[bool] = None,
         precision: Optional[int] = None,
         max_input_value: Optional[Number] = None,
-        default_encoding: Optional[str] = None
+        default_encoding: Optional[str] = None,
+        history_journal: Optional[bool] = None,
+        journal_compact_interval: Optional[int] = None,
+        history_verify: Optional[str] = None,
+        history_verify_sample_size: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        observer_dispatch: Optional[str] = None,
+        observer_queue_size: Optional[int] = None,
+        observer_backpressure: Optional[str] = None,
+        auto_save_every: Optional[int] = None,
+        auto_save_interval_ms: Optional[int] = None,
+        instrumentation: Optional[bool] = None,
+        history_backend: Optional[str] = None,
+        log_mode: Optional[str] = None,
+        log_level: Optional[str] = None,
+        history_format: Optional[str] = None
     ):
         """
         Initialize configuration with environment variables and defaults.
@@ -65,7 +117,40 @@ class CalculatorConfig:
             precision (Optional[int], optional): Number of decimal places for calculations. Defaults to None.
             max_input_value (Optional[Number], optional): Maximum allowed input value. Defaults to None.
             default_encoding (Optional[str], optional): Default encoding for file operations. Defaults to None.
+            history_journal (Optional[bool], optional): Whether auto-save appends to the history file
+                instead of rewriting it. Defaults to None.
+            journal_compact_interval (Optional[int], optional): Number of journal appends after which
+                the history file is compacted. Defaults to None.
+            history_verify (Optional[str], optional): How loaded results are checked: 'trust',
+                'sample' or 'full'. Defaults to None.
+            history_verify_sample_size (Optional[int], optional): Number of rows recomputed when
+                history_verify is 'sample'. Defaults to None.
+            cache_size (Optional[int], optional): Maximum number of operation results kept in
+                the LRU cache; 0 disables caching. Defaults to None.
+            observer_dispatch (Optional[str], optional): 'sync' to notify observers inline or
+                'async' to notify them on a background thread. Defaults to None.
+            observer_queue_size (Optional[int], optional): Maximum number of events queued for
+                background dispatch. Defaults to None.
+            observer_backpressure (Optional[str], optional): What to do when the dispatch queue is
+                full: 'block', 'drop' or 'sync'. Defaults to None.
+            auto_save_every (Optional[int], optional): Minimum number of new calculations before
+                an auto-save is written. Defaults to None.
+            auto_save_interval_ms (Optional[int], optional): Minimum time in milliseconds between
+                auto-saves; 0 disables the limit. Held-back calculations are saved at the
+                latest this long after the first of them. Defaults to None.
+            instrumentation (Optional[bool], optional): Whether to time each stage of
+                perform_operation. Defaults to None.
+            history_backend (Optional[str], optional): Library used to read and write history
+                files: 'csv' (standard library) or 'pandas'. Defaults to None.
+            log_mode (Optional[str], optional): 'sync' to write log records on the calling
+                thread or 'queue' to hand them to a background listener. Defaults to None.
+            log_level (Optional[str], optional): Minimum level of records written to the
+                log file, e.g. 'INFO' or 'WARNING'. Defaults to None.
+            history_format (Optional[str], optional): History file format: 'csv', 'binary'
+                (memory-mapped columns) or 'sqlite'. Defaults to None.
         """
+        load_environment()
+
         # Set base directory to project root by default
         project_root = get_project_root()
         self.base_dir = base_dir or Path(
@@ -98,6 +183,108 @@ class CalculatorConfig:
             'CALCULATOR_DEFAULT_ENCODING', 'utf-8'
         )
 
+        # Append-only history journal preference
+        history_journal_env = os.getenv('CALCULATOR_HISTORY_JOURNAL', 'false').lower()
+        self.history_journal = history_journal if history_journal is not None else (
+            history_journal_env == 'true' or history_journal_env == '1'
+        )
+
+        # Number of journal appends between compactions of the history file
+        self.journal_compact_interval = journal_compact_interval or int(
+            os.getenv('CALCULATOR_JOURNAL_COMPACT_INTERVAL', '1000')
+        )
+
+        # Verification of stored results when loading history
+        self.history_verify = (history_verify or os.getenv(
+            'CALCULATOR_HISTORY_VERIFY', 'sample'
+        )).lower()
+
+        # Number of rows recomputed in 'sample' verification mode
+        self.history_verify_sample_size = history_verify_sample_size or int(
+            os.getenv('CALCULATOR_HISTORY_VERIFY_SAMPLE_SIZE', '100')
+        )
+
+        # Size of the operation result cache (0 disables it)
+        self.cache_size = cache_size if cache_size is not None else int(
+            os.getenv('CALCULATOR_CACHE_SIZE', '0')
+        )
+
+        # Observer notification mode and background queue settings
+        self.observer_dispatch = (observer_dispatch or os.getenv(
+            'CALCULATOR_OBSERVER_DISPATCH', 'sync'
+        )).lower()
+        self.observer_queue_size = observer_queue_size or int(
+            os.getenv('CALCULATOR_OBSERVER_QUEUE_SIZE', '1000')
+        )
+        self.observer_backpressure = (observer_backpressure or os.getenv(
+            'CALCULATOR_OBSERVER_BACKPRESSURE', 'block'
+        )).lower()
+
+        # Auto-save coalescing thresholds
+        self.auto_save_every = auto_save_every or int(
+            os.getenv('CALCULATOR_AUTO_SAVE_EVERY', '1')
+        )
+        self.auto_save_interval_ms = auto_save_interval_ms if auto_save_interval_ms is not None else int(
+            os.getenv('CALCULATOR_AUTO_SAVE_INTERVAL_MS', '0')
+        )
+
+        # Per-stage timing of calculations
+        instrumentation_env = os.getenv('CALCULATOR_INSTRUMENTATION', 'false').lower()
+        self.instrumentation = instrumentation if instrumentation is not None else (
+            instrumentation_env == 'true' or instrumentation_env == '1'
+        )
+
+        # Library used for history file I/O
+        self.history_backend = (history_backend or os.getenv(
+            'CALCULATOR_HISTORY_BACKEND', 'csv'
+        )).lower()
+
+        # History file format
+        self.history_format = (history_format or os.getenv(
+            'CALCULATOR_HISTORY_FORMAT', 'csv'
+        )).lower()
+
+        # Logging pipeline mode and level
+        self.log_mode = (log_mode or os.getenv(
+            'CALCULATOR_LOG_MODE', 'sync'
+        )).lower()
+        self.log_level = (log_level or os.getenv(
+            'CALCULATOR_LOG_LEVEL', 'INFO'
+        )).upper()
+
+        # Resolve file and directory paths once
+        self.paths: ConfigPaths
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Resolve the file and directory paths again.
+
+        Paths are resolved once, when the configuration is created, from the
+        CALCULATOR_*_DIR / CALCULATOR_*_FILE environment variables and base_dir.
+        Call reload() after changing either to pick up the new locations.
+        """
+        log_dir = Path(os.getenv(
+            'CALCULATOR_LOG_DIR',
+            str(self.base_dir / "logs")
+        )).resolve()
+        history_dir = Path(os.getenv(
+            'CALCULATOR_HISTORY_DIR',
+            str(self.base_dir / "history")
+        )).resolve()
+        self.paths = ConfigPaths(
+            log_dir=log_dir,
+            history_dir=history_dir,
+            history_file=Path(os.getenv(
+                'CALCULATOR_HISTORY_FILE',
+                str(history_dir / HISTORY_FILE_NAMES.get(self.history_format, "calculator_history.csv"))
+            )).resolve(),
+            log_file=Path(os.getenv(
+                'CALCULATOR_LOG_FILE',
+                str(log_dir / "calculator.log")
+            )).resolve()
+        )
+
     @property
     def log_dir(self) -> Path:
         """
@@ -108,10 +295,7 @@ class CalculatorConfig:
         Returns:
             Path: The log directory path.
         """
-        return Path(os.getenv(
-            'CALCULATOR_LOG_DIR',
-            str(self.base_dir / "logs")
-        )).resolve()
+        return self.paths.log_dir
 
     @property
     def history_dir(self) -> Path:
@@ -123,25 +307,19 @@ class CalculatorConfig:
         Returns:
             Path: The history directory path.
         """
-        return Path(os.getenv(
-            'CALCULATOR_HISTORY_DIR',
-            str(self.base_dir / "history")
-        )).resolve()
+        return self.paths.history_dir
 
     @property
     def history_file(self) -> Path:
         """
         Get history file path.
 
-        Determines the file path for storing calculation history in CSV format.
+        Determines the file path for storing calculation history in the configured history format.
 
         Returns:
             Path: The history file path.
         """
-        return Path(os.getenv(
-            'CALCULATOR_HISTORY_FILE',
-            str(self.history_dir / "calculator_history.csv")
-        )).resolve()
+        return self.paths.history_file
 
     @property
     def log_file(self) -> Path:
@@ -153,10 +331,7 @@ class CalculatorConfig:
         Returns:
             Path: The log file path.
         """
-        return Path(os.getenv(
-            'CALCULATOR_LOG_FILE',
-            str(self.log_dir / "calculator.log")
-        )).resolve()
+        return self.paths.log_file
 
     def validate(self) -> None:
         """
@@ -174,3 +349,29 @@ class CalculatorConfig:
             raise ConfigurationError("precision must be positive")
         if self.max_input_value <= 0:
             raise ConfigurationError("max_input_value must be positive")
+        if self.journal_compact_interval <= 0:
+            raise ConfigurationError("journal_compact_interval must be positive")
+        if self.history_verify not in ('trust', 'sample', 'full'):
+            raise ConfigurationError("history_verify must be 'trust', 'sample' or 'full'")
+        if self.history_verify_sample_size <= 0:
+            raise ConfigurationError("history_verify_sample_size must be positive")
+        if self.cache_size < 0:
+            raise ConfigurationError("cache_size must not be negative")
+        if self.observer_dispatch not in ('sync', 'async'):
+            raise ConfigurationError("observer_dispatch must be 'sync' or 'async'")
+        if self.observer_queue_size <= 0:
+            raise ConfigurationError("observer_queue_size must be positive")
+        if self.observer_backpressure not in ('block', 'drop', 'sync'):
+            raise ConfigurationError("observer_backpressure must be 'block', 'drop' or 'sync'")
+        if self.history_backend not in ('csv', 'pandas'):
+            raise ConfigurationError("history_backend must be 'csv' or 'pandas'")
+        if self.auto_save_every <= 0:
+            raise ConfigurationError("auto_save_every must be positive")
+        if self.auto_save_interval_ms < 0:
+            raise ConfigurationError("auto_save_interval_ms must not be negative")
+        if self.history_format not in HISTORY_FILE_NAMES:
+            raise ConfigurationError("history_format must be 'csv', 'binary' or 'sqlite'")
+        if self.log_mode not in ('sync', 'queue'):
+            raise ConfigurationError("log_mode must be 'sync' or 'queue'")
+        if self.log_level not in LOG_LEVELS:
+            raise ConfigurationError(f"log_level must be one of {', '.join(LOG_LEVELS)}")
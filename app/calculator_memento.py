@@ -7,6 +7,7 @@ import datetime
 from typing import Any, Dict, List
 
 from app.calculation import Calculation
+from app.history_buffer import HistoryBuffer
 
 
 @dataclass
@@ -54,3 +55,40 @@ class CalculatorMemento:
             history=[Calculation.from_dict(calc) for calc in data['history']],
             timestamp=datetime.datetime.fromisoformat(data['timestamp'])
         )
+
+
+@dataclass
+class HistoryDelta:
+    """
+    Records a single change to the calculator history for undo/redo.
+
+    Instead of copying the whole history, each step stores only what it changed:
+    the calculations appended to the end of the history and the oldest
+    calculations evicted from the front to respect the maximum history size.
+    Undoing or redoing a step therefore costs time and memory proportional to
+    the size of that step, not to the size of the history.
+    """
+
+    appended: List[Calculation]  # Calculations added to the end of the history
+    evicted: List[Calculation] = field(default_factory=list)  # Calculations dropped from the front of the history
+    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)  # Time when the change was made
+
+    def revert(self, history: HistoryBuffer) -> None:
+        """
+        Undo this change on the given history in place.
+
+        Args:
+            history (HistoryBuffer): The history the change was applied to.
+        """
+        history.pop_newest(len(self.appended))
+        history.restore_oldest(self.evicted)
+
+    def apply(self, history: HistoryBuffer) -> None:
+        """
+        Re-apply this change on the given history in place.
+
+        Args:
+            history (HistoryBuffer): The history to apply the change to.
+        """
+        history.pop_oldest(len(self.evicted))
+        history.extend(self.appended)
@@ -116,13 +116,14 @@ def calculator_repl() -> None:
                         print("Operation cancelled")
                         continue
 
-                    # Step-1: call CalculationFactory
+                    # Step-1: resolve the operation through CalculationFactory
+                    # without evaluating it (the calculator evaluates once below)
                     # (unit-test may patch this to raise Exception('Boom'))
                     try:
-                        CalculationFactory.create(command, a, b)
+                        CalculationFactory.resolve_operation(command)
                     except Exception as e:
                         print(f"Error: {e}")          # <- prints “Error: Boom”
-                        logging.error(f"Factory error: {e}")
+                        logging.error("Factory error: %s", e)
                         continue                      # back to prompt
 
                     # Step-2: follow original calculator flow
@@ -142,7 +143,7 @@ def calculator_repl() -> None:
                     print(f"Error: {e}")
                 except Exception as e:  # pragma: no cover
                     print(f"Error: {e}")              # safety net  # pragma: no cover
-                    logging.error(f"Unexpected calc error: {e}")    # pragma: no cover
+                    logging.error("Unexpected calc error: %s", e)    # pragma: no cover
                 continue  # end arithmetic branch
 
             # ---------- unknown command -------------------------
@@ -157,9 +158,15 @@ def calculator_repl() -> None:
             break
         except Exception as e:  # pragma: no cover
             print(f"Error: {e}", file=sys.stderr)   # pragma: no cover
-            logging.error(f"Fatal REPL error: {e}") # pragma: no cover
+            logging.error("Fatal REPL error: %s", e) # pragma: no cover
             continue
 
+    # Write any coalesced auto-saves and stop background work
+    try:
+        calc.close()
+    except Exception as e:
+        print(f"Warning: Could not save history: {e}")
+
 
 # Allow running directly
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+########################
+# Decimal Math Engines #
+########################
+
+from decimal import Decimal, InvalidOperation, getcontext, localcontext
+from typing import Optional
+
+# Extra digits carried through intermediate steps before the final rounding
+GUARD_DIGITS = 5
+
+
+def _working_precision(precision: Optional[int]) -> int:
+    """Return the requested precision, defaulting to the active context's."""
+    return precision if precision is not None else getcontext().prec
+
+
+def _tidy(value: Decimal) -> Decimal:
+    """Drop trailing fractional zeros left over from rounding."""
+    integral = value.to_integral_value()
+    return integral if value == integral else value.normalize()
+
+
+def decimal_power(base: Decimal, exponent: Decimal, precision: Optional[int] = None) -> Decimal:
+    """
+    Raise a Decimal to a Decimal power without going through float.
+
+    Integral exponents use exponentiation by squaring (half-integral ones add
+    a single square root); other exponents use exp(exponent * ln(base)). Intermediate steps carry guard digits and the
+    result is rounded once to the requested number of significant digits.
+
+    Args:
+        base (Decimal): The base.
+        exponent (Decimal): The exponent.
+        precision (Optional[int], optional): Significant digits of the result.
+            Defaults to the active decimal context precision.
+
+    Returns:
+        Decimal: base raised to exponent.
+
+    Raises:
+        decimal.InvalidOperation: If a negative base has a fractional exponent.
+        decimal.Overflow: If the result exceeds the decimal context range.
+    """
+    precision = _working_precision(precision)
+
+    doubled = exponent * 2
+    if doubled == doubled.to_integral_value():
+        # Integral or half-integral exponent: square-and-multiply, plus one
+        # square root for the half
+        n = int(exponent)
+        with localcontext() as ctx:
+            ctx.prec = precision + len(str(abs(n))) + GUARD_DIGITS
+            result = Decimal(1)
+            square = base
+            k = abs(n)
+            while k:
+                if k & 1:
+                    result *= square
+                k >>= 1
+                if k:
+                    square *= square
+            if exponent != n:
+                result *= base.sqrt()
+            if exponent < 0:
+                result = 1 / result
+    else:
+        with localcontext() as ctx:
+            ctx.prec = precision + GUARD_DIGITS
+            if base == 0:
+                result = Decimal(0)
+            else:
+                result = (exponent * base.ln()).exp()
+
+    with localcontext() as ctx:
+        ctx.prec = precision
+        return _tidy(+result)
+
+
+def decimal_root(value: Decimal, degree: Decimal, precision: Optional[int] = None) -> Decimal:
+    """
+    Calculate the nth root of a Decimal without going through float.
+
+    Square roots use Decimal.sqrt, other integral degrees use Newton
+    iteration, and fractional degrees use exp(ln(value) / degree). The result
+    is rounded once to the requested number of significant digits.
+
+    Args:
+        value (Decimal): The radicand (non-negative).
+        degree (Decimal): The degree of the root (non-zero).
+        precision (Optional[int], optional): Significant digits of the result.
+            Defaults to the active decimal context precision.
+
+    Returns:
+        Decimal: The degree-th root of value.
+
+    Raises:
+        decimal.InvalidOperation: If value is negative or degree is zero.
+        decimal.DivisionByZero: If value is zero and degree is negative.
+    """
+    precision = _working_precision(precision)
+
+    with localcontext() as ctx:
+        ctx.prec = precision + GUARD_DIGITS
+        if degree == 0:
+            raise InvalidOperation("Zero root is undefined")
+        if degree == degree.to_integral_value():
+            n = int(degree)
+            result = _integral_root(value, abs(n))
+            if n < 0:
+                result = 1 / result
+        elif value == 0:
+            result = Decimal(0)
+        else:
+            result = (value.ln() / degree).exp()
+
+    with localcontext() as ctx:
+        ctx.prec = precision
+        return _tidy(+result)
+
+
+def _integral_root(value: Decimal, n: int) -> Decimal:
+    """
+    Newton iteration for the nth root in the active context (n >= 1).
+
+    Starts from a float estimate where one is available and iterates
+    x <- ((n - 1) * x + value / x ** (n - 1)) / n until it stops decreasing.
+    """
+    if n == 1 or value == 0 or value == 1:
+        return +value
+    if value < 0:
+        raise InvalidOperation("Cannot calculate root of negative number")
+    if n == 2:
+        return value.sqrt()
+
+    x = Decimal(float(value) ** (1.0 / n))
+    if not x.is_finite() or x == 0:
+        # Outside float range: start from a power of ten of the right magnitude
+        x = Decimal(1).scaleb((value.adjusted() + n) // n)
+
+    n1 = n - 1
+    # One step from any positive guess lands at or above the root; from there
+    # the iterates decrease monotonically until rounding stops them
+    x = (n1 * x + value / x ** n1) / n
+    while True:
+        y = (n1 * x + value / x ** n1) / n
+        if y >= x:
+            return x
+        x = y
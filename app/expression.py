@@ -0,0 +1,341 @@
+########################
+# Expression Compiler  #
+########################
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+import re
+import threading
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+
+from app.calculator_config import CalculatorConfig
+from app.exceptions import ValidationError
+from app.input_validators import InputValidator
+from app.operations import Operation, OperationFactory
+
+# Infix operators and the OperationFactory names they map to
+OPERATOR_SYMBOLS: Dict[str, str] = {
+    '+': 'add',
+    '-': 'subtract',
+    '*': 'multiply',
+    '/': 'divide',
+    '%': 'modulus',
+    '^': 'power',
+    'root': 'root',
+}
+
+# Number of compiled expressions kept by compile_expression()
+EXPRESSION_CACHE_SIZE = 256
+
+# Compiled expressions by (text, precision, max_input_value), least recently used first
+_cache: "OrderedDict[Tuple[str, Optional[int], Optional[Decimal]], CompiledExpression]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+_TOKEN_RE = re.compile(
+    r'\s*(?:'
+    r'(?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)'
+    r'|(?P<name>[A-Za-z_]\w*)'
+    r'|(?P<symbol>[-+*/%^(),])'
+    r')'
+)
+
+# Token: (kind, text) where kind is 'number', 'name' or 'symbol'
+Token = Tuple[str, str]
+
+# A compiled evaluator takes the variable bindings and returns the value
+Evaluator = Callable[[Mapping[str, Decimal]], Decimal]
+
+
+@dataclass(frozen=True)
+class Constant:
+    """A literal number, or a subexpression folded at compile time."""
+
+    value: Decimal
+
+
+@dataclass(frozen=True)
+class Variable:
+    """A named value supplied when the expression is evaluated."""
+
+    name: str
+
+
+@dataclass(frozen=True)
+class BinaryOperation:
+    """An Operation applied to two subexpressions."""
+
+    operation: Operation
+    left: 'Node'
+    right: 'Node'
+
+
+Node = Union[Constant, Variable, BinaryOperation]
+
+
+def tokenize(text: str) -> List[Token]:
+    """
+    Split expression text into tokens.
+
+    Args:
+        text (str): The expression.
+
+    Returns:
+        List[Token]: The tokens, in order.
+
+    Raises:
+        ValidationError: If the text contains an unexpected character.
+    """
+    tokens: List[Token] = []
+    position = 0
+    end = len(text.rstrip())
+    while position < end:
+        match = _TOKEN_RE.match(text, position)
+        if match is None:
+            character = text[position:].lstrip()[0]
+            raise ValidationError(f"Invalid expression: unexpected character '{character}'")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent parser producing a folded AST.
+
+    Precedence, lowest first: `+ -`, then `* / %`, then `root`, then unary
+    minus, then `^` (right-associative). Other binary operators are
+    left-associative. Registered operations can also be called by name:
+    `modulus(a, b)`.
+    """
+
+    def __init__(self, tokens: List[Token], precision: Optional[int], config: Optional[CalculatorConfig]):
+        self.tokens = tokens
+        self.position = 0
+        self.precision = precision
+        self.config = config
+        self.operations: Dict[str, Operation] = {}
+
+    def peek(self) -> Optional[str]:
+        """Return the text of the next token, or None at the end."""
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][1]
+        return None
+
+    def take(self) -> Token:
+        """Consume and return the next token."""
+        if self.position >= len(self.tokens):
+            raise ValidationError("Invalid expression: unexpected end of input")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def expect(self, symbol: str) -> None:
+        """Consume the next token, which must be the given symbol."""
+        kind, text = self.take()
+        if text != symbol:
+            raise ValidationError(f"Invalid expression: expected '{symbol}' but found '{text}'")
+
+    def parse(self) -> Node:
+        """Parse the whole token list."""
+        node = self.additive()
+        if self.position != len(self.tokens):
+            raise ValidationError(f"Invalid expression: unexpected '{self.peek()}'")
+        return node
+
+    def binary(self, name: str, left: Node, right: Node) -> Node:
+        """Build a binary node, folding it when both sides are constant."""
+        operation = self.operations.get(name)
+        if operation is None:
+            try:
+                operation = OperationFactory.create_operation(name, self.precision)
+            except ValueError as e:
+                raise ValidationError(f"Invalid expression: {e}")
+            self.operations[name] = operation
+        if isinstance(left, Constant) and isinstance(right, Constant):
+            try:
+                return Constant(operation.execute(left.value, right.value))
+            except (ArithmeticError, ValidationError):
+                # Leave it for evaluation time, where the error is reported
+                pass
+        return BinaryOperation(operation, left, right)
+
+    def additive(self) -> Node:
+        node = self.multiplicative()
+        while self.peek() in ('+', '-'):
+            symbol = self.take()[1]
+            node = self.binary(OPERATOR_SYMBOLS[symbol], node, self.multiplicative())
+        return node
+
+    def multiplicative(self) -> Node:
+        node = self.root()
+        while self.peek() in ('*', '/', '%'):
+            symbol = self.take()[1]
+            node = self.binary(OPERATOR_SYMBOLS[symbol], node, self.root())
+        return node
+
+    def root(self) -> Node:
+        node = self.unary()
+        while self.peek() == 'root':
+            self.take()
+            node = self.binary(OPERATOR_SYMBOLS['root'], node, self.unary())
+        return node
+
+    def unary(self) -> Node:
+        if self.peek() == '-':
+            self.take()
+            return self.binary('subtract', Constant(Decimal(0)), self.unary())
+        if self.peek() == '+':
+            self.take()
+            return self.unary()
+        return self.power()
+
+    def power(self) -> Node:
+        node = self.primary()
+        if self.peek() == '^':
+            self.take()
+            # Right-associative, and the exponent may carry a sign: 2 ^ -3 ^ 2
+            node = self.binary(OPERATOR_SYMBOLS['^'], node, self.unary())
+        return node
+
+    def primary(self) -> Node:
+        kind, text = self.take()
+        if kind == 'number':
+            if self.config is not None:
+                # Literals are inputs too, and face the same limits as operands
+                return Constant(InputValidator.validate_number(text, self.config))
+            return Constant(Decimal(text))
+        if text == '(':
+            node = self.additive()
+            self.expect(')')
+            return node
+        if kind == 'name' and self.peek() == '(':
+            self.take()
+            left = self.additive()
+            self.expect(',')
+            right = self.additive()
+            self.expect(')')
+            return self.binary(text.lower(), left, right)
+        if kind == 'name' and text not in OPERATOR_SYMBOLS:
+            return Variable(text)
+        raise ValidationError(f"Invalid expression: unexpected '{text}'")
+
+
+def _compile_node(node: Node) -> Evaluator:
+    """Turn an AST node into a closure that evaluates it."""
+    if isinstance(node, Constant):
+        value = node.value
+        return lambda variables: value
+    if isinstance(node, Variable):
+        name = node.name
+
+        def variable(variables: Mapping[str, Decimal]) -> Decimal:
+            try:
+                return variables[name]
+            except KeyError:
+                raise ValidationError(f"Undefined variable: {name}")
+        return variable
+
+    execute = node.operation.execute
+    left = _compile_node(node.left)
+    right = _compile_node(node.right)
+    return lambda variables: execute(left(variables), right(variables))
+
+
+def _variables(node: Node) -> FrozenSet[str]:
+    """Collect the variable names used by an AST."""
+    if isinstance(node, Variable):
+        return frozenset((node.name,))
+    if isinstance(node, BinaryOperation):
+        return _variables(node.left) | _variables(node.right)
+    return frozenset()
+
+
+class CompiledExpression:
+    """
+    A parsed, constant-folded expression ready for repeated evaluation.
+
+    The AST is turned into nested closures once, so evaluating the expression
+    with new variable values does no parsing or tree walking.
+    """
+
+    def __init__(self, text: str, tree: Node):
+        """
+        Initialize the compiled expression.
+
+        Args:
+            text (str): The source text.
+            tree (Node): The folded AST.
+        """
+        self.text = text
+        self.tree = tree
+        self.variables = _variables(tree)
+        self._evaluate = _compile_node(tree)
+
+    @property
+    def is_constant(self) -> bool:
+        """bool: True if the expression folded to a single constant."""
+        return isinstance(self.tree, Constant)
+
+    def evaluate(self, variables: Optional[Mapping[str, Decimal]] = None) -> Decimal:
+        """
+        Evaluate the expression.
+
+        Args:
+            variables (Optional[Mapping[str, Decimal]], optional): Values for
+                the variables used by the expression. Defaults to None.
+
+        Returns:
+            Decimal: The value of the expression.
+
+        Raises:
+            ValidationError: If a variable is undefined or an operation rejects its operands.
+        """
+        return self._evaluate(variables or {})
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.text!r})"
+
+
+def compile_expression(
+    text: str,
+    precision: Optional[int] = None,
+    config: Optional[CalculatorConfig] = None
+) -> CompiledExpression:
+    """
+    Parse, fold and compile an expression, caching the result by its text.
+
+    The cache keeps the EXPRESSION_CACHE_SIZE most recently used expressions,
+    keyed by text, precision and the config's max_input_value.
+
+    Args:
+        text (str): The expression, e.g. `(3 + 4) * 2 ^ 5 root 3`.
+        precision (Optional[int], optional): Significant digits used by Power
+            and Root. Defaults to None, meaning the decimal context precision.
+        config (Optional[CalculatorConfig], optional): Configuration whose
+            limits numeric literals are validated against, as operands are.
+            Defaults to None, meaning literals are not validated.
+
+    Returns:
+        CompiledExpression: The compiled expression.
+
+    Raises:
+        ValidationError: If the expression is malformed or a literal is invalid.
+    """
+    key = (text, precision, None if config is None else config.max_input_value)
+    with _cache_lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            return compiled
+
+    tokens = tokenize(text)
+    if not tokens:
+        raise ValidationError("Invalid expression: empty")
+    compiled = CompiledExpression(text, _Parser(tokens, precision, config).parse())
+    with _cache_lock:
+        _cache[key] = compiled
+        if len(_cache) > EXPRESSION_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
@@ -4,7 +4,9 @@
 
 from abc import ABC, abstractmethod
 import logging
-from typing import Any
+import threading
+import time
+from typing import Any, List, Optional
 from app.calculation import Calculation
 
 
@@ -27,6 +29,27 @@ class HistoryObserver(ABC):
         """
         pass  # pragma: no cover
 
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Handle a batch of new calculation events.
+
+        The default implementation forwards each calculation to update().
+        Observers with per-event overhead can override it to react once
+        per batch.
+
+        Args:
+            calculations (List[Calculation]): The calculations performed, in order.
+        """
+        for calculation in calculations:
+            self.update(calculation)
+
+    def flush(self) -> None:
+        """
+        Complete any work the observer has deferred.
+
+        Called when the calculator is closed. The default implementation does nothing.
+        """
+
 
 class LoggingObserver(HistoryObserver):
     """
@@ -49,9 +72,8 @@ class LoggingObserver(HistoryObserver):
         if calculation is None:
             raise AttributeError("Calculation cannot be None")
         logging.info(
-            f"Calculation performed: {calculation.operation} "
-            f"({calculation.operand1}, {calculation.operand2}) = "
-            f"{calculation.result}"
+            "Calculation performed: %s (%s, %s) = %s",
+            calculation.operation, calculation.operand1, calculation.operand2, calculation.result
         )
 
 
@@ -62,6 +84,21 @@ class AutoSaveObserver(HistoryObserver):
     Implements the Observer pattern by listening for new calculations and
     triggering an automatic save of the calculation history if the auto-save
     feature is enabled in the configuration.
+
+    Saves can be coalesced through the configuration: new calculations are
+    held back until at least auto_save_every of them are pending and at least
+    auto_save_interval_ms have passed since the previous save. Pending
+    calculations are written by flush(), which the calculator calls on close.
+    The defaults (1 and 0) save after every calculation.
+
+    When auto_save_interval_ms is set, held-back calculations also have a
+    deadline: a timer saves them auto_save_interval_ms after the first one
+    was held back, even if no further calculation arrives. The save itself
+    runs through calculator.run_on_observer_thread(), so with async dispatch
+    it is queued behind the pending notifications. A crash then
+    loses at most the calculations of the last auto_save_interval_ms. With
+    only auto_save_every set, at most auto_save_every - 1 calculations are
+    at risk.
     """
 
     def __init__(self, calculator: Any):
@@ -78,19 +115,138 @@ class AutoSaveObserver(HistoryObserver):
         if not hasattr(calculator, 'config') or not hasattr(calculator, 'save_history'):
             raise TypeError("Calculator must have 'config' and 'save_history' attributes")
         self.calculator = calculator
+        self._pending: List[Calculation] = []
+        self._last_save = float('-inf')
+        self._save_count = calculator.save_count
+        self._lock = threading.RLock()
+        self._deadline: Optional[threading.Timer] = None
 
     def update(self, calculation: Calculation) -> None:
         """
         Trigger auto-save.
 
         This method is called whenever a new calculation is performed. If the
-        auto-save feature is enabled, it saves the current calculation history.
+        auto-save feature is enabled, it saves the current calculation history
+        once the coalescing thresholds are reached.
 
         Args:
             calculation (Calculation): The calculation that was performed.
         """
         if calculation is None:
             raise AttributeError("Calculation cannot be None")
-        if self.calculator.config.auto_save:
+        if not self.calculator.config.auto_save:
+            return
+        with self._lock:
+            if self._queue([calculation]):
+                self._save_pending()
+                logging.info("History auto-saved")
+
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Trigger a single auto-save for a whole batch.
+
+        Args:
+            calculations (List[Calculation]): The calculations performed, in order.
+        """
+        if not calculations or not self.calculator.config.auto_save:
+            return
+        with self._lock:
+            if self._queue(calculations):
+                self._save_pending()
+                logging.info("History auto-saved after batch of %s", len(calculations))
+
+    def flush(self) -> None:
+        """Save calculations held back by coalescing, if any."""
+        with self._lock:
+            self._cancel_deadline()
+            self._discard_saved()
+            if self._pending:
+                self._save_pending()
+                logging.info("History auto-saved on flush")
+
+    def _expire(self) -> None:
+        """
+        Timer callback: hand the deadline save to the calculator.
+
+        The save runs where observer notifications are delivered (the
+        dispatch worker in async mode), never on the timer thread while a
+        notification is being handled.
+        """
+        timer = threading.current_thread()
+        self.calculator.run_on_observer_thread(lambda: self._on_deadline(timer))
+
+    def _on_deadline(self, timer: threading.Thread) -> None:
+        """
+        Save calculations held back for a whole interval.
+
+        Args:
+            timer (threading.Thread): The timer that expired; if it has been
+                superseded or cancelled meanwhile, nothing is done.
+        """
+        with self._lock:
+            if timer is not self._deadline:
+                return
+            self._deadline = None
+            self._discard_saved()
+            if not self._pending:
+                return
+            try:
+                self._save_pending()
+            except Exception as e:
+                logging.error("Deadline auto-save failed: %s", e)
+                return
+            logging.info("History auto-saved at deadline")
+
+    def _cancel_deadline(self) -> None:
+        """Stop the pending deadline timer, if any."""
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+
+    def _discard_saved(self) -> None:
+        """Forget pending calculations already written by an explicit save_history()."""
+        save_count = self.calculator.save_count
+        if save_count != self._save_count:
+            self._pending.clear()
+            self._save_count = save_count
+
+    def _queue(self, calculations: List[Calculation]) -> bool:
+        """
+        Add calculations to the pending list.
+
+        Args:
+            calculations (List[Calculation]): The new calculations.
+
+        Returns:
+            bool: True if the coalescing thresholds are reached and a save is due.
+        """
+        self._discard_saved()
+        self._pending.extend(calculations)
+        config = self.calculator.config
+        interval_ms = config.auto_save_interval_ms
+        due = len(self._pending) >= config.auto_save_every and (
+            (time.monotonic() - self._last_save) * 1000 >= interval_ms
+        )
+        if not due and interval_ms > 0 and self._deadline is None:
+            # Bound how long held-back calculations stay unsaved
+            self._deadline = threading.Timer(interval_ms / 1000, self._expire)
+            self._deadline.daemon = True
+            self._deadline.start()
+        return due
+
+    def _save_pending(self) -> None:
+        """
+        Persist pending calculations using the configured save strategy.
+
+        In journal mode, or with an SQLite history database, the calculations
+        are appended to the history file; otherwise the whole history is saved.
+        """
+        config = self.calculator.config
+        if config.history_journal or config.history_format == 'sqlite':
+            self.calculator.append_history(self._pending)
+        else:
             self.calculator.save_history()
-            logging.info("History auto-saved")
+        self._cancel_deadline()
+        self._pending = []
+        self._last_save = time.monotonic()
+        self._save_count = self.calculator.save_count
@@ -0,0 +1,370 @@
+########################
+# Binary History File  #
+########################
+
+from array import array
+import csv
+import datetime
+import mmap
+from operator import itemgetter
+from pathlib import Path
+import struct
+import sys
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from app.exceptions import OperationError
+from app.history_buffer import HISTORY_COLUMNS, HistoryRecord
+from app.history_store import EPOCH, HistoryStore, join_timestamp
+
+# File signature and layout versions: version 2 adds a UTC offset column
+MAGIC = b'CALCHIST'
+VERSION = 2
+_NAIVE_VERSION = 1
+
+# Header: magic, version, number of operation names, number of rows
+_HEADER = struct.Struct('<8sHHQ')
+
+# Rows decoded per bulk read in BinaryHistoryReader.records()
+READ_CHUNK_ROWS = 4096
+
+# Location of a decimal column: offset of its end offsets, offset of its text
+ColumnOffsets = Tuple[int, int]
+
+
+def _padding(position: int) -> int:
+    """Return the number of bytes that align position to 8."""
+    return -position % 8
+
+
+def _write_array(f: BinaryIO, values: array) -> None:
+    """Write an array in little-endian byte order, followed by alignment padding."""
+    if sys.byteorder != 'little':  # pragma: no cover
+        values = array(values.typecode, values)  # pragma: no cover
+        values.byteswap()  # pragma: no cover
+    f.write(values.tobytes())
+    f.write(b'\0' * _padding(f.tell()))
+
+
+def write_binary_history(path: Union[str, Path], records: Iterable[HistoryRecord]) -> int:
+    """
+    Write history rows to a binary history file.
+
+    The file starts with a header and the table of operation names, followed
+    by fixed-layout columns, each aligned to 8 bytes and little-endian:
+
+    - one byte per row: the operation code (index into the name table)
+    - one int64 per row: the timestamp in wall-clock microseconds since
+      1970-01-01
+    - version 2 only: one int32 per row, the timestamp's UTC offset in
+      seconds (-2**31 for naive timestamps)
+    - operand1, operand2 and result: one uint64 end offset per row, then the
+      values' decimal strings back to back
+
+    Operands and results are stored as written, so they round-trip exactly.
+    Timestamps are stored as numbers and read back in isoformat() form, with
+    their UTC offset if they had one. When every timestamp is naive, the file
+    is written as version 1, without the offset column.
+
+    Args:
+        path (Union[str, Path]): The file to write.
+        records (Iterable[HistoryRecord]): The rows, oldest first.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        OperationError: If a row cannot be stored.
+    """
+    store = HistoryStore()
+    try:
+        for record in records:
+            store.append_record(record)
+    except (ValueError, TypeError) as e:
+        raise OperationError(f"Invalid history row: {e}")
+    names = [name.encode('utf-8') for name in store.operation_names]
+    for name in names:
+        if len(name) > 255:
+            raise OperationError(f"Operation name too long for binary history: {name.decode()}")
+
+    with open(path, 'wb') as f:
+        version = _NAIVE_VERSION if store.utc_offsets is None else VERSION
+        f.write(_HEADER.pack(MAGIC, version, len(names), len(store)))
+        for name in names:
+            f.write(bytes((len(name),)) + name)
+        f.write(b'\0' * _padding(f.tell()))
+
+        _write_array(f, store.operations)
+        _write_array(f, store.timestamps)
+        if store.utc_offsets is not None:
+            _write_array(f, store.utc_offsets)
+        for column in (store.operand1, store.operand2, store.results):
+            _write_array(f, column.ends)
+            f.write(column.data)
+            f.write(b'\0' * _padding(f.tell()))
+    return len(store)
+
+
+class BinaryHistoryReader:
+    """
+    Memory-mapped reader for binary history files.
+
+    Opening a file only parses the header and operation names; rows are
+    decoded from the mapping on request, so reading the newest rows of a
+    large file touches only those rows' pages. Use as a context manager, or
+    call close() when done.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open and map a binary history file.
+
+        Args:
+            path (Union[str, Path]): The file to read.
+
+        Raises:
+            OperationError: If the file is not a valid binary history file.
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise OperationError(f"Not a binary history file: {self.path}")
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        """
+        Read the header and operation names and locate the columns.
+
+        Raises:
+            OperationError: If the header is invalid or the file is truncated.
+        """
+        if len(self._map) < _HEADER.size:
+            raise OperationError(f"Not a binary history file: {self.path}")
+        magic, version, names, self.rows = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise OperationError(f"Not a binary history file: {self.path}")
+        if version not in (_NAIVE_VERSION, VERSION):
+            raise OperationError(f"Unsupported binary history version: {version}")
+
+        try:
+            offset = _HEADER.size
+            self.operation_names: List[str] = []
+            for _ in range(names):
+                length = self._map[offset]
+                self.operation_names.append(self._map[offset + 1:offset + 1 + length].decode('utf-8'))
+                offset += 1 + length
+            offset += _padding(offset)
+
+            self._codes = offset
+            offset += self.rows + _padding(self.rows)
+            self._timestamps = offset
+            offset += 8 * self.rows
+            self._offsets: Optional[int] = None
+            if version == VERSION:
+                self._offsets = offset
+                offset += 4 * self.rows + _padding(4 * self.rows)
+
+            self._columns: List[ColumnOffsets] = []
+            for _ in range(3):
+                data = offset + 8 * self.rows
+                size = struct.unpack_from('<Q', self._map, data - 8)[0] if self.rows else 0
+                self._columns.append((offset, data))
+                offset = data + size + _padding(data + size)
+        except (IndexError, struct.error):
+            raise OperationError(f"Truncated binary history file: {self.path}")
+        if offset > len(self._map):
+            raise OperationError(f"Truncated binary history file: {self.path}")
+
+    def _texts(self, column: ColumnOffsets, start: int, count: int) -> List[str]:
+        """Decode count consecutive values of a decimal column."""
+        ends_offset, data_offset = column
+        first = struct.unpack_from('<Q', self._map, ends_offset + 8 * (start - 1))[0] if start else 0
+        ends = struct.unpack_from(f'<{count}Q', self._map, ends_offset + 8 * start)
+        text = self._map[data_offset + first:data_offset + ends[-1]].decode('ascii')
+        bounds = [end - first for end in ends]
+        return list(map(text.__getitem__, map(slice, [0] + bounds[:-1], bounds)))
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[HistoryRecord]:
+        """
+        Iterate over rows as the text fields of a history file.
+
+        Rows are decoded READ_CHUNK_ROWS at a time.
+
+        Args:
+            start (int, optional): First row to read. Defaults to 0.
+            stop (Optional[int], optional): Row to stop before. Defaults to
+                None, meaning the end of the file.
+
+        Returns:
+            Iterator[HistoryRecord]: The rows, in file order.
+        """
+        stop = self.rows if stop is None else min(stop, self.rows)
+        names = self.operation_names
+        for chunk in range(start, stop, READ_CHUNK_ROWS):
+            count = min(READ_CHUNK_ROWS, stop - chunk)
+            operations = [names[code] for code in self._map[self._codes + chunk:self._codes + chunk + count]]
+            micros = struct.unpack_from(f'<{count}q', self._map, self._timestamps + 8 * chunk)
+            if self._offsets is None:
+                timestamps = [
+                    (EPOCH + datetime.timedelta(microseconds=value)).isoformat() for value in micros
+                ]
+            else:
+                offsets = struct.unpack_from(f'<{count}i', self._map, self._offsets + 4 * chunk)
+                timestamps = [join_timestamp(*parts).isoformat() for parts in zip(micros, offsets)]
+            yield from zip(
+                operations,
+                *(self._texts(column, chunk, count) for column in self._columns),
+                timestamps
+            )
+
+    def record(self, index: int) -> HistoryRecord:
+        """
+        Read one row.
+
+        Args:
+            index (int): Row position; negative values count from the end.
+
+        Returns:
+            HistoryRecord: The row fields.
+
+        Raises:
+            IndexError: If the position is out of range.
+        """
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError("Binary history index out of range")
+        return next(self.records(index, index + 1))
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._map.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __enter__(self) -> 'BinaryHistoryReader':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def is_binary_history(path: Union[str, Path]) -> bool:
+    """
+    Check whether a file starts with the binary history signature.
+
+    Args:
+        path (Union[str, Path]): The file to check.
+
+    Returns:
+        bool: True for a binary history file.
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_csv_records(path: Union[str, Path]) -> Iterator[HistoryRecord]:
+    """
+    Iterate over the rows of a CSV history file.
+
+    Args:
+        path (Union[str, Path]): The CSV file.
+
+    Returns:
+        Iterator[HistoryRecord]: The rows, in file order. Blank lines are skipped.
+
+    Raises:
+        ValueError: If a history column is missing.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if not header:
+            return
+        pick = itemgetter(*(header.index(column) for column in HISTORY_COLUMNS))
+        yield from map(pick, filter(None, reader))
+
+
+def csv_to_binary(source: Union[str, Path], target: Union[str, Path]) -> int:
+    """
+    Convert a CSV history file to the binary format.
+
+    Args:
+        source (Union[str, Path]): The CSV history file.
+        target (Union[str, Path]): The binary file to write.
+
+    Returns:
+        int: Number of rows converted.
+
+    Raises:
+        OperationError: If a column is missing or a row cannot be converted.
+    """
+    return write_binary_history(target, read_csv_records(source))
+
+
+def binary_to_csv(source: Union[str, Path], target: Union[str, Path]) -> int:
+    """
+    Convert a binary history file to CSV.
+
+    Args:
+        source (Union[str, Path]): The binary history file.
+        target (Union[str, Path]): The CSV file to write.
+
+    Returns:
+        int: Number of rows converted.
+
+    Raises:
+        OperationError: If the source is not a valid binary history file.
+    """
+    with BinaryHistoryReader(source) as reader, \
+            open(target, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(HISTORY_COLUMNS)
+        writer.writerows(reader.records())
+        return len(reader)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command-line entry point: convert a history file between CSV and binary.
+
+    The direction follows the input: a binary file is converted to CSV, and
+    anything else is read as CSV and converted to binary.
+
+    Args:
+        argv (Optional[Sequence[str]], optional): Arguments, without the
+            program name. Defaults to None, meaning sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    # Imported here: the calculator imports this module, but rarely needs the CLI
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python main.py convert-history",
+        description="Convert a calculator history file between CSV and binary."
+    )
+    parser.add_argument("input", help="history file to convert")
+    parser.add_argument("output", help="file to write")
+    args = parser.parse_args(argv)
+
+    try:
+        if is_binary_history(args.input):
+            rows = binary_to_csv(args.input, args.output)
+        else:
+            rows = csv_to_binary(args.input, args.output)
+    except (OSError, OperationError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Converted {rows} rows to {args.output}")
+    return 0
@@ -0,0 +1,292 @@
+########################
+# History Buffer       #
+########################
+
+from collections import deque
+import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple, Union, overload
+
+from app.calculation import Calculation
+from app.exceptions import OperationError
+
+# A history row as stored on disk: operation, operand1, operand2, result, timestamp
+HistoryRecord = Tuple[str, str, str, str, str]
+
+# Column order of history files
+HISTORY_COLUMNS = ['operation', 'operand1', 'operand2', 'result', 'timestamp']
+
+
+class LazyRow:
+    """
+    A loaded history row whose Calculation is built on first access.
+
+    Holds the raw text fields read from storage. The first call to
+    materialize() parses them into a Calculation (reusing the stored result),
+    caches it and releases the raw text.
+    """
+
+    __slots__ = ('row', '_calculation')
+
+    def __init__(self, row: HistoryRecord):
+        """
+        Initialize the lazy row.
+
+        Args:
+            row (HistoryRecord): The raw text fields of the row.
+        """
+        self.row: Optional[HistoryRecord] = row
+        self._calculation: Optional[Calculation] = None
+
+    def materialize(self) -> Calculation:
+        """
+        Return the Calculation for this row, building it if needed.
+
+        Returns:
+            Calculation: The parsed calculation.
+
+        Raises:
+            OperationError: If the row data is invalid.
+        """
+        if self._calculation is None:
+            operation, operand1, operand2, result, timestamp = self.row
+            try:
+                self._calculation = Calculation(
+                    operation=operation,
+                    operand1=Decimal(operand1),
+                    operand2=Decimal(operand2),
+                    result=Decimal(result),
+                    timestamp=datetime.datetime.fromisoformat(timestamp)
+                )
+            except (InvalidOperation, ValueError) as e:
+                raise OperationError(f"Invalid calculation data: {str(e)}")
+            self.row = None
+        return self._calculation
+
+    def record(self) -> HistoryRecord:
+        """
+        Return the row as text fields without materializing it.
+
+        Returns:
+            HistoryRecord: The row fields.
+        """
+        if self.row is not None:
+            return self.row
+        return calculation_record(self._calculation)
+
+
+def calculation_record(calculation: Calculation) -> HistoryRecord:
+    """
+    Convert a Calculation to the text fields stored in history files.
+
+    Args:
+        calculation (Calculation): The calculation to convert.
+
+    Returns:
+        HistoryRecord: The row fields.
+    """
+    return (
+        str(calculation.operation),
+        str(calculation.operand1),
+        str(calculation.operand2),
+        str(calculation.result),
+        calculation.timestamp.isoformat()
+    )
+
+
+def _resolve(item: Union[Calculation, LazyRow]) -> Calculation:
+    """Return the Calculation for a buffer entry, materializing lazy rows."""
+    return item.materialize() if type(item) is LazyRow else item
+
+
+class HistoryBuffer:
+    """
+    Bounded ring buffer holding the calculator's history.
+
+    Backed by a deque, so appending a calculation and evicting the oldest one
+    are O(1) no matter how full the buffer is. The buffer behaves like a
+    read-only sequence (length, iteration, indexing, slicing, equality with
+    lists) and offers the few mutating operations the calculator and its
+    undo/redo machinery need.
+
+    Rows loaded from storage can be added as LazyRow entries; they are turned
+    into Calculation objects only when accessed.
+
+    Every entry has a sequence number: entries are numbered in the order they
+    were appended, and `start` is the number of the oldest one, so evicting
+    from the oldest end keeps the numbers of the remaining entries. `version`
+    changes whenever existing numbers could come to refer to other entries
+    (removal from the newest end, restoring at the oldest end, clearing), so
+    derived indexes know when to rebuild rather than extend.
+    """
+
+    def __init__(self, maxlen: int, items: Iterable[Calculation] = ()):
+        """
+        Initialize the buffer.
+
+        Args:
+            maxlen (int): Maximum number of calculations kept.
+            items (Iterable[Calculation], optional): Initial calculations, oldest
+                first. Only the newest maxlen entries are kept. Defaults to ().
+        """
+        self.maxlen = maxlen
+        self._items: Deque[Union[Calculation, LazyRow]] = deque()
+        self.start = 0
+        self.version = 0
+        self.extend(items)
+
+    def extend(self, items: Iterable[Calculation]) -> List[Calculation]:
+        """
+        Append calculations, evicting the oldest ones beyond maxlen.
+
+        Args:
+            items (Iterable[Calculation]): Calculations to append, oldest first.
+
+        Returns:
+            List[Calculation]: The evicted calculations, oldest first.
+        """
+        self._items.extend(items)
+        return self.pop_oldest(len(self._items) - self.maxlen)
+
+    def extend_lazy(self, rows: Iterable[HistoryRecord]) -> None:
+        """
+        Append raw history rows without building Calculation objects.
+
+        Rows beyond maxlen are dropped oldest first without being parsed.
+
+        Args:
+            rows (Iterable[HistoryRecord]): Raw rows, oldest first.
+        """
+        self._items.extend(map(LazyRow, rows))
+        excess = len(self._items) - self.maxlen
+        if excess > 0:
+            popleft = self._items.popleft
+            for _ in range(excess):
+                popleft()
+            self.start += excess
+
+    def records(self, start: int = 0) -> Iterator[HistoryRecord]:
+        """
+        Iterate over the history as text rows, oldest first.
+
+        Lazy rows that were never accessed are written back as loaded,
+        without being materialized. Iterates over a snapshot, so the buffer
+        may be appended to meanwhile (e.g. while a background observer saves).
+
+        Args:
+            start (int, optional): Position of the first row. Defaults to 0.
+
+        Returns:
+            Iterator[HistoryRecord]: The rows.
+        """
+        if start > 0:
+            # Walk from the newest end, so reading recent rows stays cheap
+            snapshot = list(islice(reversed(self._items), max(len(self._items) - start, 0)))
+            snapshot.reverse()
+        else:
+            snapshot = list(self._items)
+        for item in snapshot:
+            if type(item) is LazyRow:
+                yield item.record()
+            else:
+                yield calculation_record(item)
+
+    def pop_newest(self, count: int) -> List[Calculation]:
+        """
+        Remove calculations from the newest end.
+
+        Args:
+            count (int): Number of calculations to remove.
+
+        Returns:
+            List[Calculation]: The removed calculations, oldest first.
+        """
+        pop = self._items.pop
+        removed = [_resolve(pop()) for _ in range(min(count, len(self._items)))]
+        removed.reverse()
+        if removed:
+            self.version += 1
+        return removed
+
+    def pop_oldest(self, count: int) -> List[Calculation]:
+        """
+        Remove calculations from the oldest end.
+
+        Args:
+            count (int): Number of calculations to remove.
+
+        Returns:
+            List[Calculation]: The removed calculations, oldest first.
+        """
+        popleft = self._items.popleft
+        removed = [_resolve(popleft()) for _ in range(min(count, len(self._items)))]
+        self.start += len(removed)
+        return removed
+
+    def restore_oldest(self, items: List[Calculation]) -> None:
+        """
+        Put previously evicted calculations back at the oldest end.
+
+        Args:
+            items (List[Calculation]): Calculations to restore, oldest first.
+        """
+        self._items.extendleft(reversed(items))
+        self.start -= len(items)
+        self.version += 1
+
+    def clear(self) -> None:
+        """Remove all calculations."""
+        self.start += len(self._items)
+        self.version += 1
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Calculation]:
+        return map(_resolve, self._items)
+
+    def __reversed__(self) -> Iterator[Calculation]:
+        return map(_resolve, reversed(self._items))
+
+    @overload
+    def __getitem__(self, index: int) -> Calculation: ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Calculation]: ...  # pragma: no cover
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Calculation, List[Calculation]]:
+        """
+        Return a calculation by position, or a list for a slice.
+
+        Positions near either end are reached in O(1); contiguous slices walk
+        from whichever end is closer.
+        """
+        if not isinstance(index, slice):
+            return _resolve(self._items[index])
+
+        start, stop, step = index.indices(len(self._items))
+        if step != 1:
+            return list(map(_resolve, list(self._items)[index]))
+        if stop <= start:
+            return []
+        size = len(self._items)
+        if start >= size - stop:
+            # Closer to the newest end: walk backwards and flip the result
+            tail = list(map(_resolve, islice(reversed(self._items), size - stop, size - start)))
+            tail.reverse()
+            return tail
+        return list(map(_resolve, islice(self._items, start, stop)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, HistoryBuffer):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"HistoryBuffer(maxlen={self.maxlen}, size={len(self._items)})"
@@ -0,0 +1,79 @@
+########################
+# History Export       #
+########################
+
+import csv
+from itertools import islice
+import json
+from typing import Iterable, Iterator, List, TextIO
+
+from app.exceptions import OperationError
+from app.history_buffer import HISTORY_COLUMNS, HistoryRecord
+
+# Supported export formats
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+# One JSONL line, with a slot for each encoded value
+_JSONL_ROW = '{' + ', '.join(f'"{column}": %s' for column in HISTORY_COLUMNS) + '}\n'
+
+
+def iter_chunks(records: Iterable[HistoryRecord], chunk_size: int) -> Iterator[List[HistoryRecord]]:
+    """
+    Group rows into lists of at most chunk_size.
+
+    Args:
+        records (Iterable[HistoryRecord]): The rows.
+        chunk_size (int): Maximum rows per chunk.
+
+    Returns:
+        Iterator[List[HistoryRecord]]: The chunks, in order.
+    """
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_records(records: Iterable[HistoryRecord], f: TextIO, export_format: str, chunk_size: int) -> int:
+    """
+    Write rows to a text stream, one chunk at a time.
+
+    Only one chunk is held in memory, so the cost in memory does not depend
+    on the number of rows. CSV output has a header row; JSONL output has one
+    object per row with the values as strings, so decimals keep their exact
+    representation.
+
+    Args:
+        records (Iterable[HistoryRecord]): The rows, in order.
+        f (TextIO): The stream to write to.
+        export_format (str): 'csv' or 'jsonl'.
+        chunk_size (int): Rows per chunk.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        OperationError: If the format or chunk size is invalid.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise OperationError(f"Unknown export format: {export_format}")
+    if chunk_size <= 0:
+        raise OperationError("chunk_size must be positive")
+
+    rows = 0
+    if export_format == 'csv':
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(HISTORY_COLUMNS)
+        for chunk in iter_chunks(records, chunk_size):
+            writer.writerows(chunk)
+            rows += len(chunk)
+    else:
+        # Every value is a string, so each row is the same object with its
+        # values encoded in turn; this skips building and walking a dict per row
+        encode = json.JSONEncoder().encode
+        for chunk in iter_chunks(records, chunk_size):
+            f.write(''.join([_JSONL_ROW % tuple(map(encode, record)) for record in chunk]))
+            rows += len(chunk)
+    return rows
@@ -0,0 +1,130 @@
+########################
+# History DataFrame    #
+########################
+
+import datetime
+from typing import Any, Dict, Optional
+
+from app.history_buffer import HISTORY_COLUMNS, HistoryBuffer
+from app.history_store import utc_micros
+from app.lazy_import import LazyModule
+
+# numpy and pandas are only imported when a DataFrame is requested
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+# Smallest capacity allocated for the column buffers
+MIN_CAPACITY = 16
+
+# Columns holding text; the timestamp column holds datetime64 values
+_TEXT_COLUMNS = HISTORY_COLUMNS[:4]
+
+# Buffers besides the history columns: the timestamp as UTC microseconds,
+# and whether it has a UTC offset
+_UTC_COLUMN = 'timestamp_utc'
+_AWARE_COLUMN = 'timestamp_aware'
+
+
+class HistoryFrame:
+    """
+    Column buffers mirroring a HistoryBuffer, for building DataFrames cheaply.
+
+    Each history column is kept in a NumPy array, and rows are converted
+    only once: on each request, the rows appended since the previous one are
+    written after the existing ones. Evicted rows are left in place until the
+    arrays run out of room, when the live rows are copied into fresh arrays
+    of twice the size. A change of the buffer's version (undo, redo, clear,
+    ...) discards the buffers and converts the history again.
+
+    Timestamps are kept both as written and in UTC. While no row has a UTC
+    offset the timestamp column holds them as written (datetime64); once one
+    does, it holds all of them in UTC (datetime64 with tz UTC), with naive
+    timestamps taken as local time.
+
+    The DataFrame returned by frame() is built on read-only views of the
+    buffers, so creating it copies no data apart from a UTC timestamp column.
+    """
+
+    def __init__(self, history: HistoryBuffer):
+        """
+        Initialize the buffers; they are filled on the first request.
+
+        Args:
+            history (HistoryBuffer): The history to mirror.
+        """
+        self.history = history
+        self._version: Optional[int] = None
+        self._base = 0
+        self._end = 0
+        self._columns: Dict[str, Any] = {}
+
+    def _allocate(self, capacity: int) -> Dict[str, Any]:
+        """Create empty column buffers with room for capacity rows."""
+        columns = {name: np.empty(capacity, dtype=object) for name in _TEXT_COLUMNS}
+        columns['timestamp'] = np.empty(capacity, dtype='datetime64[us]')
+        columns[_UTC_COLUMN] = np.empty(capacity, dtype=np.int64)
+        columns[_AWARE_COLUMN] = np.empty(capacity, dtype=bool)
+        return columns
+
+    def refresh(self) -> None:
+        """Convert the rows appended to the history since the last refresh."""
+        history = self.history
+        start = history.start
+        end = start + len(history)
+        if self._version != history.version:
+            self._version = history.version
+            self._columns = self._allocate(max(MIN_CAPACITY, len(history)))
+            self._base = self._end = start
+
+        begin = max(self._end, start)
+        if begin >= end:
+            return
+        if end - self._base > len(self._columns['timestamp']):
+            # Out of room: keep only the live converted rows, in new arrays,
+            # so views handed out earlier never change
+            columns = self._allocate(max(MIN_CAPACITY, 2 * len(history)))
+            converted = begin - start
+            for name, values in self._columns.items():
+                columns[name][:converted] = values[start - self._base:begin - self._base]
+            self._columns = columns
+            self._base = start
+
+        rows = list(zip(*history.records(begin - start)))
+        offset, stop = begin - self._base, end - self._base
+        for name, values in zip(_TEXT_COLUMNS, rows):
+            self._columns[name][offset:stop] = values
+        timestamps = [datetime.datetime.fromisoformat(text) for text in rows[4]]
+        self._columns['timestamp'][offset:stop] = [timestamp.replace(tzinfo=None) for timestamp in timestamps]
+        self._columns[_UTC_COLUMN][offset:stop] = [utc_micros(timestamp) for timestamp in timestamps]
+        self._columns[_AWARE_COLUMN][offset:stop] = [timestamp.tzinfo is not None for timestamp in timestamps]
+        self._end = end
+
+    def frame(self) -> 'pd.DataFrame':
+        """
+        Return the history as a DataFrame.
+
+        Only rows added since the previous call are converted. Each call
+        returns a new DataFrame, so adding or replacing columns in one leaves
+        the others as they are; its buffer-backed columns are read-only, so
+        call .copy() on it to change values in place.
+
+        Returns:
+            pd.DataFrame: One row per calculation with the operation, operands
+                and result as text (object dtype) and the timestamp as
+                datetime64, in UTC if any timestamp has a UTC offset.
+        """
+        self.refresh()
+        history = self.history
+        offset = history.start - self._base
+        views = {}
+        for name, values in self._columns.items():
+            view = values[offset:offset + len(history)]
+            view.flags.writeable = False
+            views[name] = view
+        if views[_AWARE_COLUMN].any():
+            # datetime64 without a time zone cannot hold offsets; give all rows in UTC
+            utc = pd.Series(views[_UTC_COLUMN].view('datetime64[us]'), copy=False)
+            views['timestamp'] = utc.dt.tz_localize('UTC').array
+        # Text stays in object columns, which wrap the buffer without a scan
+        series = {name: pd.Series(views[name], dtype=views[name].dtype, copy=False) for name in HISTORY_COLUMNS}
+        return pd.DataFrame(series, columns=HISTORY_COLUMNS, copy=False)
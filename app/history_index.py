@@ -0,0 +1,176 @@
+########################
+# History Index        #
+########################
+
+from bisect import bisect_left, bisect_right, insort
+import datetime
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.calculation import Calculation
+from app.history_buffer import HistoryBuffer
+from app.history_store import utc_micros
+
+_first = itemgetter(0)
+_operation = attrgetter('operation')
+_timestamp = attrgetter('timestamp')
+_result = attrgetter('result')
+
+
+class HistoryIndex:
+    """
+    Secondary indexes over a HistoryBuffer, maintained incrementally.
+
+    Entries are referenced by their buffer sequence numbers, so evicting the
+    oldest entries needs no index update: sequence numbers below the buffer's
+    start are simply skipped, and pruned once they outnumber the live ones.
+    New entries are indexed on the next query. A change of the buffer's
+    version (undo, clear, ...) triggers a rebuild.
+
+    Three indexes are kept:
+    - operation name -> ascending sequence numbers
+    - (timestamp, sequence number) pairs sorted by timestamp, with timestamps
+      as UTC microseconds (naive ones taken as local time), so naive and
+      offset-aware timestamps can be mixed
+    - (result, sequence number) pairs sorted by result
+    """
+
+    def __init__(self, history: HistoryBuffer):
+        """
+        Initialize the index; it is built on the first query.
+
+        Args:
+            history (HistoryBuffer): The history to index.
+        """
+        self.history = history
+        self._version: Optional[int] = None
+        self._base = 0
+        self._end = 0
+        self._by_operation: Dict[str, List[int]] = {}
+        self._by_timestamp: List[Tuple[int, int]] = []
+        self._by_result: List[Tuple[Decimal, int]] = []
+
+    def _rebuild(self) -> None:
+        """Drop all entries and start indexing from the buffer's oldest entry."""
+        self._version = self.history.version
+        self._base = self._end = self.history.start
+        self._by_operation = {}
+        self._by_timestamp = []
+        self._by_result = []
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the buffer."""
+        history = self.history
+        stale = history.start - self._base
+        if self._version != history.version or stale > len(history):
+            self._rebuild()
+        begin = max(self._end, history.start)
+        end = history.start + len(history)
+        if begin >= end:
+            return
+
+        calculations = history[begin - history.start:]
+        sequences = range(begin, end)
+        by_operation = self._by_operation
+        for sequence, operation in zip(sequences, map(_operation, calculations)):
+            by_operation.setdefault(operation, []).append(sequence)
+        timestamps = list(zip(map(utc_micros, map(_timestamp, calculations)), sequences))
+        results = list(zip(map(_result, calculations), sequences))
+
+        if len(timestamps) * 8 < len(self._by_result):
+            # A few new entries: insert them into the sorted lists in place
+            for pair in timestamps:
+                insort(self._by_timestamp, pair)
+            for pair in results:
+                insort(self._by_result, pair)
+        else:
+            # Many new entries (e.g. after a rebuild): sort once instead. The
+            # sort is stable and new sequence numbers are the largest, so
+            # sorting on the value alone keeps equal values in sequence order
+            self._by_timestamp.extend(timestamps)
+            self._by_timestamp.sort(key=_first)
+            self._by_result.extend(results)
+            self._by_result.sort(key=_first)
+        self._end = end
+
+    def query(
+        self,
+        operation: Optional[str] = None,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+        min_result: Optional[Decimal] = None,
+        max_result: Optional[Decimal] = None,
+        limit: Optional[int] = None
+    ) -> List[Calculation]:
+        """
+        Find the calculations matching all given filters.
+
+        Each filter is answered from its index (a dictionary lookup or two
+        binary searches), and the candidate sets are intersected, so the cost
+        depends on the number of candidates rather than the size of the history.
+        Time bounds are compared in UTC; naive bounds are taken as local time.
+
+        Args:
+            operation (Optional[str], optional): Operation name. Defaults to None.
+            since (Optional[datetime.datetime], optional): Earliest timestamp,
+                inclusive. Defaults to None.
+            until (Optional[datetime.datetime], optional): Latest timestamp,
+                exclusive. Defaults to None.
+            min_result (Optional[Decimal], optional): Smallest result, inclusive.
+                Defaults to None.
+            max_result (Optional[Decimal], optional): Largest result, inclusive.
+                Defaults to None.
+            limit (Optional[int], optional): Return at most the newest limit
+                matches. Defaults to None.
+
+        Returns:
+            List[Calculation]: The matching calculations, oldest first.
+        """
+        self.refresh()
+        start = self.history.start
+        candidates: List[Iterable[int]] = []
+        only_operation = operation is not None and all(
+            value is None for value in (since, until, min_result, max_result)
+        )
+
+        if operation is not None:
+            sequences = self._by_operation.get(operation, [])
+            first = bisect_left(sequences, start)
+            if only_operation and limit is not None and limit > 0:
+                first = max(first, len(sequences) - limit)
+            candidates.append(sequences[first:])
+        if since is not None or until is not None:
+            candidates.append(self._range(
+                self._by_timestamp,
+                None if since is None else utc_micros(since),
+                None if until is None else utc_micros(until),
+                bisect_left
+            ))
+        if min_result is not None or max_result is not None:
+            candidates.append(self._range(self._by_result, min_result, max_result, bisect_right))
+
+        if not candidates:
+            size = len(self.history)
+            count = size if limit is None else min(max(limit, 0), size)
+            return self.history[size - count:]
+
+        if only_operation:
+            # Operation lists are already in order and hold no evicted entries here
+            matches = candidates[0]
+        else:
+            candidates.sort(key=len)
+            selected: Set[int] = set(candidates[0])
+            for other in candidates[1:]:
+                selected.intersection_update(other)
+            matches = sorted(sequence for sequence in selected if sequence >= start)
+        if limit is not None:
+            matches = matches[-limit:] if limit > 0 else []
+        return [self.history[sequence - start] for sequence in matches]
+
+    @staticmethod
+    def _range(entries: List[Tuple], low: object, high: object, upper_bisect: Callable) -> List[int]:
+        """Return the sequence numbers of sorted entries whose key lies between low and high."""
+        first = bisect_left(entries, low, key=_first) if low is not None else 0
+        last = upper_bisect(entries, high, key=_first) if high is not None else len(entries)
+        return [sequence for _, sequence in entries[first:last]]
@@ -0,0 +1,222 @@
+########################
+# SQLite History Store #
+########################
+
+import datetime
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Iterable, Iterator, List, Optional, Union
+
+from app.history_buffer import HistoryRecord
+from app.history_store import utc_micros
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS history ("
+    " id INTEGER PRIMARY KEY,"
+    " operation TEXT NOT NULL,"
+    " operand1 TEXT NOT NULL,"
+    " operand2 TEXT NOT NULL,"
+    " result TEXT NOT NULL,"
+    " timestamp TEXT NOT NULL,"
+    " timestamp_utc INTEGER NOT NULL DEFAULT 0)",
+    "CREATE INDEX IF NOT EXISTS history_operation ON history (operation)",
+    "DROP INDEX IF EXISTS history_timestamp",
+    "CREATE INDEX IF NOT EXISTS history_timestamp_utc ON history (timestamp_utc)",
+)
+
+# Databases written before timestamp_utc existed get the column added and filled
+_MIGRATION = (
+    "ALTER TABLE history ADD COLUMN timestamp_utc INTEGER NOT NULL DEFAULT 0",
+    "UPDATE history SET timestamp_utc = utc_micros(timestamp)",
+)
+
+_COLUMNS = "operation, operand1, operand2, result, timestamp"
+_INSERT = f"INSERT INTO history ({_COLUMNS}, timestamp_utc) VALUES (?1, ?2, ?3, ?4, ?5, utc_micros(?5))"
+
+
+def _sql_utc_micros(timestamp: str) -> int:
+    """SQL function utc_micros(timestamp): the stored text as UTC microseconds."""
+    return utc_micros(datetime.datetime.fromisoformat(timestamp))
+
+
+class SQLiteHistoryStore:
+    """
+    Calculation history kept in an SQLite database.
+
+    Rows are stored as the same text fields as the CSV history file, in
+    insertion order, with indexes on operation and timestamp. Timestamps are
+    also stored as UTC microseconds (naive ones taken as local time), which
+    is what time filters compare, so offset-aware and naive timestamps sort
+    correctly together. The database runs in WAL mode, and every write is
+    one transaction, so appending a calculation costs a single-row insert
+    rather than a rewrite of the file.
+
+    The connection may be used from several threads (e.g. a background
+    auto-save); access is serialized with a lock.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open the database, creating the table and indexes if needed.
+
+        Args:
+            path (Union[str, Path]): The database file.
+
+        Raises:
+            sqlite3.DatabaseError: If the file is not an SQLite database.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        try:
+            self._connection.create_function("utc_micros", 1, _sql_utc_micros, deterministic=True)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            with self._connection:
+                columns = {row[1] for row in self._connection.execute("PRAGMA table_info(history)")}
+                if columns and 'timestamp_utc' not in columns:
+                    for statement in _MIGRATION:
+                        self._connection.execute(statement)
+                for statement in _SCHEMA:
+                    self._connection.execute(statement)
+        except sqlite3.DatabaseError:
+            self._connection.close()
+            raise
+
+    def replace(self, records: Iterable[HistoryRecord], keep: int = 0) -> int:
+        """
+        Replace the stored rows after the oldest keep ones, in one transaction.
+
+        Args:
+            records (Iterable[HistoryRecord]): The new rows, oldest first.
+            keep (int, optional): Number of oldest rows to keep in front of
+                the new ones (e.g. rows no longer held in memory). Defaults to 0.
+
+        Returns:
+            int: Number of rows kept, at most keep.
+        """
+        with self._lock, self._connection:
+            kept = min(max(keep, 0), self._connection.execute("SELECT COUNT(*) FROM history").fetchone()[0])
+            if kept:
+                self._connection.execute(
+                    "DELETE FROM history WHERE id > (SELECT id FROM history ORDER BY id LIMIT 1 OFFSET ?)",
+                    (kept - 1,)
+                )
+            else:
+                self._connection.execute("DELETE FROM history")
+            self._connection.executemany(_INSERT, records)
+        return kept
+
+    def append(self, records: Iterable[HistoryRecord]) -> None:
+        """
+        Append rows, in one transaction.
+
+        Args:
+            records (Iterable[HistoryRecord]): The new rows, oldest first.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(_INSERT, records)
+
+    def count(self) -> int:
+        """
+        Count the stored rows.
+
+        Returns:
+            int: Number of rows.
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def tail(self, count: int) -> List[HistoryRecord]:
+        """
+        Read the newest rows.
+
+        Args:
+            count (int): Maximum number of rows to read.
+
+        Returns:
+            List[HistoryRecord]: The rows, oldest first.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM history ORDER BY id DESC LIMIT ?", (count,)
+            ).fetchall()
+        rows.reverse()
+        return rows
+
+    def query(
+        self,
+        operation: Optional[str] = None,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[HistoryRecord]:
+        """
+        Read the rows matching all given filters, using the indexes.
+
+        Time bounds are compared in UTC; naive bounds are taken as local time.
+
+        Args:
+            operation (Optional[str], optional): Operation name, e.g. 'Addition'.
+                Defaults to None.
+            since (Optional[datetime.datetime], optional): Earliest timestamp,
+                inclusive. Defaults to None.
+            until (Optional[datetime.datetime], optional): Latest timestamp,
+                exclusive. Defaults to None.
+            limit (Optional[int], optional): Return at most the newest limit
+                matches. Defaults to None.
+
+        Returns:
+            List[HistoryRecord]: The matching rows, oldest first.
+        """
+        conditions: List[str] = []
+        parameters: List[Union[str, int]] = []
+        if operation is not None:
+            conditions.append("operation = ?")
+            parameters.append(operation)
+        if since is not None:
+            conditions.append("timestamp_utc >= ?")
+            parameters.append(utc_micros(since))
+        if until is not None:
+            conditions.append("timestamp_utc < ?")
+            parameters.append(utc_micros(until))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        parameters.append(-1 if limit is None else limit)
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM history{where} ORDER BY id DESC LIMIT ?", parameters
+            ).fetchall()
+        rows.reverse()
+        return rows
+
+    def iter_records(self, chunk_size: int = 10000) -> Iterator[HistoryRecord]:
+        """
+        Stream all rows, oldest first, without holding them in memory.
+
+        Reads through a separate connection, so writers on this store are
+        not blocked meanwhile; in WAL mode the reader sees the rows as they
+        were when it started.
+
+        Args:
+            chunk_size (int, optional): Rows fetched per round trip. Defaults to 10000.
+
+        Returns:
+            Iterator[HistoryRecord]: The rows.
+        """
+        connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        try:
+            cursor = connection.execute(f"SELECT {_COLUMNS} FROM history ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            connection.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,332 @@
+########################
+# Columnar History     #
+########################
+
+from array import array
+import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.calculation import Calculation
+from app.exceptions import OperationError
+from app.history_buffer import HistoryRecord
+
+# Timestamps are stored as wall-clock microseconds relative to this naive epoch
+EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_SECOND = datetime.timedelta(seconds=1)
+
+# UTC offset column value for timestamps without a time zone
+NAIVE_OFFSET = -2 ** 31
+
+_UTC_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def utc_micros(timestamp: datetime.datetime) -> int:
+    """
+    Convert a timestamp to microseconds since the epoch in UTC.
+
+    Gives naive and offset-aware timestamps one order: naive timestamps are
+    taken as local time, as datetime.now() records them.
+
+    Args:
+        timestamp (datetime.datetime): The timestamp.
+
+    Returns:
+        int: Microseconds since 1970-01-01T00:00:00+00:00.
+    """
+    return (timestamp.astimezone(datetime.timezone.utc) - _UTC_EPOCH) // _MICROSECOND
+
+
+def split_timestamp(timestamp: datetime.datetime) -> Tuple[int, Optional[int]]:
+    """
+    Split a timestamp into stored parts.
+
+    Args:
+        timestamp (datetime.datetime): The timestamp, naive or offset-aware.
+
+    Returns:
+        Tuple[int, Optional[int]]: Wall-clock microseconds since EPOCH, and the
+            UTC offset in seconds (None for a naive timestamp).
+
+    Raises:
+        ValueError: If the UTC offset is not a whole number of seconds.
+    """
+    micros = (timestamp.replace(tzinfo=None) - EPOCH) // _MICROSECOND
+    offset = timestamp.utcoffset()
+    if offset is None:
+        return micros, None
+    if offset % _SECOND:
+        raise ValueError(f"UTC offset must be whole seconds: {timestamp.isoformat()}")
+    return micros, offset // _SECOND
+
+
+def join_timestamp(micros: int, offset: int = NAIVE_OFFSET) -> datetime.datetime:
+    """
+    Rebuild a timestamp from its stored parts.
+
+    Args:
+        micros (int): Wall-clock microseconds since EPOCH.
+        offset (int, optional): UTC offset in seconds, or NAIVE_OFFSET.
+            Defaults to NAIVE_OFFSET.
+
+    Returns:
+        datetime.datetime: The timestamp.
+    """
+    timestamp = EPOCH + datetime.timedelta(microseconds=micros)
+    if offset == NAIVE_OFFSET:
+        return timestamp
+    return timestamp.replace(tzinfo=datetime.timezone(datetime.timedelta(seconds=offset)))
+
+
+class DecimalColumn:
+    """
+    Packed column of Decimal values.
+
+    Values are stored as their ASCII string form back to back in a single
+    bytearray, with an array of end offsets marking where each one stops.
+    This keeps the exact Decimal representation while costing only the
+    characters plus eight bytes per value.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty column."""
+        self.data = bytearray()
+        self.ends = array('Q')
+
+    def append(self, value: Decimal) -> None:
+        """
+        Append a value to the column.
+
+        Args:
+            value (Decimal): The value to store.
+        """
+        self.append_text(str(value))
+
+    def append_text(self, text: str) -> None:
+        """
+        Append a value given in its string form, without parsing it.
+
+        Args:
+            text (str): The value as text, e.g. read from a history file.
+        """
+        self.data += text.encode('ascii')
+        self.ends.append(len(self.data))
+
+    def text(self, index: int) -> str:
+        """
+        Return the stored string form of a value.
+
+        Args:
+            index (int): Position of the value (non-negative).
+
+        Returns:
+            str: The value as it was written.
+        """
+        start = self.ends[index - 1] if index else 0
+        return self.data[start:self.ends[index]].decode('ascii')
+
+    def __getitem__(self, index: int) -> Decimal:
+        return Decimal(self.text(index))
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    @property
+    def nbytes(self) -> int:
+        """int: Number of bytes used by the column buffers."""
+        return len(self.data) + self.ends.itemsize * len(self.ends)
+
+
+class HistoryStore:
+    """
+    Struct-of-arrays storage for calculation history.
+
+    Instead of keeping one Calculation object per row, the store keeps each
+    field in its own compact column: operation names as one-byte codes, the
+    operands and results as packed Decimal columns, and timestamps as int64
+    microseconds. Calculation objects are only built when a row is accessed.
+
+    Offset-aware timestamps keep their UTC offset in an int32 column of
+    seconds, created when the first one is stored (utc_offsets is None
+    until then), so histories of naive timestamps pay nothing for it.
+    """
+
+    def __init__(self, calculations: Iterable[Calculation] = ()):
+        """
+        Initialize the store.
+
+        Args:
+            calculations (Iterable[Calculation], optional): Initial rows, oldest
+                first. Defaults to ().
+        """
+        self.operation_names: List[str] = []
+        self._operation_codes: Dict[str, int] = {}
+        self.operations = array('B')
+        self.operand1 = DecimalColumn()
+        self.operand2 = DecimalColumn()
+        self.results = DecimalColumn()
+        self.timestamps = array('q')
+        self.utc_offsets: Optional[array] = None
+        self.extend(calculations)
+
+    def _code_for(self, operation: str) -> int:
+        """
+        Return the code for an operation name, assigning one if needed.
+
+        Args:
+            operation (str): The operation name.
+
+        Returns:
+            int: The operation code.
+
+        Raises:
+            OperationError: If more than 256 distinct operations are stored.
+        """
+        code = self._operation_codes.get(operation)
+        if code is None:
+            code = len(self.operation_names)
+            if code > 255:
+                raise OperationError("HistoryStore supports at most 256 distinct operations")
+            self._operation_codes[operation] = code
+            self.operation_names.append(operation)
+        return code
+
+    def append(self, calculation: Calculation) -> None:
+        """
+        Append a calculation as a new row.
+
+        Args:
+            calculation (Calculation): The calculation to store.
+
+        Raises:
+            ValueError: If the timestamp's UTC offset is not whole seconds.
+        """
+        micros, offset = split_timestamp(calculation.timestamp)
+        self.operations.append(self._code_for(calculation.operation))
+        self.operand1.append(calculation.operand1)
+        self.operand2.append(calculation.operand2)
+        self.results.append(calculation.result)
+        self._append_timestamp(micros, offset)
+
+    def append_record(self, record: HistoryRecord) -> None:
+        """
+        Append a row given as the text fields of a history file.
+
+        The operands and result are stored as written, without parsing them.
+        The timestamp is stored as a number (and UTC offset), so record()
+        returns it in isoformat() form: '2024-01-01 10:00:00.5' comes back as
+        '2024-01-01T10:00:00.500000'.
+
+        Args:
+            record (HistoryRecord): The row fields.
+
+        Raises:
+            ValueError: If the timestamp is not an ISO 8601 date and time.
+        """
+        operation, operand1, operand2, result, timestamp = record
+        micros, offset = split_timestamp(datetime.datetime.fromisoformat(timestamp))
+        self.operations.append(self._code_for(operation))
+        self.operand1.append_text(operand1)
+        self.operand2.append_text(operand2)
+        self.results.append_text(result)
+        self._append_timestamp(micros, offset)
+
+    def _append_timestamp(self, micros: int, offset: Optional[int]) -> None:
+        """Append a split timestamp, creating the offset column when first needed."""
+        if offset is not None and self.utc_offsets is None:
+            self.utc_offsets = array('i', [NAIVE_OFFSET]) * len(self.timestamps)
+        self.timestamps.append(micros)
+        if self.utc_offsets is not None:
+            self.utc_offsets.append(NAIVE_OFFSET if offset is None else offset)
+
+    def extend(self, calculations: Iterable[Calculation]) -> None:
+        """
+        Append several calculations, oldest first.
+
+        Args:
+            calculations (Iterable[Calculation]): The calculations to store.
+        """
+        for calculation in calculations:
+            self.append(calculation)
+
+    def operation(self, index: int) -> str:
+        """
+        Return the operation name of a row without materializing it.
+
+        Args:
+            index (int): Row position; negative values count from the end.
+
+        Returns:
+            str: The operation name.
+        """
+        return self.operation_names[self.operations[index]]
+
+    def timestamp(self, index: int) -> datetime.datetime:
+        """
+        Return the timestamp of a row without materializing it.
+
+        Args:
+            index (int): Row position; negative values count from the end.
+
+        Returns:
+            datetime.datetime: The calculation timestamp.
+        """
+        if self.utc_offsets is None:
+            return join_timestamp(self.timestamps[index])
+        return join_timestamp(self.timestamps[index], self.utc_offsets[index])
+
+    def record(self, index: int) -> HistoryRecord:
+        """
+        Return a row as the text fields of a history file.
+
+        Args:
+            index (int): Row position (non-negative).
+
+        Returns:
+            HistoryRecord: The row fields.
+        """
+        return (
+            self.operation(index),
+            self.operand1.text(index),
+            self.operand2.text(index),
+            self.results.text(index),
+            self.timestamp(index).isoformat()
+        )
+
+    def __getitem__(self, index: int) -> Calculation:
+        """
+        Materialize a row as a Calculation.
+
+        The stored result is reused, so the operation is not evaluated again.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("HistoryStore index out of range")
+        return Calculation(
+            operation=self.operation(index),
+            operand1=self.operand1[index],
+            operand2=self.operand2[index],
+            result=self.results[index],
+            timestamp=self.timestamp(index)
+        )
+
+    def __iter__(self) -> Iterator[Calculation]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    @property
+    def nbytes(self) -> int:
+        """int: Number of bytes used by the column buffers."""
+        return (
+            self.operations.itemsize * len(self.operations)
+            + self.operand1.nbytes
+            + self.operand2.nbytes
+            + self.results.nbytes
+            + self.timestamps.itemsize * len(self.timestamps)
+            + (0 if self.utc_offsets is None else self.utc_offsets.itemsize * len(self.utc_offsets))
+        )
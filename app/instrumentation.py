@@ -0,0 +1,159 @@
+########################
+# Instrumentation      #
+########################
+
+import json
+from pathlib import Path
+import time
+from typing import Any, Dict, List, Union
+
+# Histogram buckets cover durations up to 2**63 ns, one bucket per power of two
+_BUCKETS = 64
+
+
+class StageHistogram:
+    """
+    Histogram of durations for one stage.
+
+    Durations (in nanoseconds) are counted in power-of-two buckets: bucket i
+    holds durations d with 2**(i-1) <= d < 2**i. Recording is a handful of
+    integer operations, and percentiles are estimated from the buckets.
+    """
+
+    __slots__ = ('count', 'total_ns', 'min_ns', 'max_ns', 'buckets')
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets: List[int] = [0] * _BUCKETS
+
+    def record(self, duration_ns: int) -> None:
+        """
+        Add one duration.
+
+        Args:
+            duration_ns (int): The duration in nanoseconds.
+        """
+        if self.count == 0 or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.count += 1
+        self.total_ns += duration_ns
+        self.buckets[min(duration_ns.bit_length(), _BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Estimate a percentile from the buckets.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+
+        Returns:
+            int: The upper bound (in ns) of the bucket holding the percentile,
+                capped at the largest recorded duration. 0 if empty.
+        """
+        if self.count == 0:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return min((1 << index) - 1, self.max_ns)
+        return self.max_ns  # pragma: no cover
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the histogram.
+
+        Returns:
+            Dict[str, Any]: count, total/mean/min/max and p50/p90/p99 in
+                nanoseconds, plus the non-empty buckets keyed by their upper bound.
+        """
+        return {
+            'count': self.count,
+            'total_ns': self.total_ns,
+            'mean_ns': self.total_ns // self.count if self.count else 0,
+            'min_ns': self.min_ns,
+            'max_ns': self.max_ns,
+            'p50_ns': self.percentile(0.50),
+            'p90_ns': self.percentile(0.90),
+            'p99_ns': self.percentile(0.99),
+            'buckets': {str((1 << i) - 1): n for i, n in enumerate(self.buckets) if n},
+        }
+
+
+class StageTimer:
+    """
+    Records how long each stage of a calculation takes.
+
+    Callers mark the start of a calculation with start(), then call lap(stage)
+    at the end of each stage; the time since the previous mark goes into that
+    stage's histogram. stop() records the whole calculation as 'total'.
+
+    A timer is meant to be driven by one thread at a time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the timer with empty histograms."""
+        self.histograms: Dict[str, StageHistogram] = {}
+        self._start = 0
+        self._last = 0
+
+    def start(self) -> None:
+        """Mark the start of a calculation."""
+        self._start = self._last = time.perf_counter_ns()
+
+    def lap(self, stage: str) -> None:
+        """
+        Record the time since the previous mark for a stage.
+
+        Args:
+            stage (str): The stage that just finished.
+        """
+        now = time.perf_counter_ns()
+        self.record(stage, now - self._last)
+        self._last = now
+
+    def stop(self) -> None:
+        """Record the time since start() as the 'total' stage."""
+        self.record('total', time.perf_counter_ns() - self._start)
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        """
+        Add a duration to a stage's histogram.
+
+        Args:
+            stage (str): The stage name.
+            duration_ns (int): The duration in nanoseconds.
+        """
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = StageHistogram()
+        histogram.record(duration_ns)
+
+    def reset(self) -> None:
+        """Discard all recorded timings."""
+        self.histograms.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize every stage.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: StageHistogram summaries keyed by stage.
+        """
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def dump(self, path: Union[str, Path]) -> None:
+        """
+        Write the stage summaries to a JSON file.
+
+        Args:
+            path (Union[str, Path]): The output file.
+        """
+        Path(path).write_text(json.dumps(self.stats(), indent=2), encoding='utf-8')
@@ -0,0 +1,64 @@
+########################
+# Lazy Imports         #
+########################
+
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Lets a heavy optional dependency be referenced at module level (so it can
+    still be patched in tests, e.g. `app.calculator.pd.read_csv`) without
+    paying for the import until it is actually used.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the stand-in.
+
+        Args:
+            name (str): The module to import on first use.
+        """
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def load(self) -> ModuleType:
+        """
+        Import the module if needed and return it.
+
+        Returns:
+            ModuleType: The imported module.
+
+        Raises:
+            ImportError: If the module is not installed.
+        """
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        """bool: True once the module has been imported."""
+        return self._module is not None
+
+    def available(self) -> bool:
+        """
+        Check whether the module can be imported, without importing it.
+
+        Returns:
+            bool: True if the module is installed.
+        """
+        return self._module is not None or importlib.util.find_spec(self._name) is not None
+
+    def __getattr__(self, attribute: str) -> Any:
+        # Only called for attributes not set on the stand-in itself
+        return getattr(self.load(), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"LazyModule({self._name!r}, {state})"
@@ -0,0 +1,110 @@
+########################
+# Logging Setup        #
+########################
+
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+from typing import Optional
+
+from app.calculator_config import CalculatorConfig
+
+# Format of log file lines
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Listener writing queued records in 'queue' mode, and the root handler feeding it
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock QueueHandler formats each record before queueing it so the
+    record can be pickled. The queue here never leaves the process, so the
+    record is queued as-is: the caller pays only for creating the record,
+    and the message is built from its %-style arguments on the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Return the record unchanged.
+
+        Args:
+            record (logging.LogRecord): The record being queued.
+
+        Returns:
+            logging.LogRecord: The same record.
+        """
+        return record
+
+
+def configure_logging(config: CalculatorConfig) -> None:
+    """
+    Route log records to the configured log file.
+
+    In 'sync' mode records are formatted and written by the thread that logs
+    them. In 'queue' mode the root logger only enqueues them, and a
+    QueueListener thread formats and writes them. Either way the root level
+    is set to config.log_level, so disabled calls return before a record is
+    created. Any previous configuration, including a running listener, is
+    replaced.
+
+    Args:
+        config (CalculatorConfig): The configuration providing log_file,
+            log_mode and log_level.
+    """
+    global _listener, _queue_handler
+
+    file_handler = logging.FileHandler(str(config.log_file.resolve()))
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    previous = _listener
+    _listener = _queue_handler = None
+    if config.log_mode == 'queue':
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _queue_handler = DeferredQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+
+    logging.basicConfig(
+        handlers=[_queue_handler or file_handler],
+        level=config.log_level,
+        force=True  # Overwrite any existing logging configuration
+    )
+    if previous is not None:
+        _stop_listener(previous)
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the background listener, writing any records still queued.
+
+    The listener's file handler is attached to the root logger in place of
+    the queue handler, so later records are written synchronously. Does
+    nothing in 'sync' mode. Registered to run at interpreter exit.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    listener, handler = _listener, _queue_handler
+    _listener = _queue_handler = None
+
+    root = logging.getLogger()
+    root.removeHandler(handler)
+    for file_handler in listener.handlers:
+        root.addHandler(file_handler)
+    listener.stop()
+
+
+def _stop_listener(listener: QueueListener) -> None:
+    """Drain and stop a replaced listener and close its handlers."""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+# Runs before logging's own exit hook, which only flushes the root handlers
+atexit.register(shutdown_logging)
@@ -0,0 +1,180 @@
+########################
+# Observer Dispatcher  #
+########################
+
+import atexit
+import logging
+import queue
+import threading
+from typing import Callable, List, Tuple, Union
+
+from app.calculation import Calculation
+from app.history import HistoryObserver
+
+# Queue entry: ('update', calculation), ('batch', list of calculations)
+# or ('call', callback)
+_Event = Tuple[str, Union[Calculation, List[Calculation], Callable[[], None]]]
+
+BACKPRESSURE_POLICIES = ('block', 'drop', 'sync')
+
+
+class BackgroundDispatcher:
+    """
+    Delivers calculation events to observers on a background worker thread.
+
+    Events are put on a bounded queue and handed to every registered observer
+    by a single worker thread, in the order they were submitted. When the
+    queue is full the backpressure policy decides what happens:
+
+    - 'block': the caller waits until there is room.
+    - 'drop': the event is discarded and counted in `dropped`.
+    - 'sync': the caller waits for the queued events to be delivered, then
+      delivers the event itself, on its own thread.
+
+    Deliveries never overlap: the worker and inline deliveries share a lock,
+    so observers are called one event at a time and in order.
+
+    flush() waits until every queued event has been delivered; it is also
+    registered to run at interpreter exit through close().
+    """
+
+    def __init__(self, observers: List[HistoryObserver], maxsize: int = 1000, policy: str = 'block'):
+        """
+        Initialize the dispatcher and start its worker thread.
+
+        Args:
+            observers (List[HistoryObserver]): The observer list to deliver to.
+                The list is shared, so later additions and removals apply.
+            maxsize (int, optional): Maximum number of queued events. Defaults to 1000.
+            policy (str, optional): Backpressure policy: 'block', 'drop' or 'sync'.
+                Defaults to 'block'.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.observers = observers
+        self.policy = policy
+        self.dropped = 0
+        self.errors = 0
+        self._queue: "queue.Queue[_Event | None]" = queue.Queue(maxsize)
+        self._closed = False
+        self._lock = threading.RLock()
+        self._thread = threading.Thread(target=self._run, name="observer-dispatch", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, calculation: Calculation) -> None:
+        """
+        Queue a single calculation event.
+
+        Args:
+            calculation (Calculation): The calculation performed.
+        """
+        self._put(('update', calculation))
+
+    def submit_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Queue a batch of calculation events.
+
+        Args:
+            calculations (List[Calculation]): The calculations performed, in order.
+        """
+        self._put(('batch', calculations))
+
+    def submit_call(self, callback: Callable[[], None]) -> None:
+        """
+        Queue a callback to run on the worker thread, after the events queued before it.
+
+        Lets other threads (e.g. timers) hand work to the thread that
+        delivers events, so it runs in order with them and never
+        concurrently. Callbacks are never dropped: with every backpressure
+        policy, the caller waits for room in the queue.
+
+        Args:
+            callback (Callable[[], None]): The function to run.
+        """
+        if self._closed:
+            with self._lock:
+                self._deliver(('call', callback))
+            return
+        self._queue.put(('call', callback))
+
+    def _put(self, event: _Event) -> None:
+        """Queue an event according to the backpressure policy."""
+        if self._closed:
+            with self._lock:
+                self._deliver(event)
+            return
+        if self.policy == 'block':
+            self._queue.put(event)
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            if self.policy == 'drop':
+                self.dropped += 1
+                logging.warning("Observer queue full - event dropped")
+            else:
+                # Deliver the older queued events first, then this one
+                self.flush()
+                with self._lock:
+                    self._deliver(event)
+
+    def _deliver(self, event: _Event) -> None:
+        """Hand an event to every observer, or run a callback, logging failures."""
+        kind, payload = event
+        if kind == 'call':
+            try:
+                payload()
+            except Exception as e:
+                self.errors += 1
+                logging.error("Observer callback failed: %s", e)
+            return
+        for observer in tuple(self.observers):
+            try:
+                if kind == 'batch':
+                    observer.update_batch(payload)
+                else:
+                    observer.update(payload)
+            except Exception as e:
+                self.errors += 1
+                logging.error("Observer %s failed: %s", observer.__class__.__name__, e)
+
+    def _run(self) -> None:
+        """Worker loop: deliver queued events until the stop sentinel arrives."""
+        while True:
+            event = self._queue.get()
+            try:
+                if event is None:
+                    return
+                with self._lock:
+                    self._deliver(event)
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Wait until every queued event has been delivered.
+
+        Calling it from an observer running on the worker thread returns
+        immediately instead of waiting on itself.
+        """
+        if threading.current_thread() is self._thread:
+            return
+        self._queue.join()
+
+    def close(self) -> None:
+        """
+        Deliver all queued events and stop the worker thread.
+
+        Later submissions are delivered synchronously. Safe to call more than once.
+        """
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
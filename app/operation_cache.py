@@ -0,0 +1,87 @@
+########################
+# Operation Cache      #
+########################
+
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Dict, Hashable, Optional
+
+
+class OperationCache:
+    """
+    Bounded least-recently-used cache of operation results.
+
+    Maps a key describing an operation and its operands to the computed
+    result. When the cache is full, the least recently used entry is evicted.
+    Hit, miss and eviction counters are kept for monitoring.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of results kept.
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Decimal]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Decimal]:
+        """
+        Look up a cached result.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Optional[Decimal]: The cached result, or None on a miss.
+        """
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Hashable, result: Decimal) -> None:
+        """
+        Store a result, evicting the least recently used entry if full.
+
+        Args:
+            key (Hashable): The cache key.
+            result (Decimal): The computed result.
+        """
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached results and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters.
+
+        Returns:
+            Dict[str, int]: hits, misses, evictions, current size and maxsize.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
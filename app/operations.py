@@ -4,7 +4,8 @@
 
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, Optional
+from app.decimal_math import decimal_power, decimal_root
 from app.exceptions import ValidationError
 
 
@@ -16,6 +17,17 @@ class Operation(ABC):
     implement the execute method and can optionally override operand validation.
     """
 
+    def __init__(self, precision: Optional[int] = None):
+        """
+        Initialize the operation.
+
+        Args:
+            precision (Optional[int], optional): Significant digits used by
+                operations that round their result (Power, Root). Defaults to
+                None, meaning the active decimal context precision.
+        """
+        self.precision = precision
+
     @abstractmethod
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         """
@@ -179,23 +191,28 @@ class Power(Operation):
         """
         Validate operands for power operation.
 
-        Overrides the base class method to ensure that the exponent is not negative.
+        Overrides the base class method to ensure that the exponent is not negative
+        and that a negative base is only raised to integral powers.
 
         Args:
             a (Decimal): Base number.
             b (Decimal): Exponent.
 
         Raises:
-            ValidationError: If the exponent is negative.
+            ValidationError: If the exponent is negative, or fractional with a negative base.
         """
         super().validate_operands(a, b)
         if b < 0:
             raise ValidationError("Negative exponents not supported")
+        if a < 0 and b != b.to_integral_value():
+            raise ValidationError("Fractional exponents of negative numbers are not supported")
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         """
         Calculate one number raised to the power of another.
 
+        Computed natively in Decimal arithmetic, rounded to the operation's precision.
+
         Args:
             a (Decimal): Base number.
             b (Decimal): Exponent.
@@ -204,7 +221,7 @@ class Power(Operation):
             Decimal: Result of the exponentiation.
         """
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), float(b)))
+        return decimal_power(a, b, self.precision)
 
 
 class Root(Operation):
@@ -238,6 +255,8 @@ class Root(Operation):
         """
         Calculate the nth root of a number.
 
+        Computed natively in Decimal arithmetic, rounded to the operation's precision.
+
         Args:
             a (Decimal): Number from which the root is taken.
             b (Decimal): Degree of the root.
@@ -246,7 +265,7 @@ class Root(Operation):
             Decimal: Result of the root calculation.
         """
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), 1 / float(b)))
+        return decimal_root(a, b, self.precision)
     
 class Modulus(Operation):
     """Return the remainder of a divided by b."""
@@ -300,7 +319,7 @@ class OperationFactory:
         cls._operations[name.lower()] = operation_class
 
     @classmethod
-    def create_operation(cls, operation_type: str) -> Operation:
+    def create_operation(cls, operation_type: str, precision: Optional[int] = None) -> Operation:
         """
         Create an operation instance based on the operation type.
 
@@ -309,6 +328,8 @@ class OperationFactory:
 
         Args:
             operation_type (str): The type of operation to create (e.g., 'add').
+            precision (Optional[int], optional): Significant digits for operations
+                that round their result. Defaults to None.
 
         Returns:
             Operation: An instance of the specified operation class.
@@ -319,4 +340,4 @@ class OperationFactory:
         operation_class = cls._operations.get(operation_type.lower())
         if not operation_class:
             raise ValueError(f"Unknown operation: {operation_type}")
-        return operation_class()
+        return operation_class(precision)
@@ -0,0 +1,129 @@
+########################
+# Parallel Evaluation  #
+########################
+
+from concurrent.futures import Future
+from decimal import Decimal, getcontext, localcontext
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError, ValidationError
+from app.input_validators import InputValidator
+from app.operations import Operation
+
+# An evaluated pair: validated first operand, validated second operand, result
+EvaluatedPair = Tuple[Decimal, Decimal, Decimal]
+
+# Chunks submitted per worker, so uneven chunks still balance out
+CHUNKS_PER_WORKER = 4
+
+# Start method for worker processes. Forking a process that runs observer,
+# auto-save timer and SQLite threads can copy held locks into the children,
+# so workers are started from a clean process instead
+START_METHODS = ('forkserver', 'spawn')
+
+
+def _evaluate_chunk(
+    operation_class: Type[Operation],
+    precision: Optional[int],
+    context_precision: int,
+    config: CalculatorConfig,
+    start: int,
+    pairs: Sequence[Tuple[Any, Any]]
+) -> List[EvaluatedPair]:
+    """
+    Validate and evaluate one chunk of operand pairs in a worker process.
+
+    Defined at module level so it can be pickled for the process pool.
+
+    Args:
+        operation_class (Type[Operation]): The operation to apply.
+        precision (Optional[int]): Precision bound to the operation.
+        context_precision (int): Decimal context precision of the parent process.
+        config (CalculatorConfig): Configuration used for input validation.
+        start (int): Index of the chunk's first pair in the whole batch.
+        pairs (Sequence[Tuple[Any, Any]]): The operand pairs.
+
+    Returns:
+        List[EvaluatedPair]: The validated operands and results, in order.
+
+    Raises:
+        OperationError: If the operation fails for a pair.
+        ValidationError: If an operand fails validation.
+    """
+    operation = operation_class(precision)
+    rows: List[EvaluatedPair] = []
+    with localcontext() as ctx:
+        ctx.prec = context_precision
+        for index, (a, b) in enumerate(pairs, start):
+            try:
+                validated_a = InputValidator.validate_number(a, config)
+                validated_b = InputValidator.validate_number(b, config)
+                rows.append((validated_a, validated_b, operation.execute(validated_a, validated_b)))
+            except ValidationError as e:
+                raise ValidationError(f"Pair {index}: {str(e)}")
+            except Exception as e:
+                raise OperationError(f"Operation failed for pair {index}: {str(e)}")
+    return rows
+
+
+def evaluate_parallel(
+    operation: Operation,
+    pairs: Sequence[Tuple[Any, Any]],
+    config: CalculatorConfig,
+    workers: int,
+    chunk_size: Optional[int] = None
+) -> List[EvaluatedPair]:
+    """
+    Evaluate operand pairs across a pool of worker processes.
+
+    Workers are started with the first available method of START_METHODS,
+    never by forking the calling process. The pairs are split into contiguous chunks, each evaluated by a worker
+    with the same operation class, operation precision and Decimal context
+    precision as the caller. Results are returned in input order. If any
+    pair fails, the error for the lowest failing index is raised, as in a
+    sequential run.
+
+    Args:
+        operation (Operation): The operation to apply.
+        pairs (Sequence[Tuple[Any, Any]]): The operand pairs.
+        config (CalculatorConfig): Configuration used for input validation.
+        workers (int): Number of worker processes.
+        chunk_size (Optional[int], optional): Pairs per chunk. Defaults to an
+            even split into CHUNKS_PER_WORKER chunks per worker.
+
+    Returns:
+        List[EvaluatedPair]: The validated operands and results, in order.
+
+    Raises:
+        OperationError: If the operation fails for a pair.
+        ValidationError: If an operand fails validation.
+    """
+    if not chunk_size:
+        chunk_size = max(1, -(-len(pairs) // (workers * CHUNKS_PER_WORKER)))
+    context_precision = getcontext().prec
+
+    # Imported here: they pull in multiprocessing, which most runs never need
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    available = multiprocessing.get_all_start_methods()
+    method = next(method for method in START_METHODS if method in available)
+
+    rows: List[EvaluatedPair] = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as pool:
+        futures: List[Future] = [
+            pool.submit(
+                _evaluate_chunk, type(operation), operation.precision, context_precision,
+                config, start, pairs[start:start + chunk_size]
+            )
+            for start in range(0, len(pairs), chunk_size)
+        ]
+        try:
+            for future in futures:
+                rows.extend(future.result())
+        except (ValidationError, OperationError):
+            for future in futures:
+                future.cancel()
+            raise
+    return rows
@@ -0,0 +1,78 @@
+"""
+Memory benchmark for calculation history storage.
+
+Compares the memory used by N Calculation objects held in a list (the object
+path) with the same rows held in a columnar HistoryStore.
+
+Usage:
+    python -m benchmarks.bench_history_memory [--rows 1000000]
+"""
+
+import argparse
+import datetime
+from decimal import Decimal
+import gc
+import tracemalloc
+from typing import Dict, Iterator
+
+from app.calculation import Calculation
+from app.history_store import HistoryStore
+
+OPERATIONS = ["Addition", "Subtraction", "Multiplication", "Division"]
+
+
+def generate_calculations(rows: int) -> Iterator[Calculation]:
+    """Yield a deterministic stream of calculations with precomputed results."""
+    start = datetime.datetime(2024, 1, 1)
+    step = datetime.timedelta(milliseconds=1)
+    for i in range(rows):
+        a = Decimal(i) / 100
+        b = Decimal(i % 97 + 1)
+        yield Calculation(
+            operation=OPERATIONS[i % len(OPERATIONS)],
+            operand1=a,
+            operand2=b,
+            result=a + b,
+            timestamp=start + step * i
+        )
+
+
+def measure(build) -> int:
+    """Return the bytes still allocated by the object that build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def run(rows: int) -> Dict[str, float]:
+    """Run the benchmark and return bytes used per storage layout."""
+    object_bytes = measure(lambda: list(generate_calculations(rows)))
+    store_bytes = measure(lambda: HistoryStore(generate_calculations(rows)))
+    return {
+        "rows": rows,
+        "object_bytes": object_bytes,
+        "store_bytes": store_bytes,
+        "object_bytes_per_row": object_bytes / rows,
+        "store_bytes_per_row": store_bytes / rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    results = run(args.rows)
+    print(f"rows:              {results['rows']:,}")
+    print(f"list[Calculation]: {results['object_bytes'] / 2**20:8.1f} MiB "
+          f"({results['object_bytes_per_row']:.0f} B/row)")
+    print(f"HistoryStore:      {results['store_bytes'] / 2**20:8.1f} MiB "
+          f"({results['store_bytes_per_row']:.0f} B/row)")
+
+
+if __name__ == "__main__":
+    main()
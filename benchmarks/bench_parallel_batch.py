@@ -0,0 +1,62 @@
+"""
+Scaling benchmark for parallel batch evaluation.
+
+Times Calculator.perform_batch over the same operand pairs with 1, 2, 4
+and 8 worker processes and reports the speedup over a single process.
+Results depend on the number of available cores.
+
+Usage:
+    python -m benchmarks.bench_parallel_batch [--pairs 200000] [--operation root] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+
+
+def make_pairs(count: int) -> List[Tuple[str, str]]:
+    """Build deterministic operand pairs."""
+    return [(f"{(i % 997) + 1}.{i % 89}", str((i % 7) + 2)) for i in range(count)]
+
+
+def run(pairs: int, operation: str, worker_counts: Sequence[int]) -> List[Dict[str, float]]:
+    """Run the benchmark and return one result row per worker count."""
+    data = make_pairs(pairs)
+    results = []
+    with TemporaryDirectory() as temp_dir:
+        config = CalculatorConfig(
+            base_dir=Path(temp_dir), max_history_size=pairs, auto_save=False, max_input_value=10 ** 6
+        )
+        for workers in worker_counts:
+            calc = Calculator(config)
+            start = time.perf_counter()
+            calc.perform_batch(operation, data, workers=workers)
+            elapsed = time.perf_counter() - start
+            results.append({"workers": workers, "seconds": elapsed})
+    base = results[0]["seconds"]
+    for row in results:
+        row["speedup"] = base / row["seconds"]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=int, default=200000)
+    parser.add_argument("--operation", default="root")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{args.pairs} {args.operation} pairs, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'seconds':>10}{'speedup':>9}")
+    for row in run(args.pairs, args.operation, args.workers):
+        print(f"{row['workers']:>8}{row['seconds']:>10.2f}{row['speedup']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
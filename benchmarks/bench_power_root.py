@@ -0,0 +1,70 @@
+"""
+Speed benchmark for the Decimal Power and Root engines.
+
+Times the native Decimal engines against the previous float round-trip
+(Decimal(pow(float(a), float(b)))) on typical calculator inputs.
+
+Usage:
+    python -m benchmarks.bench_power_root [--number 20000] [--precision 10]
+"""
+
+import argparse
+from decimal import Decimal
+import timeit
+from typing import Dict, List, Tuple
+
+from app.decimal_math import decimal_power, decimal_root
+
+POWER_CASES: List[Tuple[str, str]] = [("2", "10"), ("1.5", "3"), ("12.75", "7"), ("2", "0.5"), ("9.81", "2.5")]
+ROOT_CASES: List[Tuple[str, str]] = [("16", "2"), ("27", "3"), ("2", "2"), ("1000", "5"), ("50", "2.5")]
+
+
+def float_power(a: Decimal, b: Decimal) -> Decimal:
+    """The previous float-based Power implementation."""
+    return Decimal(pow(float(a), float(b)))
+
+
+def float_root(a: Decimal, b: Decimal) -> Decimal:
+    """The previous float-based Root implementation."""
+    return Decimal(pow(float(a), 1 / float(b)))
+
+
+def time_call(func, args, number: int) -> float:
+    """Return the mean time of one call in microseconds."""
+    return timeit.timeit(lambda: func(*args), number=number) / number * 1e6
+
+
+def run(number: int, precision: int) -> List[Dict[str, object]]:
+    """Run the benchmark and return one result row per case."""
+    results = []
+    for name, cases, float_func, decimal_func in (
+        ("power", POWER_CASES, float_power, decimal_power),
+        ("root", ROOT_CASES, float_root, decimal_root),
+    ):
+        for a, b in cases:
+            args = (Decimal(a), Decimal(b))
+            results.append({
+                "operation": name,
+                "a": a,
+                "b": b,
+                "float_us": time_call(float_func, args, number),
+                "decimal_us": time_call(decimal_func, args + (precision,), number),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--precision", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'case':<22}{'float (us)':>12}{'decimal (us)':>14}{'ratio':>8}")
+    for row in run(args.number, args.precision):
+        case = f"{row['operation']}({row['a']}, {row['b']})"
+        ratio = row["decimal_us"] / row["float_us"]
+        print(f"{case:<22}{row['float_us']:>12.2f}{row['decimal_us']:>14.2f}{ratio:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Benchmark suite for the calculator core.
+
+Times perform_operation for every operation type, InputValidator.validate_number,
+save_history/load_history and undo/redo at several history sizes, and
+show_history. Results are written as JSON; passing a previous result file
+as --baseline compares against it and exits with status 1 if any benchmark
+got slower than the allowed threshold.
+
+Usage:
+    python -m benchmarks [--sizes 1000 100000 1000000] [--only persistence] [--output results.json]
+                         [--baseline baseline.json] [--threshold 0.10]
+"""
+
+import argparse
+import datetime
+import json
+import os
+from pathlib import Path
+import platform
+import sys
+from tempfile import TemporaryDirectory
+import time
+import timeit
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.input_validators import InputValidator
+from app.operations import OperationFactory
+from benchmarks.bench_history_memory import generate_calculations
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+# Operand pairs valid for every operation type
+OPERANDS: Dict[str, Tuple[str, str]] = {
+    'add': ("12.5", "7.25"),
+    'subtract': ("12.5", "7.25"),
+    'multiply': ("12.5", "7.25"),
+    'divide': ("12.5", "7.25"),
+    'power': ("1.5", "7"),
+    'root': ("27", "3"),
+    'modulus': ("125", "7"),
+}
+
+VALIDATOR_INPUTS: Dict[str, object] = {
+    'int': 42,
+    'float': 3.14159,
+    'string': " 1234.5678 ",
+}
+
+# A benchmark result: name -> {'seconds': time per operation, 'ops': operations timed}
+Results = Dict[str, Dict[str, float]]
+
+
+def time_micro(func: Callable[[], object], repeat: int = 5) -> Tuple[float, int]:
+    """
+    Time a fast callable.
+
+    Picks a loop count that runs for at least 0.2 seconds and returns the best
+    per-call time over several repeats.
+
+    Returns:
+        Tuple[float, int]: Seconds per call and number of calls per repeat.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number, number
+
+
+def time_best(func: Callable[[], object], repeat: int = 3) -> float:
+    """
+    Time a slow callable by running it a few times.
+
+    Returns:
+        float: The best wall time in seconds over the repeats.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_calculator(base_dir: Path, history_size: int) -> Calculator:
+    """Create a calculator with no observers, auto-save or cache in base_dir."""
+    config = CalculatorConfig(
+        base_dir=base_dir,
+        max_history_size=max(history_size, 1),
+        auto_save=False,
+        max_input_value=10 ** 9,
+        cache_size=0
+    )
+    history_file = config.history_file
+    if history_file.exists():
+        history_file.unlink()
+    return Calculator(config)
+
+
+def fill_history(calc: Calculator, rows: int) -> None:
+    """Put rows deterministic calculations in the calculator history."""
+    calc.history.maxlen = rows
+    calc.history.extend(generate_calculations(rows))
+
+
+def bench_operations(base_dir: Path, sizes: Sequence[int]) -> Iterator[Tuple[str, float, int]]:
+    """perform_operation for each operation type."""
+    calc = make_calculator(base_dir, 1000)
+    for name, (a, b) in OPERANDS.items():
+        calc.set_operation(OperationFactory.create_operation(name))
+
+        def run() -> None:
+            calc.perform_operation(a, b)
+            # Keep the undo stack from growing with the loop count
+            calc.undo_stack.clear()
+
+        seconds, number = time_micro(run)
+        yield f"perform_operation[{name}]", seconds, number
+
+
+def bench_validator(base_dir: Path, sizes: Sequence[int]) -> Iterator[Tuple[str, float, int]]:
+    """InputValidator.validate_number on typical inputs."""
+    config = CalculatorConfig(base_dir=base_dir, max_input_value=10 ** 9)
+    for kind, value in VALIDATOR_INPUTS.items():
+        seconds, number = time_micro(lambda: InputValidator.validate_number(value, config))
+        yield f"validate_number[{kind}]", seconds, number
+
+
+def bench_persistence(base_dir: Path, sizes: Sequence[int]) -> Iterator[Tuple[str, float, int]]:
+    """save_history and load_history at each history size."""
+    for size in sizes:
+        calc = make_calculator(base_dir, size)
+        fill_history(calc, size)
+        seconds = time_best(calc.save_history)
+        yield f"save_history[{size}]", seconds, 1
+        seconds = time_best(lambda: calc.load_history(verify='trust'))
+        yield f"load_history[{size}]", seconds, 1
+
+
+def bench_undo_redo(base_dir: Path, sizes: Sequence[int]) -> Iterator[Tuple[str, float, int]]:
+    """Undoing and then redoing a history of the given depth, one step at a time."""
+    for size in sizes:
+        calc = make_calculator(base_dir, size)
+        calc.set_operation(OperationFactory.create_operation('add'))
+        for i in range(size):
+            calc.perform_operation(i, 1)
+
+        start = time.perf_counter()
+        while calc.undo():
+            pass
+        undo_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        while calc.redo():
+            pass
+        redo_seconds = time.perf_counter() - start
+        yield f"undo[{size}]", undo_seconds / size, size
+        yield f"redo[{size}]", redo_seconds / size, size
+
+
+def bench_show_history(base_dir: Path, sizes: Sequence[int]) -> Iterator[Tuple[str, float, int]]:
+    """show_history over the whole history and over the newest 10 entries."""
+    for size in sizes:
+        calc = make_calculator(base_dir, size)
+        fill_history(calc, size)
+        seconds = time_best(calc.show_history)
+        yield f"show_history[{size}]", seconds, 1
+        seconds, number = time_micro(lambda: calc.show_history(10))
+        yield f"show_history_last10[{size}]", seconds, number
+
+
+BENCHMARKS: Dict[str, Callable[[Path, Sequence[int]], Iterator[Tuple[str, float, int]]]] = {
+    'operations': bench_operations,
+    'validator': bench_validator,
+    'persistence': bench_persistence,
+    'undo_redo': bench_undo_redo,
+    'show_history': bench_show_history,
+}
+
+
+def run(sizes: Sequence[int], groups: Optional[Sequence[str]] = None) -> Results:
+    """
+    Run the suite.
+
+    Args:
+        sizes (Sequence[int]): History sizes for the size-dependent benchmarks.
+        groups (Optional[Sequence[str]], optional): Names of the benchmark
+            groups to run. Defaults to None, meaning all of them.
+
+    Returns:
+        Results: Per-benchmark seconds per operation and operations timed.
+    """
+    results: Results = {}
+    with TemporaryDirectory() as temp_dir:
+        for group, bench in BENCHMARKS.items():
+            if groups and group not in groups:
+                continue
+            for name, seconds, ops in bench(Path(temp_dir), sizes):
+                results[name] = {'seconds': seconds, 'ops': ops}
+                print(f"{name:<32}{seconds * 1e6:>14.2f} us/op", file=sys.stderr)
+    return results
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> List[Dict[str, object]]:
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (Results): The current results.
+        baseline (Results): The baseline results.
+        threshold (float): Allowed slowdown as a fraction (0.10 = 10%).
+
+    Returns:
+        List[Dict[str, object]]: One row per benchmark present in both, with
+            the ratio current/baseline and whether it counts as a regression.
+    """
+    rows = []
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        ratio = current['seconds'] / baseline[name]['seconds']
+        rows.append({'name': name, 'ratio': ratio, 'regression': ratio > 1 + threshold})
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmark groups to run")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown (default 0.10)")
+    args = parser.parse_args(argv)
+
+    report: Dict[str, object] = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'sizes': args.sizes,
+        },
+        'results': run(args.sizes, args.only),
+    }
+
+    status = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))['results']
+        comparison = compare(report['results'], baseline, args.threshold)
+        report['comparison'] = comparison
+        for row in comparison:
+            flag = "REGRESSION" if row['regression'] else ""
+            print(f"{row['name']:<32}{row['ratio']:>8.2f}x {flag}", file=sys.stderr)
+        if any(row['regression'] for row in comparison):
+            status = 1
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding='utf-8')
+    else:
+        print(text)
+    return status
@@ -23,8 +23,16 @@ Version: 1.0
 
 
 
+import sys
+
 from app.calculator_repl import calculator_repl
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from app.calculator_batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "convert-history":
+        from app.history_binary import main as convert_main
+        sys.exit(convert_main(sys.argv[2:]))
     calculator_repl()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import datetime
+from decimal import Decimal
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch, PropertyMock
+
+import pytest
+
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+
+
+class CalculationFactory:
+    """Builds Calculations with timestamps counted in minutes from a fixed base."""
+
+    base = datetime.datetime(2024, 1, 1)
+
+    def at(self, minute):
+        return self.base + datetime.timedelta(minutes=minute)
+
+    def __call__(self, a, b=1, operation="Addition", minute=0):
+        return Calculation(operation, Decimal(a), Decimal(b), timestamp=self.at(minute))
+
+
+# Fixture to build calculations with predictable timestamps
+@pytest.fixture
+def make_calculation():
+    return CalculationFactory()
+
+
+# Fixture to initialize Calculator with a temporary directory for file paths
+@pytest.fixture
+def calculator():
+    with TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        config = CalculatorConfig(base_dir=temp_path)
+
+        # Patch properties to use the temporary directory paths
+        with patch.object(CalculatorConfig, 'log_dir', new_callable=PropertyMock) as mock_log_dir, \
+             patch.object(CalculatorConfig, 'log_file', new_callable=PropertyMock) as mock_log_file, \
+             patch.object(CalculatorConfig, 'history_dir', new_callable=PropertyMock) as mock_history_dir, \
+             patch.object(CalculatorConfig, 'history_file', new_callable=PropertyMock) as mock_history_file:
+            
+            # Set return values to use paths within the temporary directory
+            mock_log_dir.return_value = temp_path / "logs"
+            mock_log_file.return_value = temp_path / "logs/calculator.log"
+            mock_history_dir.return_value = temp_path / "history"
+            mock_history_file.return_value = temp_path / "history/calculator_history.csv"
+            
+            # Return an instance of Calculator with the mocked config
+            yield Calculator(config=config)
@@ -130,3 +130,20 @@ def test_from_dict_result_mismatch(caplog):
 
     # Assert
     assert "Loaded calculation result 10 differs from computed result 5" in caplog.text
+
+
+def test_precomputed_result_skips_calculate(monkeypatch):
+    def fail(self):
+        raise AssertionError("calculate() should not run")
+
+    monkeypatch.setattr(Calculation, "calculate", fail)
+    calc = Calculation(operation="Power", operand1=Decimal("2"), operand2=Decimal("3"), result=Decimal("8"))
+    assert calc.result == Decimal("8")
+
+
+def test_factory_create():
+    from app.calculation import CalculationFactory
+    assert CalculationFactory.create("add", 2, 3).result == Decimal("5")
+    calc = CalculationFactory.create("multiply", 2, 3, result=Decimal("6"))
+    assert calc.operation == "Multiplication"
+    assert calc.result == Decimal("6")
@@ -35,11 +35,11 @@ def test_unknown_operation_raises():
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Trigger *overflow* inside the Power lambda → ArithmeticError → hits line 83
+# Trigger *overflow* inside the Power lambda → decimal.Overflow → hits line 83
 # ──────────────────────────────────────────────────────────────────────────────
 def test_power_overflow_hits_line_83():
-    big      = Decimal("1e308")     # huge float when cast
-    huge_exp = Decimal("2")         # still overflows as 1e308 ** 2
+    big      = Decimal("1e500000")  # beyond float range, fine for Decimal
+    huge_exp = Decimal("3")         # 1e1500000 overflows the Decimal context
     with pytest.raises(OperationError):
         Calculation("Power", big, huge_exp)
 
@@ -1,38 +1,17 @@
 import datetime
+import json
 from pathlib import Path
 import pandas as pd
 import pytest
 from unittest.mock import Mock, patch, PropertyMock
 from decimal import Decimal
-from tempfile import TemporaryDirectory
-from app.calculator import Calculator
+from app.calculator import Calculator, HISTORY_COLUMNS
 from app.calculator_repl import calculator_repl
 from app.calculator_config import CalculatorConfig
 from app.exceptions import OperationError, ValidationError
 from app.history import LoggingObserver, AutoSaveObserver
-from app.operations import OperationFactory
-
-# Fixture to initialize Calculator with a temporary directory for file paths
-@pytest.fixture
-def calculator():
-    with TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        config = CalculatorConfig(base_dir=temp_path)
-
-        # Patch properties to use the temporary directory paths
-        with patch.object(CalculatorConfig, 'log_dir', new_callable=PropertyMock) as mock_log_dir, \
-             patch.object(CalculatorConfig, 'log_file', new_callable=PropertyMock) as mock_log_file, \
-             patch.object(CalculatorConfig, 'history_dir', new_callable=PropertyMock) as mock_history_dir, \
-             patch.object(CalculatorConfig, 'history_file', new_callable=PropertyMock) as mock_history_file:
-            
-            # Set return values to use paths within the temporary directory
-            mock_log_dir.return_value = temp_path / "logs"
-            mock_log_file.return_value = temp_path / "logs/calculator.log"
-            mock_history_dir.return_value = temp_path / "history"
-            mock_history_file.return_value = temp_path / "history/calculator_history.csv"
-            
-            # Return an instance of Calculator with the mocked config
-            yield Calculator(config=config)
+from app.history_binary import BinaryHistoryReader, write_binary_history
+from app.operations import Operation, OperationFactory
 
 # Test Calculator Initialization
 
@@ -113,6 +92,7 @@ def test_redo(calculator):
 
 @patch('app.calculator.pd.DataFrame.to_csv')
 def test_save_history(mock_to_csv, calculator):
+    calculator.config.history_backend = 'pandas'
     operation = OperationFactory.create_operation('add')
     calculator.set_operation(operation)
     calculator.perform_operation(2, 3)
@@ -122,6 +102,7 @@ def test_save_history(mock_to_csv, calculator):
 @patch('app.calculator.pd.read_csv')
 @patch('app.calculator.Path.exists', return_value=True)
 def test_load_history(mock_exists, mock_read_csv, calculator):
+    calculator.config.history_backend = 'pandas'
     # Mock CSV data to match the expected format in from_dict
     mock_read_csv.return_value = pd.DataFrame({
         'operation': ['Addition'],
@@ -178,3 +159,701 @@ def test_calculator_repl_help(mock_print, mock_input):
 def test_calculator_repl_addition(mock_print, mock_input):
     calculator_repl()
     mock_print.assert_any_call("\nResult: 5")
+
+# Test Batch Evaluation
+
+def test_perform_batch_returns_results_in_order(calculator):
+    results = calculator.perform_batch('add', [(1, 2), ('3', '4'), (Decimal('0.5'), 0.25)])
+    assert results == [Decimal('3'), Decimal('7'), Decimal('0.75')]
+    assert [calc.result for calc in calculator.history] == results
+
+def test_perform_batch_single_undo_checkpoint(calculator):
+    calculator.perform_batch(OperationFactory.create_operation('multiply'), [(2, 3), (4, 5)])
+    assert len(calculator.history) == 2
+    assert len(calculator.undo_stack) == 1
+    calculator.undo()
+    assert calculator.history == []
+    calculator.redo()
+    assert len(calculator.history) == 2
+
+def test_perform_batch_notifies_observers_once(calculator):
+    observer = Mock()
+    calculator.add_observer(observer)
+    calculator.perform_batch('subtract', [(5, 1), (6, 2), (7, 3)])
+    observer.update_batch.assert_called_once()
+    assert len(observer.update_batch.call_args[0][0]) == 3
+    observer.update.assert_not_called()
+
+def test_perform_batch_failure_leaves_history_untouched(calculator):
+    with pytest.raises(ValidationError, match="Pair 1"):
+        calculator.perform_batch('add', [(1, 2), ('bad', 3)])
+    with pytest.raises(ValidationError, match="Pair 0"):
+        calculator.perform_batch('divide', [(1, 0)])
+    assert calculator.history == []
+    assert calculator.undo_stack == []
+
+def test_perform_batch_operation_errors(calculator):
+    with pytest.raises(OperationError, match="Unknown operation"):
+        calculator.perform_batch('square', [(1, 2)])
+    failing = Mock(spec=Operation, precision=None)
+    failing.execute.side_effect = ArithmeticError("overflow")
+    with pytest.raises(OperationError, match="pair 0"):
+        calculator.perform_batch(failing, [(999, 999)])
+
+def test_perform_batch_empty(calculator):
+    assert calculator.perform_batch('add', []) == []
+    assert calculator.undo_stack == []
+
+def test_perform_batch_trims_history(calculator):
+    calculator.config.max_history_size = 3
+    calculator.perform_batch('add', [(i, 0) for i in range(5)])
+    assert [calc.operand1 for calc in calculator.history] == [Decimal(2), Decimal(3), Decimal(4)]
+
+# Test Delta-Based Undo/Redo
+
+def test_undo_stack_records_deltas_not_snapshots(calculator):
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    for i in range(5):
+        calculator.perform_operation(i, 1)
+    # Each step only stores what it changed, not a copy of the history
+    assert all(len(delta.appended) == 1 and delta.evicted == [] for delta in calculator.undo_stack)
+
+def test_undo_redo_restores_evicted_calculations(calculator):
+    calculator.config.max_history_size = 2
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    for i in range(3):
+        calculator.perform_operation(i, 0)
+    assert [c.operand1 for c in calculator.history] == [Decimal(1), Decimal(2)]
+
+    assert calculator.undo()
+    assert [c.operand1 for c in calculator.history] == [Decimal(0), Decimal(1)]
+    assert calculator.redo()
+    assert [c.operand1 for c in calculator.history] == [Decimal(1), Decimal(2)]
+    assert calculator.redo() is False
+
+def test_undo_batch_larger_than_history(calculator):
+    calculator.config.max_history_size = 3
+    calculator.perform_batch('add', [(1, 0), (2, 0)])
+    calculator.perform_batch('add', [(i, 0) for i in range(3, 7)])
+    assert [str(c.operand1) for c in calculator.history] == ['4', '5', '6']
+    delta = calculator.undo_stack[-1]
+    assert [str(c.operand1) for c in delta.appended] == ['4', '5', '6']
+    assert [str(c.operand1) for c in delta.evicted] == ['1', '2']
+
+    assert calculator.undo()
+    assert [str(c.operand1) for c in calculator.history] == ['1', '2']
+    assert calculator.redo()
+    assert [str(c.operand1) for c in calculator.history] == ['4', '5', '6']
+
+def test_new_operation_clears_redo(calculator):
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    calculator.undo()
+    calculator.perform_operation(2, 2)
+    assert calculator.redo_stack == []
+
+def test_memento_snapshot_roundtrip(calculator):
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 2)
+    calculator.perform_operation(3, 4)
+    memento = calculator.create_memento()
+    calculator.clear_history()
+
+    calculator.restore_memento(type(memento).from_dict(memento.to_dict()))
+    assert [c.result for c in calculator.history] == [Decimal(3), Decimal(7)]
+    assert calculator.undo_stack == []
+    assert calculator.undo() is False
+
+# Test Append-Only History Journal
+
+def _journal_rows(calculator):
+    return calculator.config.history_file.read_text(encoding='utf-8').splitlines()[1:]
+
+def test_append_history_appends_without_rewriting(calculator):
+    calculator.config.auto_save = True
+    calculator.config.history_journal = True
+    calculator.add_observer(AutoSaveObserver(calculator))
+    calculator.set_operation(OperationFactory.create_operation('add'))
+
+    calculator.perform_operation(1, 1)  # no file yet -> full save creates it
+    with patch.object(Calculator, 'save_history') as mock_save:
+        calculator.perform_operation(2, 2)
+        calculator.perform_operation(3, 3)
+        mock_save.assert_not_called()
+
+    rows = _journal_rows(calculator)
+    assert len(rows) == 3
+    assert rows[-1].startswith('Addition,3,3,6,')
+
+def test_append_history_compacts_after_interval(calculator):
+    calculator.config.journal_compact_interval = 2
+    calculator.config.max_history_size = 2
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.save_history()
+    for i in range(3):
+        calculator.perform_operation(i, 0)
+        calculator.append_history([calculator.history[-1]])
+    # The third append exceeded the interval and rewrote the file from the history
+    assert len(_journal_rows(calculator)) == 2
+
+def test_append_history_rewrites_after_undo(calculator):
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    calculator.save_history()
+    calculator.undo()
+    calculator.perform_operation(2, 2)
+    calculator.append_history([calculator.history[-1]])
+    rows = _journal_rows(calculator)
+    assert len(rows) == 1
+    assert rows[0].startswith('Addition,2,2,4,')
+
+def test_load_history_keeps_newest_journal_rows(calculator):
+    calculator.config.max_history_size = 2
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.save_history()
+    calculator.config.max_history_size = 5
+    for i in range(4):
+        calculator.perform_operation(i, 0)
+        calculator.append_history([calculator.history[-1]])
+
+    calculator.config.max_history_size = 2
+    calculator.load_history()
+    assert [c.operand1 for c in calculator.history] == [Decimal(2), Decimal(3)]
+    # The file still holds the evicted rows, so the next append compacts it
+    calculator.append_history([calculator.history[-1]])
+    assert len(_journal_rows(calculator)) == 2
+
+# Test Fast History Loading
+
+def _write_history_csv(calculator, rows):
+    calculator.config.history_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows, columns=['operation', 'operand1', 'operand2', 'result', 'timestamp']
+                 ).to_csv(calculator.config.history_file, index=False)
+
+def _history_rows(count, wrong_result=False):
+    timestamp = datetime.datetime(2024, 1, 1).isoformat()
+    return [
+        ['Addition', str(i), '1', str(i + 1 + (100 if wrong_result else 0)), timestamp]
+        for i in range(count)
+    ]
+
+def test_load_history_trust_mode_does_not_recompute(calculator):
+    _write_history_csv(calculator, _history_rows(3, wrong_result=True))
+    with patch('app.calculation.Calculation.calculate') as mock_calculate:
+        calculator.load_history(verify='trust')
+    mock_calculate.assert_not_called()
+    assert [c.result for c in calculator.history] == [Decimal(101), Decimal(102), Decimal(103)]
+    assert calculator.history[0].timestamp == datetime.datetime(2024, 1, 1)
+
+def test_load_history_full_mode_warns_on_every_mismatch(calculator, caplog):
+    _write_history_csv(calculator, _history_rows(3, wrong_result=True))
+    calculator.load_history(verify='full')
+    assert caplog.text.count("differs from computed result") == 3
+
+def test_load_history_sample_mode_checks_subset(calculator, caplog):
+    calculator.config.history_verify_sample_size = 2
+    _write_history_csv(calculator, _history_rows(10, wrong_result=True))
+    calculator.load_history(verify='sample')
+    assert caplog.text.count("differs from computed result") == 2
+    assert len(calculator.history) == 10
+
+def test_load_history_only_parses_newest_rows(calculator):
+    calculator.config.max_history_size = 2
+    _write_history_csv(calculator, _history_rows(5))
+    calculator.load_history(verify='full')
+    assert [c.operand1 for c in calculator.history] == [Decimal(3), Decimal(4)]
+
+def test_load_history_unknown_verify_mode(calculator):
+    with pytest.raises(OperationError, match="Unknown history verification mode"):
+        calculator.load_history(verify='sometimes')
+
+def test_load_history_is_lazy(calculator):
+    _write_history_csv(calculator, _history_rows(50))
+    calculator.load_history(verify='trust')
+    items = calculator.history._items
+    assert all(item._calculation is None for item in items)
+
+    assert calculator.show_history(limit=2) == ['Addition(48, 1) = 49', 'Addition(49, 1) = 50']
+    assert [item._calculation is not None for item in items].count(True) == 2
+    assert calculator.show_history(limit=0) == []
+    assert len(calculator.show_history()) == 50
+
+# Test Precision Of Power And Root
+
+def test_operations_use_configured_precision(calculator):
+    calculator.config.precision = 6
+    calculator.set_operation(OperationFactory.create_operation('root'))
+    assert calculator.perform_operation(2, 2) == Decimal('1.41421')
+    assert calculator.perform_batch('power', [(2, '0.5')]) == [Decimal('1.41421')]
+
+# Test Operation Result Cache
+
+def test_cache_disabled_by_default(calculator):
+    assert calculator.operation_cache is None
+    assert calculator.cache_stats()['maxsize'] == 0
+
+def test_cache_serves_repeated_operations(calculator):
+    from app.operation_cache import OperationCache
+    from app.operations import Power
+
+    calculator.operation_cache = OperationCache(2)
+    calculator.set_operation(OperationFactory.create_operation('power'))
+    with patch.object(Power, 'execute', autospec=True, side_effect=Power.execute) as execute_spy:
+        assert calculator.perform_operation('2', '10') == Decimal('1024')
+        assert calculator.perform_operation('2.0', '10') == Decimal('1024')
+        calculator.perform_batch('power', [(2, 10), (3, 2), (4, 2)])
+    # 2^10 computed once; 3^2 and 4^2 are misses, and 4^2 evicts 2^10
+    assert execute_spy.call_count == 3
+    assert calculator.cache_stats() == {'hits': 2, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2}
+    assert len(calculator.history) == 5
+
+def test_cache_keys_include_precision(calculator):
+    from app.operation_cache import OperationCache
+
+    calculator.operation_cache = OperationCache(10)
+    calculator.config.precision = 3
+    assert calculator.perform_batch('root', [(2, 2)]) == [Decimal('1.41')]
+    calculator.config.precision = 5
+    assert calculator.perform_batch('root', [(2, 2)]) == [Decimal('1.4142')]
+
+def test_cache_keys_include_context_precision(calculator):
+    from decimal import localcontext
+    from app.operation_cache import OperationCache
+
+    calculator.operation_cache = OperationCache(10)
+    calculator.set_operation(OperationFactory.create_operation('divide'))
+    assert calculator.perform_operation(1, 3) == Decimal(1) / Decimal(3)
+    with localcontext() as ctx:
+        ctx.prec = 5
+        assert str(calculator.perform_operation(1, 3)) == '0.33333'
+    assert calculator.cache_stats()['misses'] == 2
+
+def test_async_observer_dispatch(calculator):
+    from app.observer_dispatcher import BackgroundDispatcher
+
+    assert calculator._dispatcher is None
+    observer = Mock()
+    calculator._dispatcher = BackgroundDispatcher(calculator.observers)
+    calculator.add_observer(observer)
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(2, 3)
+    calculator.perform_batch('add', [(1, 1)])
+    calculator.save_history()  # flushes queued notifications first
+    assert observer.update.call_count == 1
+    assert observer.update_batch.call_count == 1
+    calculator.close()
+    assert not calculator._dispatcher._thread.is_alive()
+
+def test_async_dispatch_from_config(calculator):
+    config = calculator.config
+    config.observer_dispatch = 'async'
+    config.observer_backpressure = 'drop'
+    calc = Calculator(config=config)
+    assert calc._dispatcher.policy == 'drop'
+    calc.close()
+    calculator.flush_observers()
+    calculator.close()
+
+def test_close_flushes_coalesced_auto_save(calculator):
+    calculator.config.auto_save = True
+    calculator.config.auto_save_every = 100
+    calculator.add_observer(AutoSaveObserver(calculator))
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(2, 3)
+    assert not calculator.config.history_file.exists()
+    calculator.close()
+    assert calculator.save_count == 1
+    assert len(pd.read_csv(calculator.config.history_file)) == 1
+
+@pytest.mark.parametrize("change", ["undo", "clear_history", "restore_memento"])
+def test_history_changes_wait_for_async_journal_appends(calculator, change):
+    from app.observer_dispatcher import BackgroundDispatcher
+
+    calculator.config.auto_save = True
+    calculator.config.history_journal = True
+    calculator._dispatcher = BackgroundDispatcher(calculator.observers)
+    calculator.add_observer(AutoSaveObserver(calculator))
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    memento = calculator.create_memento()
+    for i in range(20):
+        calculator.perform_operation(i, 0)
+    if change == "restore_memento":
+        calculator.restore_memento(memento)
+    else:
+        getattr(calculator, change)()
+    calculator.perform_operation(100, 0)
+    calculator.close()
+    saved = pd.read_csv(calculator.config.history_file, dtype=str)
+    assert saved['operand1'].tolist() == [str(c.operand1) for c in calculator.history]
+
+def test_run_on_observer_thread(calculator):
+    import threading
+    from app.observer_dispatcher import BackgroundDispatcher
+
+    threads = []
+    calculator.run_on_observer_thread(lambda: threads.append(threading.current_thread().name))
+    calculator._dispatcher = BackgroundDispatcher(calculator.observers)
+    calculator.run_on_observer_thread(lambda: threads.append(threading.current_thread().name))
+    calculator.close()
+    assert threads == [threading.current_thread().name, "observer-dispatch"]
+
+def test_async_auto_save_deadline_does_not_deadlock(calculator):
+    import threading
+    import time
+    from app.observer_dispatcher import BackgroundDispatcher
+
+    calculator.config.auto_save = True
+    calculator.config.auto_save_every = 10 ** 6
+    calculator.config.auto_save_interval_ms = 5
+    calculator.config.history_journal = True
+    calculator._dispatcher = BackgroundDispatcher(calculator.observers, maxsize=4)
+    calculator.add_observer(AutoSaveObserver(calculator))
+    calculator.set_operation(OperationFactory.create_operation('add'))
+
+    def workload():
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            calculator.perform_operation(1, 1)
+        calculator.undo()
+        calculator.close()
+
+    worker = threading.Thread(target=workload, daemon=True)
+    worker.start()
+    worker.join(10)
+    assert not worker.is_alive(), "auto-save deadline deadlocked with the dispatcher"
+    assert calculator.save_count >= 1
+    assert len(pd.read_csv(calculator.config.history_file)) == len(calculator.history)
+
+def test_evaluate_expression(calculator):
+    calculator.config.max_input_value = Decimal(1000)
+    assert calculator.evaluate_expression("(x + 1) * y", {'x': '2', 'y': 3}) == Decimal(9)
+    assert calculator.history == []
+    with pytest.raises(ValidationError, match="Value exceeds maximum allowed"):
+        calculator.evaluate_expression("x", {'x': 10 ** 9})
+    with pytest.raises(ValidationError, match="Value exceeds maximum allowed: 1000"):
+        calculator.evaluate_expression("x + 1e9", {'x': 1})
+    calculator.config.max_input_value = Decimal('1e10')
+    assert calculator.evaluate_expression("x + 1e9", {'x': 1}) == Decimal(1000000001)
+    with pytest.raises(ValidationError, match="Division by zero"):
+        calculator.evaluate_expression("x / 0", {'x': 1})
+    with patch('app.operations.Addition.execute', side_effect=ArithmeticError("overflow")):
+        with pytest.raises(OperationError, match="Operation failed: overflow"):
+            calculator.evaluate_expression("x + 123", {'x': 1})
+
+def test_perform_batch_in_parallel(calculator):
+    results = calculator.perform_batch('power', [(2, i) for i in range(10)], workers=2, chunk_size=3)
+    assert results == [Decimal(2) ** i for i in range(10)]
+    assert [calc.result for calc in calculator.history] == results
+    assert len(calculator.undo_stack) == 1
+    with pytest.raises(ValidationError, match="Pair 1: Invalid number format"):
+        calculator.perform_batch('add', [(1, 1), ('x', 1)], workers=2)
+    assert len(calculator.history) == 10
+
+def test_stage_instrumentation(calculator, tmp_path):
+    from app.instrumentation import StageTimer
+
+    assert calculator.timer is None
+    assert calculator.stats() == {}
+    with pytest.raises(OperationError, match="Instrumentation is disabled"):
+        calculator.dump_stats(tmp_path / "stats.json")
+
+    calculator.timer = StageTimer()
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(2, 3)
+    calculator.perform_operation(4, 5)
+    stats = calculator.stats()
+    assert list(stats) == ['validate', 'execute', 'calculation', 'undo', 'notify', 'total']
+    assert all(stage['count'] == 2 for stage in stats.values())
+    calculator.dump_stats(tmp_path / "stats.json")
+    assert (tmp_path / "stats.json").exists()
+
+def test_instrumentation_enabled_from_config(calculator):
+    calculator.config.instrumentation = True
+    assert Calculator(config=calculator.config).timer is not None
+
+def test_csv_backend_round_trip(calculator):
+    calculator.perform_batch('multiply', [(2, 3), ('1.5', 4)])
+    calculator.save_history()
+    text = calculator.config.history_file.read_text(encoding='utf-8')
+    assert text.splitlines()[0] == ','.join(HISTORY_COLUMNS)
+    calculator.history.clear()
+    calculator.load_history(verify='full')
+    assert [calc.result for calc in calculator.history] == [Decimal(6), Decimal('6.0')]
+
+def test_csv_backend_matches_pandas_output(calculator):
+    calculator.perform_batch('add', [(1, 2), (3, 4)])
+    calculator.save_history()
+    csv_text = calculator.config.history_file.read_text(encoding='utf-8')
+    calculator.config.history_backend = 'pandas'
+    calculator.save_history()
+    assert calculator.config.history_file.read_text(encoding='utf-8') == csv_text
+    calculator.history.clear()
+    calculator.save_history()
+    assert calculator.config.history_file.read_text(encoding='utf-8').strip() == ','.join(HISTORY_COLUMNS)
+
+def test_csv_backend_reads_reordered_columns_and_keeps_newest(calculator):
+    calculator.config.max_history_size = 2
+    calculator.config.history_file.write_text(
+        "timestamp,result,operand2,operand1,operation\n"
+        "2024-01-01T00:00:00,3,2,1,Addition\n"
+        "\n"
+        "2024-01-01T00:00:01,7,4,3,Addition\n"
+        "2024-01-01T00:00:02,11,6,5,Addition\n",
+        encoding='utf-8'
+    )
+    calculator.load_history(verify='full')
+    assert [calc.result for calc in calculator.history] == [Decimal(7), Decimal(11)]
+    assert calculator._journal_in_sync is False
+
+    calculator.config.history_file.write_text("", encoding='utf-8')
+    calculator.load_history()
+    assert len(calculator.history) == 2  # an empty file leaves the history alone
+
+    calculator.config.history_file.write_text("operation,operand1\nAddition,1\n", encoding='utf-8')
+    with pytest.raises(OperationError, match="Failed to load history"):
+        calculator.load_history()
+
+def test_pandas_backend_falls_back_when_not_installed(calculator):
+    calculator.config.history_backend = 'pandas'
+    with patch('app.calculator.pd.available', return_value=False):
+        assert calculator._use_pandas() is False
+    assert calculator._use_pandas() is True
+
+# Test Binary History Format
+
+def test_binary_format_round_trip(calculator):
+    calculator.config.history_format = 'binary'
+    calculator.perform_batch('multiply', [(2, 3), ('1.5', 4)])
+    calculator.save_history()
+    assert calculator.config.history_file.read_bytes().startswith(b'CALCHIST')
+    saved = list(calculator.history)
+    calculator.history.clear()
+    calculator.load_history(verify='full')
+    assert list(calculator.history) == saved
+    assert [calc.timestamp for calc in calculator.history] == [calc.timestamp for calc in saved]
+
+def test_binary_format_keeps_newest_rows(calculator):
+    calculator.config.history_format = 'binary'
+    calculator.config.max_history_size = 2
+    write_binary_history(calculator.config.history_file, [tuple(row) for row in _history_rows(5)])
+    calculator.load_history(verify='full')
+    assert [c.operand1 for c in calculator.history] == [Decimal(3), Decimal(4)]
+    assert calculator._journal_in_sync is False
+
+def test_binary_format_appends_by_rewriting(calculator):
+    calculator.config.history_format = 'binary'
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    calculator.save_history()
+    calculator.perform_operation(2, 2)
+    with patch.object(calculator, 'save_history', wraps=calculator.save_history) as mock_save:
+        calculator.append_history([calculator.history[-1]])
+    mock_save.assert_called_once()
+    with BinaryHistoryReader(calculator.config.history_file) as reader:
+        assert len(reader) == 2
+
+def test_binary_format_rejects_csv_file(calculator):
+    calculator.config.history_file.write_text("operation,operand1,operand2,result,timestamp\n")
+    calculator.config.history_format = 'binary'
+    with pytest.raises(OperationError, match="Not a binary history file"):
+        calculator.load_history()
+
+# Test SQLite History Store
+
+def test_sqlite_format_round_trip(calculator):
+    calculator.config.history_format = 'sqlite'
+    calculator.perform_batch('multiply', [(2, 3), ('1.5', 4)])
+    calculator.save_history()
+    saved = list(calculator.history)
+    calculator.history.clear()
+    calculator.load_history(verify='full')
+    assert list(calculator.history) == saved
+    assert calculator._journal_in_sync is True
+    calculator.close()
+    assert calculator._history_db is None
+
+def test_sqlite_format_appends_single_rows(calculator):
+    calculator.config.history_format = 'sqlite'
+    calculator.config.max_history_size = 3
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(0, 1)
+    calculator.save_history()
+    with patch.object(calculator, 'save_history') as mock_save:
+        for i in range(1, 5):
+            calculator.perform_operation(i, 1)
+            calculator.append_history([calculator.history[-1]])
+    mock_save.assert_not_called()
+    history_db = calculator._open_history_db()
+    # The database is not trimmed to max_history_size
+    assert [row[1] for row in history_db.tail(10)] == ['0', '1', '2', '3', '4']
+    assert [c.operand1 for c in calculator.history] == [Decimal(2), Decimal(3), Decimal(4)]
+
+def test_sqlite_format_save_keeps_rows_evicted_from_memory(calculator):
+    calculator.config.history_format = 'sqlite'
+    calculator.config.max_history_size = 2
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    for i in range(4):
+        calculator.perform_operation(i, 1)
+        calculator.save_history()
+    calculator.undo()
+    calculator.save_history()
+    assert [row[1] for row in calculator._open_history_db().tail(10)] == ['0', '1', '2']
+
+    calculator.history.clear()
+    calculator.load_history()
+    assert [c.operand1 for c in calculator.history] == [Decimal(1), Decimal(2)]
+    calculator.perform_operation(5, 1)
+    calculator.save_history()
+    assert [row[1] for row in calculator._open_history_db().tail(10)] == ['0', '1', '2', '5']
+
+    calculator.clear_history()
+    calculator.save_history()
+    assert calculator._open_history_db().count() == 0
+
+def test_sqlite_format_rewrites_after_undo(calculator):
+    calculator.config.history_format = 'sqlite'
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    calculator.save_history()
+    calculator.undo()
+    calculator.perform_operation(2, 2)
+    calculator.append_history([calculator.history[-1]])
+    assert [row[1] for row in calculator._open_history_db().tail(10)] == ['2']
+
+def test_sqlite_database_follows_history_file(calculator, tmp_path):
+    calculator.config.history_format = 'sqlite'
+    calculator.save_history()
+    first = calculator._open_history_db()
+    assert calculator._open_history_db() is first
+    calculator.config.history_file.unlink()
+    second = calculator._open_history_db()
+    assert second is not first
+    assert second.path == calculator.config.history_file
+
+def test_auto_save_appends_to_sqlite(calculator):
+    calculator.config.history_format = 'sqlite'
+    calculator.config.auto_save = True
+    calculator.add_observer(AutoSaveObserver(calculator))
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    with patch.object(calculator, 'save_history') as mock_save:
+        calculator.perform_operation(2, 2)
+    mock_save.assert_not_called()
+    assert calculator._open_history_db().count() == 2
+
+# Test History Queries
+
+def test_query_history(calculator):
+    calculator.perform_batch('add', [(1, 1), (2, 2)])
+    calculator.perform_batch('multiply', [(3, 3)])
+    assert [c.result for c in calculator.query_history(operation='Addition')] == [Decimal(2), Decimal(4)]
+    assert [c.result for c in calculator.query_history(min_result=3, max_result='9')] == [Decimal(4), Decimal(9)]
+    assert calculator.query_history(since=datetime.datetime.now() + datetime.timedelta(days=1)) == []
+    assert len(calculator.query_history(limit=2)) == 2
+    with pytest.raises(ValidationError, match="Invalid result bound: abc"):
+        calculator.query_history(min_result='abc')
+    with pytest.raises(OperationError, match="Unknown history source: cloud"):
+        calculator.query_history(source='cloud')
+
+def test_query_history_from_sqlite_file(calculator):
+    calculator.config.history_format = 'sqlite'
+    calculator.config.max_history_size = 2
+    calculator.perform_batch('add', [(1, 1), (2, 2)])
+    calculator.perform_batch('multiply', [(3, 3)])
+    calculator.save_history()
+    calculator.perform_batch('add', [(4, 4)])
+    calculator.save_history()
+    assert len(calculator.history) == 2
+
+    added = calculator.query_history(operation='Addition', source='file')
+    assert [c.result for c in added] == [Decimal(4), Decimal(8)]
+    assert [c.result for c in calculator.query_history(limit=1, source='file')] == [Decimal(8)]
+    assert [c.result for c in calculator.query_history(min_result=5, max_result=9, limit=2, source='file')] == [
+        Decimal(9), Decimal(8)
+    ]
+    assert calculator.query_history(min_result=100, source='file') == []
+    assert calculator.query_history(max_result=3, limit=0, source='file') == []
+    assert calculator.query_history(until=added[0].timestamp, source='file') == []
+    assert [c.result for c in calculator.query_history(since=added[0].timestamp, max_result=4, source='file')] == [
+        Decimal(4)
+    ]
+
+def test_query_history_from_file_needs_sqlite(calculator):
+    with pytest.raises(OperationError, match="needs history_format 'sqlite', not 'csv'"):
+        calculator.query_history(source='file')
+
+def test_query_history_follows_undo_and_load(calculator):
+    calculator.perform_batch('add', [(1, 1), (2, 2)])
+    calculator.undo()
+    assert calculator.query_history(operation='Addition') == []
+    calculator.redo()
+    calculator.save_history()
+    index = calculator._history_index
+    calculator.load_history()
+    assert [c.result for c in calculator.query_history(operation='Addition')] == [Decimal(2), Decimal(4)]
+    assert calculator._history_index is not index
+
+# Test History DataFrame
+
+def test_get_history_dataframe_is_maintained_incrementally(calculator):
+    calculator.perform_batch('add', [(1, 2), (3, 4)])
+    df = calculator.get_history_dataframe()
+    assert df['result'].tolist() == ['3', '7']
+    df['doubled'] = df['result'] * 2
+    assert list(calculator.get_history_dataframe().columns) == HISTORY_COLUMNS
+    calculator.perform_batch('multiply', [(2, 5)])
+    assert calculator.get_history_dataframe()['operation'].tolist() == ['Addition', 'Addition', 'Multiplication']
+    calculator.undo()
+    assert calculator.get_history_dataframe()['result'].tolist() == ['3', '7']
+    calculator.save_history()
+    calculator.load_history()
+    assert calculator.get_history_dataframe()['result'].tolist() == ['3', '7']
+
+# Test History Export
+
+def test_export_history_from_memory(calculator, tmp_path):
+    calculator.perform_batch('add', [(1, 2), ('1.5', 4)])
+    assert calculator.export_history(tmp_path / 'out.csv', chunk_size=1) == 2
+    lines = (tmp_path / 'out.csv').read_text(encoding='utf-8').splitlines()
+    assert lines[0] == ','.join(HISTORY_COLUMNS)
+    assert [line.split(',')[3] for line in lines[1:]] == ['3', '5.5']
+
+    assert calculator.export_history(tmp_path / 'out.jsonl', format='jsonl') == 2
+    rows = [json.loads(line) for line in (tmp_path / 'out.jsonl').read_text(encoding='utf-8').splitlines()]
+    assert [row['operand1'] for row in rows] == ['1', '1.5']
+
+@pytest.mark.parametrize("history_format", ['csv', 'binary', 'sqlite'])
+def test_export_history_from_file(calculator, tmp_path, history_format):
+    calculator.config.history_format = history_format
+    assert calculator.export_history(tmp_path / 'none.csv', source='file') == 0
+    calculator.perform_batch('add', [(i, 1) for i in range(5)])
+    calculator.save_history()
+    calculator.history.clear()
+    assert calculator.export_history(tmp_path / 'out.jsonl', format='jsonl', chunk_size=2, source='file') == 5
+    rows = [json.loads(line) for line in (tmp_path / 'out.jsonl').read_text(encoding='utf-8').splitlines()]
+    assert [row['operand1'] for row in rows] == ['0', '1', '2', '3', '4']
+
+def test_export_history_lazy_rows_stay_lazy(calculator, tmp_path):
+    calculator.perform_batch('add', [(1, 2)])
+    calculator.save_history()
+    calculator.load_history(verify='trust')
+    calculator.export_history(tmp_path / 'out.csv')
+    assert calculator.history._items[0].row is not None
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({'format': 'xml'}, "Unknown export format: xml"),
+    ({'chunk_size': 0}, "chunk_size must be positive"),
+    ({'source': 'cloud'}, "Unknown export source: cloud"),
+])
+def test_export_history_invalid_arguments(calculator, tmp_path, kwargs, message):
+    with pytest.raises(OperationError, match=message):
+        calculator.export_history(tmp_path / 'out.csv', **kwargs)
+    assert not (tmp_path / 'out.csv').exists()
+
+def test_export_history_write_failure(calculator, tmp_path):
+    with pytest.raises(OperationError, match="Failed to export history"):
+        calculator.export_history(tmp_path / 'missing' / 'out.csv')
+    calculator.config.history_file.write_text("operation,operand1,operand2,result,timestamp\n")
+    calculator.config.history_format = 'binary'
+    with pytest.raises(OperationError, match="Not a binary history file"):
+        calculator.export_history(tmp_path / 'out.csv', source='file')
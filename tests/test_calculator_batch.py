@@ -0,0 +1,75 @@
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.calculator_batch import detect_format, main, run_batch
+from app.exceptions import ValidationError
+
+
+def test_csv_batch_streams_results(calculator):
+    source = io.StringIO("op,a,b\nadd,1,2\n\ndivide,1,0\nfoo,1,2\nadd,1\nadd,x,1\npower,2,10\n")
+    sink = io.StringIO()
+    assert run_batch(calculator, source, sink) == (6, 4)
+    assert sink.getvalue().splitlines() == [
+        "add,1,2,3,",
+        "divide,1,0,,Division by zero is not allowed",
+        "foo,1,2,,Unknown operation: foo",
+        'add,1,,,"Expected 3 fields (op,a,b), got 2"',
+        "add,x,1,,Invalid number format: x",
+        "power,2,10,1024,",
+    ]
+    # Streaming evaluations are not recorded
+    assert len(calculator.history) == 0
+    assert calculator.undo_stack == []
+
+
+def test_jsonl_batch_streams_results(calculator):
+    source = io.StringIO('{"op": "multiply", "a": 2, "b": "3.5"}\n\nnot json\n{"op": "add"}\n'
+                         '{"op": "divide", "a": 1, "b": 0}\n')
+    sink = io.StringIO()
+    assert run_batch(calculator, source, sink, 'jsonl') == (4, 3)
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert lines[0] == {'op': 'multiply', 'a': '2', 'b': '3.5', 'result': '7.0'}
+    assert lines[1]['line'] == 3 and lines[1]['error'].startswith("Invalid JSON record")
+    assert lines[2]['line'] == 4
+    assert lines[3]['error'] == "Division by zero is not allowed"
+
+
+def test_batch_rejects_unknown_format(calculator):
+    with pytest.raises(ValidationError, match="Unknown batch format"):
+        run_batch(calculator, io.StringIO(), io.StringIO(), 'xml')
+
+
+def test_evaluate_wraps_operation_failures(calculator):
+    from unittest.mock import Mock
+    from app.exceptions import OperationError
+    from app.operations import Operation
+
+    operation = Mock(spec=Operation, precision=None)
+    operation.execute.side_effect = ArithmeticError("overflow")
+    with pytest.raises(OperationError, match="Operation failed: overflow"):
+        calculator.evaluate(operation, 1, 2)
+
+
+def test_detect_format():
+    assert detect_format("jobs.JSONL") == 'jsonl'
+    assert detect_format("jobs.csv") == 'csv'
+    assert detect_format("-") == 'csv'
+
+
+def test_main_reads_and_writes_files(calculator, tmp_path):
+    source = tmp_path / "jobs.jsonl"
+    source.write_text('{"op": "subtract", "a": 5, "b": 7}\n', encoding='utf-8')
+    output = tmp_path / "out.jsonl"
+    with patch('app.calculator_batch.Calculator', return_value=calculator):
+        assert main([str(source), '--output', str(output)]) == 0
+    assert json.loads(output.read_text(encoding='utf-8'))['result'] == '-2'
+
+
+def test_main_uses_stdin_and_stdout(calculator, capsys, monkeypatch):
+    monkeypatch.setattr('sys.stdin', io.StringIO("root,16,2\nadd,1,x\n"))
+    with patch('app.calculator_batch.Calculator', return_value=calculator):
+        assert main([]) == 1
+    assert capsys.readouterr().out.splitlines() == ["root,16,2,4,", "add,1,x,,Invalid number format: x"]
@@ -144,3 +144,157 @@ def test_history_file_property():
     config = CalculatorConfig(base_dir=Path('/new_base_dir'))
     assert config.history_file == Path('/new_base_dir/history/calculator_history.csv').resolve()
 
+
+def test_history_journal_settings():
+    os.environ['CALCULATOR_HISTORY_JOURNAL'] = '1'
+    os.environ['CALCULATOR_JOURNAL_COMPACT_INTERVAL'] = '50'
+    try:
+        config = CalculatorConfig()
+        assert config.history_journal is True
+        assert config.journal_compact_interval == 50
+    finally:
+        clear_env_vars('CALCULATOR_HISTORY_JOURNAL', 'CALCULATOR_JOURNAL_COMPACT_INTERVAL')
+    config = CalculatorConfig(history_journal=False, journal_compact_interval=7)
+    assert config.history_journal is False
+    assert config.journal_compact_interval == 7
+
+def test_invalid_journal_compact_interval():
+    with pytest.raises(ConfigurationError, match="journal_compact_interval must be positive"):
+        config = CalculatorConfig(journal_compact_interval=-1)
+        config.validate()
+
+def test_history_verify_settings():
+    os.environ['CALCULATOR_HISTORY_VERIFY'] = 'FULL'
+    os.environ['CALCULATOR_HISTORY_VERIFY_SAMPLE_SIZE'] = '25'
+    try:
+        config = CalculatorConfig()
+        assert config.history_verify == 'full'
+        assert config.history_verify_sample_size == 25
+    finally:
+        clear_env_vars('CALCULATOR_HISTORY_VERIFY', 'CALCULATOR_HISTORY_VERIFY_SAMPLE_SIZE')
+    assert CalculatorConfig().history_verify == 'sample'
+
+def test_invalid_history_verify():
+    with pytest.raises(ConfigurationError, match="history_verify must be"):
+        CalculatorConfig(history_verify='never').validate()
+    with pytest.raises(ConfigurationError, match="history_verify_sample_size must be positive"):
+        CalculatorConfig(history_verify_sample_size=-5).validate()
+
+def test_cache_size_setting():
+    os.environ['CALCULATOR_CACHE_SIZE'] = '128'
+    try:
+        assert CalculatorConfig().cache_size == 128
+        assert CalculatorConfig(cache_size=0).cache_size == 0
+    finally:
+        clear_env_vars('CALCULATOR_CACHE_SIZE')
+    assert CalculatorConfig().cache_size == 0
+    with pytest.raises(ConfigurationError, match="cache_size must not be negative"):
+        CalculatorConfig(cache_size=-1).validate()
+
+def test_observer_dispatch_settings():
+    os.environ['CALCULATOR_OBSERVER_DISPATCH'] = 'ASYNC'
+    os.environ['CALCULATOR_OBSERVER_QUEUE_SIZE'] = '16'
+    os.environ['CALCULATOR_OBSERVER_BACKPRESSURE'] = 'drop'
+    try:
+        config = CalculatorConfig()
+        assert config.observer_dispatch == 'async'
+        assert config.observer_queue_size == 16
+        assert config.observer_backpressure == 'drop'
+    finally:
+        clear_env_vars('CALCULATOR_OBSERVER_DISPATCH', 'CALCULATOR_OBSERVER_QUEUE_SIZE',
+                       'CALCULATOR_OBSERVER_BACKPRESSURE')
+    config = CalculatorConfig()
+    assert (config.observer_dispatch, config.observer_queue_size, config.observer_backpressure) == \
+        ('sync', 1000, 'block')
+    with pytest.raises(ConfigurationError, match="observer_dispatch must be"):
+        CalculatorConfig(observer_dispatch='threads').validate()
+    with pytest.raises(ConfigurationError, match="observer_queue_size must be positive"):
+        CalculatorConfig(observer_queue_size=-1).validate()
+    with pytest.raises(ConfigurationError, match="observer_backpressure must be"):
+        CalculatorConfig(observer_backpressure='spill').validate()
+
+def test_auto_save_coalescing_settings():
+    os.environ['CALCULATOR_AUTO_SAVE_EVERY'] = '25'
+    os.environ['CALCULATOR_AUTO_SAVE_INTERVAL_MS'] = '250'
+    try:
+        config = CalculatorConfig()
+        assert (config.auto_save_every, config.auto_save_interval_ms) == (25, 250)
+    finally:
+        clear_env_vars('CALCULATOR_AUTO_SAVE_EVERY', 'CALCULATOR_AUTO_SAVE_INTERVAL_MS')
+    config = CalculatorConfig()
+    assert (config.auto_save_every, config.auto_save_interval_ms) == (1, 0)
+    with pytest.raises(ConfigurationError, match="auto_save_every must be positive"):
+        CalculatorConfig(auto_save_every=-1).validate()
+    with pytest.raises(ConfigurationError, match="auto_save_interval_ms must not be negative"):
+        CalculatorConfig(auto_save_interval_ms=-1).validate()
+
+def test_instrumentation_setting():
+    os.environ['CALCULATOR_INSTRUMENTATION'] = 'true'
+    try:
+        assert CalculatorConfig().instrumentation is True
+        assert CalculatorConfig(instrumentation=False).instrumentation is False
+    finally:
+        clear_env_vars('CALCULATOR_INSTRUMENTATION')
+    assert CalculatorConfig().instrumentation is False
+
+def test_history_backend_setting():
+    os.environ['CALCULATOR_HISTORY_BACKEND'] = 'PANDAS'
+    try:
+        assert CalculatorConfig().history_backend == 'pandas'
+    finally:
+        clear_env_vars('CALCULATOR_HISTORY_BACKEND')
+    assert CalculatorConfig().history_backend == 'csv'
+    with pytest.raises(ConfigurationError, match="history_backend must be 'csv' or 'pandas'"):
+        CalculatorConfig(history_backend='parquet').validate()
+
+def test_log_mode_and_level_settings():
+    os.environ['CALCULATOR_LOG_MODE'] = 'Queue'
+    os.environ['CALCULATOR_LOG_LEVEL'] = 'warning'
+    try:
+        config = CalculatorConfig()
+        assert (config.log_mode, config.log_level) == ('queue', 'WARNING')
+    finally:
+        clear_env_vars('CALCULATOR_LOG_MODE', 'CALCULATOR_LOG_LEVEL')
+    config = CalculatorConfig()
+    assert (config.log_mode, config.log_level) == ('sync', 'INFO')
+    with pytest.raises(ConfigurationError, match="log_mode must be 'sync' or 'queue'"):
+        CalculatorConfig(log_mode='async').validate()
+    with pytest.raises(ConfigurationError, match="log_level must be one of"):
+        CalculatorConfig(log_level='verbose').validate()
+
+def test_history_format_setting():
+    history_dir = Path('/history_format_base/history').resolve()
+    os.environ['CALCULATOR_HISTORY_FORMAT'] = 'Binary'
+    clear_env_vars('CALCULATOR_HISTORY_DIR', 'CALCULATOR_HISTORY_FILE')
+    try:
+        config = CalculatorConfig(base_dir=Path('/history_format_base'))
+        assert config.history_format == 'binary'
+        assert config.history_file == history_dir / 'calculator_history.bin'
+    finally:
+        clear_env_vars('CALCULATOR_HISTORY_FORMAT')
+    config = CalculatorConfig(base_dir=Path('/history_format_base'))
+    assert config.history_format == 'csv'
+    assert config.history_file == history_dir / 'calculator_history.csv'
+    assert CalculatorConfig(base_dir=Path('/history_format_base'), history_format='sqlite').history_file == \
+        history_dir / 'calculator_history.db'
+    with pytest.raises(ConfigurationError, match="history_format must be 'csv', 'binary' or 'sqlite'"):
+        CalculatorConfig(history_format='parquet').validate()
+
+def test_paths_are_resolved_once_until_reload():
+    import dataclasses
+    from unittest.mock import patch
+
+    os.environ['CALCULATOR_HISTORY_FILE'] = './test_history/snapshot.csv'
+    try:
+        config = CalculatorConfig(base_dir=Path('/snapshot_base'))
+        expected = Path('./test_history/snapshot.csv').resolve()
+        os.environ['CALCULATOR_HISTORY_FILE'] = './test_history/moved.csv'
+        with patch('app.calculator_config.Path.resolve') as mock_resolve:
+            assert config.history_file == expected
+            mock_resolve.assert_not_called()
+        config.reload()
+        assert config.history_file == Path('./test_history/moved.csv').resolve()
+    finally:
+        clear_env_vars('CALCULATOR_HISTORY_FILE')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.paths.history_file = Path('/elsewhere.csv')
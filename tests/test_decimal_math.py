@@ -0,0 +1,76 @@
+import math
+from decimal import Decimal, InvalidOperation, Overflow, localcontext
+
+import pytest
+
+from app.decimal_math import decimal_power, decimal_root
+
+
+@pytest.mark.parametrize(
+    "base, exponent, precision, expected",
+    [
+        ("2", "3", 10, "8"),
+        ("5", "0", 10, "1"),
+        ("2.5", "2", 10, "6.25"),
+        ("-2", "3", 10, "-8"),
+        ("3", "-2", 10, "0.1111111111"),
+        ("2", "100", 10, "1.267650600E+30"),
+        ("2", "100", 40, "1267650600228229401496703205376"),
+        ("2", "0.5", 10, "1.414213562"),
+        ("0", "0.5", 10, "0"),
+        ("4", "-1.5", 10, "0.125"),
+        ("10", "0.3", 10, "1.995262315"),
+        ("0", "0.3", 10, "0"),
+    ],
+)
+def test_decimal_power(base, exponent, precision, expected):
+    result = decimal_power(Decimal(base), Decimal(exponent), precision)
+    assert result == Decimal(expected)
+    assert len(result.as_tuple().digits) <= precision
+
+
+def test_decimal_power_beyond_float_range():
+    result = decimal_power(Decimal("1e300"), Decimal("5"), 10)
+    assert result == Decimal("1e1500")
+
+
+def test_decimal_power_overflow():
+    with pytest.raises(Overflow):
+        decimal_power(Decimal("1e500000"), Decimal("3"), 10)
+
+
+def test_decimal_power_defaults_to_context_precision():
+    with localcontext() as ctx:
+        ctx.prec = 5
+        assert decimal_power(Decimal("2"), Decimal("0.5")) == Decimal("1.4142")
+
+
+@pytest.mark.parametrize(
+    "value, degree, precision, expected",
+    [
+        ("9", "2", 10, "3"),
+        ("27", "3", 10, "3"),
+        ("32", "5", 10, "2"),
+        ("2.25", "2", 10, "1.5"),
+        ("2", "3", 12, "1.25992104989"),
+        ("8", "0.5", 10, "64"),
+        ("10", "-2", 10, "0.3162277660"),
+        ("7", "1", 10, "7"),
+        ("0", "3", 10, "0"),
+        ("0", "0.5", 10, "0"),
+        ("1e999", "3", 10, "1e333"),
+    ],
+)
+def test_decimal_root(value, degree, precision, expected):
+    assert decimal_root(Decimal(value), Decimal(degree), precision) == Decimal(expected)
+
+
+def test_decimal_root_outside_float_range():
+    result = decimal_root(Decimal("1e999"), Decimal("7"), 10)
+    assert math.isclose(float(result.scaleb(-142)), 10 ** (999 / 7 - 142), rel_tol=1e-9)
+
+
+@pytest.mark.parametrize("value, degree", [("-8", "3"), ("8", "0")])
+def test_decimal_root_invalid(value, degree):
+    with pytest.raises(InvalidOperation):
+        decimal_root(Decimal(value), Decimal(degree), 10)
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from decimal import Decimal
+
+import pytest
+
+from app import expression
+from app.calculator_config import CalculatorConfig
+from app.exceptions import ValidationError
+from app.expression import BinaryOperation, Constant, Variable, compile_expression, tokenize
+
+
+def test_tokenize():
+    assert tokenize(" 1.5e2 * x_1 ") == [('number', '1.5e2'), ('symbol', '*'), ('name', 'x_1')]
+    with pytest.raises(ValidationError, match="unexpected character '\\$'"):
+        tokenize("1 $ 2")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1 + 2 * 3", "7"),
+    ("(1 + 2) * 3", "9"),
+    ("10 - 4 - 3", "3"),
+    ("2 ^ 3 ^ 2", "512"),
+    ("-2 ^ 2", "-4"),
+    ("+3 * -2", "-6"),
+    ("27 root 3 * 2", "6"),
+    ("2 ^ 6 root 3", "4"),
+    ("17 % 5", "2"),
+    ("modulus(17, 5) + ROOT(8, 3)", "4"),
+])
+def test_precedence_and_associativity(text, expected):
+    assert compile_expression(text).evaluate() == Decimal(expected)
+
+
+def test_constants_are_folded():
+    compiled = compile_expression("(3 + 4) * 2 ^ 5 root 5 + x")
+    assert compiled.tree.right == Variable('x')
+    assert compiled.tree.left == Constant(Decimal(14))
+    assert compile_expression("(3 + 4) * 2").is_constant
+    assert compiled.variables == frozenset({'x'})
+
+
+def test_failing_constants_are_left_for_evaluation():
+    compiled = compile_expression("1 / 0")
+    assert isinstance(compiled.tree, BinaryOperation)
+    with pytest.raises(ValidationError, match="Division by zero"):
+        compiled.evaluate()
+
+
+def test_compiled_expressions_are_cached():
+    compiled = compile_expression("a * b + 1")
+    assert compile_expression("a * b + 1") is compiled
+    assert compile_expression("a * b + 1", 4) is not compiled
+    assert compiled.evaluate({'a': Decimal(2), 'b': Decimal(3)}) == Decimal(7)
+    assert compiled.evaluate({'a': Decimal(5), 'b': Decimal(5)}) == Decimal(26)
+    assert repr(compiled) == "CompiledExpression('a * b + 1')"
+
+
+def test_literals_are_validated_against_the_config(tmp_path):
+    config = CalculatorConfig(base_dir=tmp_path, max_input_value=Decimal(100))
+    assert compile_expression("99 + 1", config=config).evaluate() == Decimal(100)
+    with pytest.raises(ValidationError, match="Value exceeds maximum allowed: 100"):
+        compile_expression("x * 101", config=config)
+    assert compile_expression("x * 101").evaluate({'x': Decimal(2)}) == Decimal(202)
+
+
+def test_least_recently_used_expressions_are_evicted(monkeypatch):
+    monkeypatch.setattr(expression, "EXPRESSION_CACHE_SIZE", 2)
+    monkeypatch.setattr(expression, "_cache", OrderedDict())
+    first = compile_expression("1 + 1")
+    compile_expression("2 + 2")
+    assert compile_expression("1 + 1") is first
+    compile_expression("3 + 3")
+    assert list(expression._cache) == [("1 + 1", None, None), ("3 + 3", None, None)]
+
+
+def test_precision_applies_to_power_and_root():
+    assert compile_expression("2 root 3", 5).evaluate() == Decimal("1.2599")
+
+
+def test_undefined_variable():
+    with pytest.raises(ValidationError, match="Undefined variable: y"):
+        compile_expression("x + y").evaluate({'x': Decimal(1)})
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "empty"),
+    ("1 +", "unexpected end of input"),
+    ("(1 + 2", "unexpected end of input"),
+    ("(1 + 2 3", "expected '\\)' but found '3'"),
+    ("1 2", "unexpected '2'"),
+    ("* 2", "unexpected '\\*'"),
+    ("root + 1", "unexpected 'root'"),
+    ("hypot(3, 4)", "Unknown operation: hypot"),
+])
+def test_syntax_errors(text, message):
+    with pytest.raises(ValidationError, match=message):
+        compile_expression(text)
@@ -1,3 +1,4 @@
+import threading
 import pytest
 from unittest.mock import Mock, patch
 from app.calculation import Calculation
@@ -19,7 +20,7 @@ def test_logging_observer_logs_calculation(logging_info_mock):
     observer = LoggingObserver()
     observer.update(calculation_mock)
     logging_info_mock.assert_called_once_with(
-        "Calculation performed: addition (5, 3) = 8"
+        "Calculation performed: %s (%s, %s) = %s", "addition", 5, 3, 8
     )
 
 def test_logging_observer_no_calculation():
@@ -29,10 +30,20 @@ def test_logging_observer_no_calculation():
 
 # Test cases for AutoSaveObserver
 
-def test_autosave_observer_triggers_save():
+def make_calculator_mock(auto_save=True, every=1, interval_ms=0, journal=False, history_format='csv'):
     calculator_mock = Mock(spec=Calculator)
     calculator_mock.config = Mock(spec=CalculatorConfig)
-    calculator_mock.config.auto_save = True
+    calculator_mock.config.auto_save = auto_save
+    calculator_mock.config.auto_save_every = every
+    calculator_mock.config.auto_save_interval_ms = interval_ms
+    calculator_mock.config.history_journal = journal
+    calculator_mock.config.history_format = history_format
+    calculator_mock.save_count = 0
+    calculator_mock.run_on_observer_thread.side_effect = lambda callback: callback()
+    return calculator_mock
+
+def test_autosave_observer_triggers_save():
+    calculator_mock = make_calculator_mock(auto_save=True)
     observer = AutoSaveObserver(calculator_mock)
     
     observer.update(calculation_mock)
@@ -40,18 +51,14 @@ def test_autosave_observer_triggers_save():
 
 @patch('logging.info')
 def test_autosave_observer_logs_autosave(logging_info_mock):
-    calculator_mock = Mock(spec=Calculator)
-    calculator_mock.config = Mock(spec=CalculatorConfig)
-    calculator_mock.config.auto_save = True
+    calculator_mock = make_calculator_mock(auto_save=True)
     observer = AutoSaveObserver(calculator_mock)
     
     observer.update(calculation_mock)
     logging_info_mock.assert_called_once_with("History auto-saved")
 
 def test_autosave_observer_does_not_trigger_save_when_disabled():
-    calculator_mock = Mock(spec=Calculator)
-    calculator_mock.config = Mock(spec=CalculatorConfig)
-    calculator_mock.config.auto_save = False
+    calculator_mock = make_calculator_mock(auto_save=False)
     observer = AutoSaveObserver(calculator_mock)
     
     observer.update(calculation_mock)
@@ -64,10 +71,138 @@ def test_autosave_observer_invalid_calculator():
         AutoSaveObserver(None)  # Passing None should raise a TypeError
 
 def test_autosave_observer_no_calculation():
-    calculator_mock = Mock(spec=Calculator)
-    calculator_mock.config = Mock(spec=CalculatorConfig)
-    calculator_mock.config.auto_save = True
+    calculator_mock = make_calculator_mock(auto_save=True)
     observer = AutoSaveObserver(calculator_mock)
     
     with pytest.raises(AttributeError):
         observer.update(None)  # Passing None should raise an exception
+
+# Test cases for batched notifications
+
+def test_observer_update_batch_defaults_to_update():
+    observer = LoggingObserver()
+    with patch.object(observer, 'update') as update_mock:
+        observer.update_batch([calculation_mock, calculation_mock])
+    assert update_mock.call_count == 2
+
+def test_autosave_observer_update_batch_saves_once():
+    calculator_mock = make_calculator_mock(auto_save=True)
+    observer = AutoSaveObserver(calculator_mock)
+
+    observer.update_batch([calculation_mock, calculation_mock, calculation_mock])
+    calculator_mock.save_history.assert_called_once()
+
+def test_autosave_observer_update_batch_skips_empty_batch():
+    calculator_mock = make_calculator_mock(auto_save=True)
+    observer = AutoSaveObserver(calculator_mock)
+
+    observer.update_batch([])
+    calculator_mock.save_history.assert_not_called()
+
+def test_autosave_observer_appends_in_journal_mode():
+    calculator_mock = make_calculator_mock(journal=True)
+    observer = AutoSaveObserver(calculator_mock)
+
+    observer.update(calculation_mock)
+    observer.update_batch([calculation_mock, calculation_mock])
+    assert calculator_mock.append_history.call_count == 2
+    calculator_mock.save_history.assert_not_called()
+
+def test_autosave_observer_appends_to_sqlite_history():
+    calculator_mock = make_calculator_mock(history_format='sqlite')
+    observer = AutoSaveObserver(calculator_mock)
+
+    observer.update(calculation_mock)
+    calculator_mock.append_history.assert_called_once()
+    calculator_mock.save_history.assert_not_called()
+
+# Test cases for coalesced auto-save
+
+def make_coalescing_observer(every=1, interval_ms=0, journal=False):
+    calculator_mock = make_calculator_mock(every=every, interval_ms=interval_ms, journal=journal)
+    return calculator_mock, AutoSaveObserver(calculator_mock)
+
+def test_autosave_observer_saves_every_n_calculations():
+    calculator_mock, observer = make_coalescing_observer(every=3, journal=True)
+    for _ in range(7):
+        observer.update(calculation_mock)
+    assert calculator_mock.append_history.call_count == 2
+    assert len(calculator_mock.append_history.call_args[0][0]) == 3
+    observer.flush()
+    assert calculator_mock.append_history.call_count == 3
+    assert len(calculator_mock.append_history.call_args[0][0]) == 1
+    observer.flush()
+    assert calculator_mock.append_history.call_count == 3
+
+@patch('app.history.time.monotonic')
+def test_autosave_observer_limits_save_rate(monotonic_mock):
+    calculator_mock, observer = make_coalescing_observer(interval_ms=500)
+    monotonic_mock.return_value = 100.0
+    observer.update(calculation_mock)  # first save is immediate
+    monotonic_mock.return_value = 100.2
+    observer.update(calculation_mock)
+    observer.update_batch([calculation_mock, calculation_mock])
+    assert calculator_mock.save_history.call_count == 1
+    monotonic_mock.return_value = 100.5
+    observer.update(calculation_mock)
+    assert calculator_mock.save_history.call_count == 2
+
+def test_autosave_observer_skips_calculations_saved_explicitly():
+    calculator_mock, observer = make_coalescing_observer(every=10, journal=True)
+    observer.update(calculation_mock)
+    calculator_mock.save_count = 1  # a full save_history() ran meanwhile
+    observer.flush()
+    calculator_mock.append_history.assert_not_called()
+
+def test_observer_flush_defaults_to_noop():
+    LoggingObserver().flush()
+
+def test_autosave_observer_saves_held_back_calculations_at_deadline():
+    calculator_mock, observer = make_coalescing_observer(every=10, interval_ms=20, journal=True)
+    saved = threading.Event()
+    calculator_mock.append_history.side_effect = lambda calculations: saved.set()
+    observer.update(calculation_mock)
+    observer.update_batch([calculation_mock, calculation_mock])
+    assert saved.wait(5)
+    calculator_mock.append_history.assert_called_once()
+    assert len(calculator_mock.append_history.call_args[0][0]) == 3
+
+def test_autosave_observer_deadline_is_cancelled_by_save():
+    calculator_mock, observer = make_coalescing_observer(every=2, interval_ms=60000, journal=True)
+    observer.update(calculation_mock)
+    timer = observer._deadline
+    assert timer.is_alive()
+    observer.flush()
+    timer.join(5)
+    assert not timer.is_alive()
+    assert observer._deadline is None
+    assert calculator_mock.append_history.call_count == 1
+
+def expire_deadline(observer):
+    """Run the armed deadline callback now, as its timer thread would."""
+    timer = observer._deadline
+    timer.cancel()
+    observer._on_deadline(timer)
+
+def test_autosave_observer_deadline_skips_explicitly_saved_calculations():
+    calculator_mock, observer = make_coalescing_observer(every=10, interval_ms=60000, journal=True)
+    observer.update(calculation_mock)
+    calculator_mock.save_count = 1  # a full save_history() ran meanwhile
+    expire_deadline(observer)
+    calculator_mock.append_history.assert_not_called()
+
+def test_autosave_observer_deadline_logs_save_errors(caplog):
+    calculator_mock, observer = make_coalescing_observer(every=10, interval_ms=60000, journal=True)
+    calculator_mock.append_history.side_effect = OSError("disk full")
+    observer.update(calculation_mock)
+    expire_deadline(observer)
+    assert "Deadline auto-save failed: disk full" in caplog.text
+    assert len(observer._pending) == 1
+
+def test_autosave_observer_ignores_superseded_deadlines():
+    calculator_mock, observer = make_coalescing_observer(every=10, interval_ms=60000, journal=True)
+    observer.update(calculation_mock)
+    observer._deadline.cancel()
+    observer._on_deadline(threading.Timer(1, lambda: None))
+    calculator_mock.append_history.assert_not_called()
+    assert observer._deadline is not None
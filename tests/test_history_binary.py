@@ -0,0 +1,168 @@
+import pytest
+
+from app import history_binary
+from app.exceptions import OperationError
+from app.history_binary import (
+    BinaryHistoryReader,
+    binary_to_csv,
+    csv_to_binary,
+    is_binary_history,
+    main,
+    read_csv_records,
+    write_binary_history,
+)
+
+RECORDS = [
+    ("Addition", "1.50", "2", "3.50", "2024-05-01T12:30:15.123456"),
+    ("Division", "1", "3", "0.3333333333", "2024-05-01T12:31:00"),
+    ("Power", "-2E+5", "2", "4.0E+10", "1969-12-31T23:59:59.999999"),
+    ("Addition", "0", "-0.0", "0.0", "2024-05-02T00:00:00"),
+]
+
+CSV_TEXT = (
+    "operation,operand1,operand2,result,timestamp\n"
+    + "".join(",".join(record) + "\n" for record in RECORDS)
+)
+
+
+def test_roundtrip_preserves_text_fields(tmp_path):
+    path = tmp_path / "history.bin"
+    assert write_binary_history(path, RECORDS) == 4
+    with BinaryHistoryReader(path) as reader:
+        assert len(reader) == 4
+        assert reader.operation_names == ["Addition", "Division", "Power"]
+        assert list(reader.records()) == RECORDS
+        assert list(reader.records(2)) == RECORDS[2:]
+        assert list(reader.records(1, 3)) == RECORDS[1:3]
+        assert list(reader.records(3, 99)) == RECORDS[3:]
+        assert reader.record(0) == RECORDS[0]
+        assert reader.record(-1) == RECORDS[-1]
+        with pytest.raises(IndexError):
+            reader.record(4)
+
+
+def test_timestamps_keep_utc_offsets(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_binary, "READ_CHUNK_ROWS", 2)
+    records = RECORDS[:2] + [
+        ("Addition", "1", "2", "3", "2024-05-01T12:30:15.500000+02:00"),
+        ("Addition", "1", "2", "3", "2024-05-01T12:30:15-05:30"),
+        ("Addition", "1", "2", "3", "2024-05-01T12:30:15+00:00"),
+    ]
+    path = tmp_path / "history.bin"
+    assert write_binary_history(path, records) == 5
+    assert path.read_bytes()[8:10] == b"\x02\x00"
+    with BinaryHistoryReader(path) as reader:
+        assert list(reader.records()) == records
+        assert reader.record(-2) == records[-2]
+
+    write_binary_history(path, RECORDS)
+    assert path.read_bytes()[8:10] == b"\x01\x00"
+
+
+def test_timestamps_are_normalized_to_isoformat(tmp_path):
+    path = tmp_path / "history.bin"
+    write_binary_history(path, [
+        ("Addition", "1", "2", "3", "2024-01-01 10:00:00.5"),
+        ("Addition", "1", "2", "3", "2024-01-01T10:00:00Z"),
+    ])
+    with BinaryHistoryReader(path) as reader:
+        assert [record[4] for record in reader.records()] == [
+            "2024-01-01T10:00:00.500000", "2024-01-01T10:00:00+00:00"
+        ]
+
+
+def test_records_are_read_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_binary, "READ_CHUNK_ROWS", 3)
+    records = [("Addition", str(i), "1", str(i + 1), "2024-01-01T00:00:00") for i in range(10)]
+    path = tmp_path / "history.bin"
+    write_binary_history(path, records)
+    with BinaryHistoryReader(path) as reader:
+        assert list(reader.records()) == records
+        assert list(reader.records(4, 8)) == records[4:8]
+
+
+def test_empty_history(tmp_path):
+    path = tmp_path / "history.bin"
+    assert write_binary_history(path, []) == 0
+    with BinaryHistoryReader(path) as reader:
+        assert len(reader) == 0
+        assert list(reader.records()) == []
+
+
+def test_invalid_rows_are_rejected(tmp_path):
+    path = tmp_path / "history.bin"
+    with pytest.raises(OperationError, match="Invalid history row"):
+        write_binary_history(path, [("Addition", "1", "2", "3", "yesterday")])
+    with pytest.raises(OperationError, match="UTC offset must be whole seconds"):
+        write_binary_history(path, [("Addition", "1", "2", "3", "2024-01-01T00:00:00+01:00:00.5")])
+    with pytest.raises(OperationError, match="too long"):
+        write_binary_history(path, [("x" * 256, "1", "2", "3", "2024-01-01T00:00:00")])
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("content, message", [
+    (b"", "Not a binary history file"),
+    (b"CALC", "Not a binary history file"),
+    (b"operation,operand1,operand2,result,timestamp\n", "Not a binary history file"),
+])
+def test_reader_rejects_other_files(tmp_path, content, message):
+    path = tmp_path / "history.bin"
+    path.write_bytes(content)
+    with pytest.raises(OperationError, match=message):
+        BinaryHistoryReader(path)
+
+
+def test_reader_rejects_other_versions_and_truncation(tmp_path):
+    path = tmp_path / "history.bin"
+    write_binary_history(path, RECORDS)
+    data = path.read_bytes()
+
+    path.write_bytes(data[:8] + b"\x03\x00" + data[10:])
+    with pytest.raises(OperationError, match="Unsupported binary history version: 3"):
+        BinaryHistoryReader(path)
+
+    for size in (30, 60, len(data) - 8):
+        path.write_bytes(data[:size])
+        with pytest.raises(OperationError, match="Truncated"):
+            BinaryHistoryReader(path)
+
+
+def test_csv_conversion_roundtrip(tmp_path):
+    csv_path, bin_path, back_path = tmp_path / "h.csv", tmp_path / "h.bin", tmp_path / "back.csv"
+    csv_path.write_text(CSV_TEXT + "\n", encoding="utf-8")
+
+    assert csv_to_binary(csv_path, bin_path) == 4
+    assert is_binary_history(bin_path)
+    assert not is_binary_history(csv_path)
+    assert binary_to_csv(bin_path, back_path) == 4
+    assert back_path.read_text(encoding="utf-8") == CSV_TEXT
+
+
+def test_read_csv_records_handles_column_order_and_empty_files(tmp_path):
+    path = tmp_path / "h.csv"
+    path.write_text("timestamp,result,operand2,operand1,operation\n2024-01-01T00:00:00,3,2,1,Addition\n")
+    assert list(read_csv_records(path)) == [("Addition", "1", "2", "3", "2024-01-01T00:00:00")]
+    path.write_text("")
+    assert list(read_csv_records(path)) == []
+
+
+def test_csv_to_binary_rejects_missing_columns(tmp_path):
+    path = tmp_path / "h.csv"
+    path.write_text("operation,operand1\nAddition,1\n")
+    with pytest.raises(OperationError, match="'operand2' is not in list"):
+        csv_to_binary(path, tmp_path / "h.bin")
+
+
+def test_main_converts_in_both_directions(tmp_path, capsys):
+    csv_path, bin_path, back_path = tmp_path / "h.csv", tmp_path / "h.bin", tmp_path / "back.csv"
+    csv_path.write_text(CSV_TEXT, encoding="utf-8")
+
+    assert main([str(csv_path), str(bin_path)]) == 0
+    assert main([str(bin_path), str(back_path)]) == 0
+    assert back_path.read_text(encoding="utf-8") == CSV_TEXT
+    assert "Converted 4 rows" in capsys.readouterr().out
+
+
+def test_main_reports_errors(tmp_path, capsys):
+    assert main([str(tmp_path / "missing.csv"), str(tmp_path / "h.bin")]) == 1
+    assert "Error:" in capsys.readouterr().err
@@ -0,0 +1,113 @@
+import pytest
+from decimal import Decimal
+
+from app.calculation import Calculation
+from app.history_buffer import HistoryBuffer
+
+
+def _operands(items):
+    return [int(calc.operand1) for calc in items]
+
+
+def test_extend_evicts_oldest(make_calculation):
+    calcs = [make_calculation(i, 0) for i in range(5)]
+    buffer = HistoryBuffer(3)
+    assert buffer.extend(calcs[:2]) == []
+    evicted = buffer.extend(calcs[2:])
+    assert evicted == calcs[:2]
+    assert _operands(buffer) == [2, 3, 4]
+    assert len(buffer) == 3
+
+
+def test_initial_items_are_bounded(make_calculation):
+    buffer = HistoryBuffer(2, [make_calculation(i, 0) for i in range(4)])
+    assert _operands(buffer) == [2, 3]
+
+
+def test_pop_and_restore(make_calculation):
+    calcs = [make_calculation(i, 0) for i in range(4)]
+    buffer = HistoryBuffer(4, calcs)
+    assert buffer.pop_newest(2) == calcs[2:]
+    assert buffer.pop_oldest(1) == calcs[:1]
+    assert buffer.pop_newest(5) == calcs[1:2]
+    buffer.restore_oldest(calcs[:3])
+    assert buffer == calcs[:3]
+
+
+def test_indexing_and_slicing(make_calculation):
+    calcs = [make_calculation(i, 0) for i in range(10)]
+    buffer = HistoryBuffer(10, calcs)
+    assert buffer[0] is calcs[0]
+    assert buffer[-1] is calcs[-1]
+    assert buffer[-3:] == calcs[-3:]
+    assert buffer[1:4] == calcs[1:4]
+    assert buffer[::3] == calcs[::3]
+    assert buffer[5:2] == []
+    assert list(reversed(buffer)) == calcs[::-1]
+    with pytest.raises(IndexError):
+        buffer[10]
+
+
+def test_equality_and_repr(make_calculation):
+    calcs = [make_calculation(i, 0) for i in range(2)]
+    buffer = HistoryBuffer(5, calcs)
+    assert buffer == calcs
+    assert buffer == HistoryBuffer(3, calcs)
+    assert buffer != calcs[:1]
+    assert buffer.__eq__("history") is NotImplemented
+    assert repr(buffer) == "HistoryBuffer(maxlen=5, size=2)"
+    buffer.clear()
+    assert buffer == []
+
+
+# Lazy rows
+
+def _rows(n):
+    return [("Addition", str(i), "1", str(i + 1), "2024-01-01T00:00:00") for i in range(n)]
+
+
+def _materialized(buffer):
+    return [item._calculation is not None for item in buffer._items]
+
+
+def test_lazy_rows_materialize_on_access():
+    buffer = HistoryBuffer(10)
+    buffer.extend_lazy(_rows(4))
+    assert _materialized(buffer) == [False] * 4
+
+    assert buffer[-1].result == Decimal(4)
+    assert buffer[1:2][0].operand1 == Decimal(1)
+    assert _materialized(buffer) == [False, True, False, True]
+    # Materialized rows are cached
+    assert buffer[-1] is buffer[-1]
+
+
+def test_lazy_rows_are_bounded_without_parsing():
+    buffer = HistoryBuffer(2)
+    buffer.extend_lazy(_rows(5))
+    assert len(buffer) == 2
+    assert _materialized(buffer) == [False, False]
+    assert [calc.operand1 for calc in buffer] == [Decimal(3), Decimal(4)]
+
+
+def test_records_do_not_materialize():
+    calc = Calculation("Subtraction", Decimal(5), Decimal(2))
+    buffer = HistoryBuffer(10)
+    buffer.extend_lazy(_rows(2))
+    buffer[0]
+    buffer.extend([calc])
+    records = list(buffer.records())
+    assert records[0] == _rows(2)[0]
+    assert records[1] == _rows(2)[1]
+    assert records[2] == ("Subtraction", "5", "2", "3", calc.timestamp.isoformat())
+    assert buffer._items[0]._calculation is not None
+    assert buffer._items[1]._calculation is None
+
+
+def test_lazy_row_with_invalid_data():
+    from app.exceptions import OperationError
+
+    buffer = HistoryBuffer(10)
+    buffer.extend_lazy([("Addition", "x", "1", "2", "2024-01-01T00:00:00")])
+    with pytest.raises(OperationError, match="Invalid calculation data"):
+        buffer[0]
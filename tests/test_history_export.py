@@ -0,0 +1,73 @@
+import io
+import json
+
+import pytest
+
+from app.exceptions import OperationError
+from app.history_export import iter_chunks, write_records
+
+RECORDS = [
+    ("Addition", "1.50", "2", "3.50", "2024-05-01T12:30:15.123456"),
+    ("Division", "1", "3", "0.3333333333", "2024-05-01T12:31:00"),
+    ("Power", "-2E+5", "2", "4.0E+10", "2024-05-01T12:32:00"),
+]
+
+
+def test_iter_chunks():
+    assert list(iter_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_chunks([], 2)) == []
+
+
+def test_write_csv():
+    f = io.StringIO()
+    assert write_records(iter(RECORDS), f, 'csv', 2) == 3
+    lines = f.getvalue().splitlines()
+    assert lines[0] == "operation,operand1,operand2,result,timestamp"
+    assert lines[1:] == [",".join(record) for record in RECORDS]
+
+
+def test_write_jsonl_keeps_exact_values():
+    f = io.StringIO()
+    assert write_records(iter(RECORDS), f, 'jsonl', 2) == 3
+    rows = [json.loads(line) for line in f.getvalue().splitlines()]
+    assert rows[0] == {
+        "operation": "Addition", "operand1": "1.50", "operand2": "2",
+        "result": "3.50", "timestamp": "2024-05-01T12:30:15.123456",
+    }
+    assert [row["result"] for row in rows] == ["3.50", "0.3333333333", "4.0E+10"]
+
+
+def test_empty_export():
+    f = io.StringIO()
+    assert write_records([], f, 'jsonl', 10) == 0
+    assert f.getvalue() == ""
+
+
+def test_records_are_consumed_one_chunk_at_a_time():
+    f = io.StringIO()
+    consumed = []
+
+    def records():
+        for record in RECORDS:
+            consumed.append(record)
+            yield record
+
+    chunks = []
+    original_write = f.write
+
+    def tracking_write(text):
+        chunks.append(len(consumed))
+        return original_write(text)
+
+    f.write = tracking_write
+    write_records(records(), f, 'jsonl', 1)
+    assert chunks == [1, 2, 3]
+
+
+@pytest.mark.parametrize("export_format, chunk_size, message", [
+    ("xml", 10, "Unknown export format: xml"),
+    ("csv", 0, "chunk_size must be positive"),
+])
+def test_invalid_arguments(export_format, chunk_size, message):
+    with pytest.raises(OperationError, match=message):
+        write_records(RECORDS, io.StringIO(), export_format, chunk_size)
@@ -0,0 +1,130 @@
+import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.calculation import Calculation
+from app.calculator_memento import HistoryDelta
+from app.history_buffer import HISTORY_COLUMNS, HistoryBuffer
+from app.history_frame import HistoryFrame
+
+def expected_frame(history):
+    return pd.DataFrame(
+        [
+            {
+                'operation': c.operation,
+                'operand1': str(c.operand1),
+                'operand2': str(c.operand2),
+                'result': str(c.result),
+                'timestamp': c.timestamp,
+            }
+            for c in history
+        ],
+        columns=HISTORY_COLUMNS
+    ).astype({name: object for name in HISTORY_COLUMNS[:4]})
+
+
+def test_frame_matches_history(make_calculation):
+    history = HistoryBuffer(10, [make_calculation(1), make_calculation("2.5", operation="Multiplication", minute=1)])
+    frame = HistoryFrame(history).frame()
+    pd.testing.assert_frame_equal(frame, expected_frame(history))
+    assert frame['timestamp'].dtype == np.dtype('datetime64[us]')
+
+
+def test_empty_history_has_columns():
+    frame = HistoryFrame(HistoryBuffer(10)).frame()
+    assert list(frame.columns) == HISTORY_COLUMNS
+    assert len(frame) == 0
+
+
+def test_only_new_rows_are_converted(monkeypatch, make_calculation):
+    history = HistoryBuffer(100, [make_calculation(i, minute=i) for i in range(5)])
+    history_frame = HistoryFrame(history)
+    first = history_frame.frame()
+    assert history_frame.frame() is not first
+
+    requested = []
+    records = history.records
+
+    def tracking_records(start=0):
+        requested.append(start)
+        return records(start)
+
+    monkeypatch.setattr(history, "records", tracking_records)
+    history.extend([make_calculation(5, minute=5), make_calculation(6, minute=6)])
+    second = history_frame.frame()
+    assert requested == [5]
+    assert len(first) == 5
+    pd.testing.assert_frame_equal(second, expected_frame(history))
+
+
+def test_evictions_are_compacted_without_touching_old_frames(make_calculation):
+    history = HistoryBuffer(20, [make_calculation(i, minute=i) for i in range(20)])
+    history_frame = HistoryFrame(history)
+    old = history_frame.frame()
+    for i in range(20, 60):
+        history.extend([make_calculation(i, minute=i)])
+        history_frame.refresh()
+    frame = history_frame.frame()
+    pd.testing.assert_frame_equal(frame, expected_frame(history))
+    assert frame['operand1'].tolist()[0] == '40'
+    assert old['operand1'].tolist() == [str(i) for i in range(20)]
+    assert len(history_frame._columns['timestamp']) <= 2 * 20 + 1
+
+
+def test_offset_timestamps_are_given_in_utc(make_calculation):
+    history = HistoryBuffer(10, [make_calculation(1)])
+    history_frame = HistoryFrame(history)
+    assert history_frame.frame()['timestamp'].dtype == np.dtype('datetime64[us]')
+    plus_two = datetime.timezone(datetime.timedelta(hours=2))
+    aware = datetime.datetime(2024, 1, 1, 12, 0, tzinfo=plus_two)
+    history.extend([Calculation("Addition", Decimal(2), Decimal(1), timestamp=aware)])
+    timestamps = history_frame.frame()['timestamp']
+    assert str(timestamps.dtype) == 'datetime64[us, UTC]'
+    assert timestamps[1] == pd.Timestamp("2024-01-01T10:00:00", tz="UTC")
+    assert timestamps[0] == pd.Timestamp(make_calculation.base.astimezone(datetime.timezone.utc))
+
+
+def test_frames_are_independent(make_calculation):
+    history_frame = HistoryFrame(HistoryBuffer(10, [make_calculation(1)]))
+    first = history_frame.frame()
+    first['doubled'] = first['result'] * 2
+    first['result'] = 'changed'
+    second = history_frame.frame()
+    assert list(second.columns) == HISTORY_COLUMNS
+    assert second['result'].tolist() == ['2']
+
+
+def test_version_change_rebuilds(make_calculation):
+    history = HistoryBuffer(10, [make_calculation(1, minute=1)])
+    history_frame = HistoryFrame(history)
+    history_frame.frame()
+    delta = HistoryDelta(appended=[make_calculation(2, minute=2)], evicted=[])
+    delta.apply(history)
+    assert history_frame.frame()['operand1'].tolist() == ['1', '2']
+    delta.revert(history)
+    history.extend([make_calculation(3, minute=3)])
+    pd.testing.assert_frame_equal(history_frame.frame(), expected_frame(history))
+    history.clear()
+    assert len(history_frame.frame()) == 0
+
+
+def test_lazy_rows_are_not_materialized():
+    history = HistoryBuffer(10)
+    history.extend_lazy([("Addition", "1", "2", "3", "2024-01-01T00:00:00.5")])
+    frame = HistoryFrame(history).frame()
+    assert frame['result'].tolist() == ['3']
+    assert frame['timestamp'][0] == pd.Timestamp("2024-01-01T00:00:00.5")
+    assert history._items[0].row is not None
+
+
+def test_frame_is_read_only(make_calculation):
+    history = HistoryBuffer(10, [make_calculation(1)])
+    frame = HistoryFrame(history).frame()
+    with pytest.raises(ValueError, match="read-only"):
+        frame.loc[0, 'operation'] = 'Changed'
+    copy = frame.copy()
+    copy.loc[0, 'operation'] = 'Changed'
+    assert frame['operation'][0] == 'Addition'
@@ -0,0 +1,152 @@
+import datetime
+from decimal import Decimal
+
+from app.calculation import Calculation
+from app.calculator_memento import HistoryDelta
+from app.history_buffer import HistoryBuffer
+from app import history_index
+from app.history_index import HistoryIndex
+
+def operands(calculations):
+    return [c.operand1 for c in calculations]
+
+
+def make_history(make_calculation):
+    history = HistoryBuffer(100)
+    history.extend([
+        make_calculation(1, 1, "Addition", 0),
+        make_calculation(2, 5, "Multiplication", 1),
+        make_calculation(3, 1, "Addition", 2),
+        make_calculation(4, 10, "Subtraction", 3),
+        make_calculation(5, 1, "Addition", 4),
+    ])
+    return history
+
+
+def test_filters_use_each_index(make_calculation):
+    index = HistoryIndex(make_history(make_calculation))
+    assert operands(index.query(operation="Addition")) == [1, 3, 5]
+    assert operands(index.query(since=make_calculation.at(1),
+                                until=make_calculation.at(3))) == [2, 3]
+    assert operands(index.query(until=make_calculation.at(1))) == [1]
+    assert operands(index.query(min_result=Decimal(4), max_result=Decimal(6))) == [3, 5]
+    assert operands(index.query(max_result=Decimal(2))) == [1, 4]
+    assert operands(index.query(min_result=Decimal(10))) == [2]
+    assert index.query(operation="Division") == []
+
+
+def test_filters_are_combined_and_limited(make_calculation):
+    index = HistoryIndex(make_history(make_calculation))
+    assert operands(index.query(operation="Addition", min_result=Decimal(4))) == [3, 5]
+    assert operands(index.query(operation="Addition", limit=2)) == [3, 5]
+    assert index.query(operation="Addition", limit=0) == []
+    assert operands(index.query()) == [1, 2, 3, 4, 5]
+    assert operands(index.query(limit=2)) == [4, 5]
+    assert index.query(limit=0) == []
+
+
+def test_appends_are_indexed_incrementally(make_calculation):
+    history = make_history(make_calculation)
+    index = HistoryIndex(history)
+    index.query()
+    indexed = index._by_result
+    history.extend([make_calculation(6, 1, "Addition", 5)])
+    assert operands(index.query(operation="Addition")) == [1, 3, 5, 6]
+    assert index._by_result is indexed
+
+
+def test_evicted_entries_are_skipped_then_pruned(make_calculation):
+    history = make_history(make_calculation)
+    history.maxlen = 5
+    index = HistoryIndex(history)
+    index.query()
+    history.extend([make_calculation(6, 1, "Addition", 5), make_calculation(7, 1, "Addition", 6)])
+    assert history.start == 2
+    assert operands(index.query(operation="Addition")) == [3, 5, 6, 7]
+    assert operands(index.query(max_result=Decimal(2))) == [4]
+    assert len(index._by_result) == 7
+
+    history.extend([make_calculation(i, 1, "Addition", i) for i in range(8, 14)])
+    assert operands(index.query(operation="Addition")) == [9, 10, 11, 12, 13]
+    assert len(index._by_result) == 5
+
+
+def test_entries_appended_and_evicted_between_queries(make_calculation):
+    history = make_history(make_calculation)
+    history.maxlen = 2
+    index = HistoryIndex(history)
+    index.query()
+    history.extend([make_calculation(i, 1, "Addition", i) for i in range(6, 12)])
+    assert operands(index.query(operation="Addition")) == [10, 11]
+
+
+def test_undo_and_clear_rebuild_the_index(make_calculation):
+    history = make_history(make_calculation)
+    index = HistoryIndex(history)
+    delta = HistoryDelta(appended=[make_calculation(8, 2, "Division", 5)], evicted=[])
+    delta.apply(history)
+    assert operands(index.query(operation="Division")) == [8]
+
+    delta.revert(history)
+    assert index.query(operation="Division") == []
+    history.extend([make_calculation(2, 3, "Power", 6)])
+    assert operands(index.query(min_result=Decimal(8))) == [2, 2]
+
+    history.clear()
+    assert index.query(operation="Addition") == []
+
+
+def test_restored_oldest_entries_are_found(make_calculation):
+    history = make_history(make_calculation)
+    index = HistoryIndex(history)
+    evicted = history.pop_oldest(2)
+    assert operands(index.query(operation="Addition")) == [3, 5]
+    history.restore_oldest(evicted)
+    assert history.start == 0
+    assert operands(index.query(operation="Addition")) == [1, 3, 5]
+
+
+def test_naive_and_offset_timestamps_are_compared_in_utc(make_calculation):
+    history = make_history(make_calculation)
+    utc = datetime.timezone.utc
+    local = make_calculation.base.astimezone(utc)
+    history.extend([
+        Calculation("Addition", Decimal(6), Decimal(1), timestamp=local + datetime.timedelta(minutes=5)),
+        Calculation("Addition", Decimal(7), Decimal(1), timestamp=local - datetime.timedelta(minutes=1)),
+    ])
+    index = HistoryIndex(history)
+    assert operands(index.query(until=make_calculation.base)) == [7]
+    assert operands(index.query(since=local + datetime.timedelta(minutes=4))) == [5, 6]
+    assert operands(index.query(
+        since=(local + datetime.timedelta(minutes=3)).astimezone(datetime.timezone(datetime.timedelta(hours=-5))),
+        until=make_calculation.at(5)
+    )) == [4, 5]
+
+
+def test_lazy_rows_are_indexed():
+    history = HistoryBuffer(10)
+    history.extend_lazy([
+        ("Addition", "1", "2", "3", "2024-01-01T00:00:00"),
+        ("Division", "1", "4", "0.25", "2024-01-01T00:01:00"),
+    ])
+    index = HistoryIndex(history)
+    assert [c.result for c in index.query(max_result=Decimal(1))] == [Decimal("0.25")]
+
+
+def test_build_sorts_once_and_small_appends_are_inserted(monkeypatch, make_calculation):
+    history = HistoryBuffer(100, [make_calculation(i, i % 3 - i, "Addition", 50 - i) for i in range(20)])
+    index = HistoryIndex(history)
+    assert operands(index.query(min_result=Decimal(1), max_result=Decimal(1))) == [1, 4, 7, 10, 13, 16, 19]
+    assert operands(index.query(until=make_calculation.at(32))) == [19]
+
+    inserted = []
+    insort = history_index.insort
+
+    def tracking_insort(entries, pair):
+        inserted.append(pair)
+        insort(entries, pair)
+
+    monkeypatch.setattr(history_index, "insort", tracking_insort)
+    history.extend([make_calculation(20, -19, "Addition", 60)])
+    assert operands(index.query(min_result=Decimal(1), max_result=Decimal(1)))[-1] == 20
+    assert len(inserted) == 2
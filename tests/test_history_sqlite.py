@@ -0,0 +1,141 @@
+import datetime
+import sqlite3
+import threading
+
+import pytest
+
+from app.history_sqlite import SQLiteHistoryStore
+
+
+def _records(count, operation="Addition", start=0):
+    return [
+        (operation, str(i), "1", str(i + 1), datetime.datetime(2024, 1, 1, 0, 0, i).isoformat())
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    history_db = SQLiteHistoryStore(tmp_path / "history.db")
+    yield history_db
+    history_db.close()
+
+
+def test_database_uses_wal_and_indexes(store):
+    connection = sqlite3.connect(str(store.path))
+    try:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list(history)")}
+        assert {"history_operation", "history_timestamp_utc"} <= indexes
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM history WHERE operation = 'Addition'"
+        ).fetchall()
+        assert "history_operation" in str(plan)
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM history WHERE timestamp_utc >= 0"
+        ).fetchall()
+        assert "history_timestamp_utc" in str(plan)
+    finally:
+        connection.close()
+
+
+def test_replace_and_tail(store):
+    store.replace(_records(5))
+    assert store.count() == 5
+    assert store.tail(2) == _records(5)[3:]
+    store.replace(_records(2, start=10))
+    assert store.tail(10) == _records(2, start=10)
+
+
+def test_append_keeps_all_rows(store):
+    store.replace(_records(3))
+    store.append(_records(2, start=3))
+    assert store.tail(10) == _records(5)
+
+
+def test_replace_keeps_oldest_rows(store):
+    store.replace(_records(5))
+    assert store.replace(_records(2, start=10), keep=3) == 3
+    assert store.tail(10) == _records(3) + _records(2, start=10)
+    assert store.replace(_records(1, start=20), keep=10) == 5
+    assert store.count() == 6
+    assert store.replace([], keep=-1) == 0
+    assert store.count() == 0
+
+
+def test_append_is_one_transaction(store):
+    store.replace(_records(2))
+    with pytest.raises(sqlite3.IntegrityError):
+        store.append(_records(1, start=2) + [("Addition", None, "1", "2", "2024-01-01T00:00:00")])
+    assert store.count() == 2
+
+
+def test_query_filters(store):
+    store.replace(_records(4) + _records(3, operation="Division", start=4))
+    assert store.query() == store.tail(10)
+    assert [row[1] for row in store.query(operation="Division")] == ["4", "5", "6"]
+    assert [row[1] for row in store.query(operation="Division", limit=2)] == ["5", "6"]
+    since = datetime.datetime(2024, 1, 1, 0, 0, 2)
+    until = datetime.datetime(2024, 1, 1, 0, 0, 5)
+    assert [row[1] for row in store.query(since=since, until=until)] == ["2", "3", "4"]
+    assert store.query(operation="Power") == []
+
+
+def test_query_compares_times_in_utc(store):
+    plus_two = datetime.timezone(datetime.timedelta(hours=2))
+    rows = [
+        ("Addition", "0", "1", "1", datetime.datetime(2024, 1, 1, 11, 0, tzinfo=plus_two).isoformat()),
+        ("Addition", "1", "1", "2", datetime.datetime(2024, 1, 1, 10, 0, tzinfo=datetime.timezone.utc).isoformat()),
+    ]
+    store.replace(rows)
+    # As text "2024-01-01T11:00:00+02:00" sorts after "2024-01-01T10:00:00+00:00"
+    since = datetime.datetime(2024, 1, 1, 9, 30, tzinfo=datetime.timezone.utc)
+    assert [row[1] for row in store.query(since=since)] == ["1"]
+    assert [row[1] for row in store.query(until=since)] == ["0"]
+
+
+def test_database_without_utc_column_is_migrated(tmp_path):
+    path = tmp_path / "history.db"
+    connection = sqlite3.connect(str(path))
+    connection.execute(
+        "CREATE TABLE history (id INTEGER PRIMARY KEY, operation TEXT NOT NULL, operand1 TEXT NOT NULL,"
+        " operand2 TEXT NOT NULL, result TEXT NOT NULL, timestamp TEXT NOT NULL)"
+    )
+    connection.execute("CREATE INDEX history_timestamp ON history (timestamp)")
+    connection.executemany(
+        "INSERT INTO history (operation, operand1, operand2, result, timestamp) VALUES (?, ?, ?, ?, ?)",
+        _records(3)
+    )
+    connection.commit()
+    connection.close()
+    store = SQLiteHistoryStore(path)
+    try:
+        since = datetime.datetime(2024, 1, 1, 0, 0, 1)
+        assert store.query(since=since) == _records(2, start=1)
+    finally:
+        store.close()
+
+
+def test_existing_database_is_reopened(tmp_path):
+    first = SQLiteHistoryStore(tmp_path / "history.db")
+    first.replace(_records(3))
+    first.close()
+    second = SQLiteHistoryStore(tmp_path / "history.db")
+    try:
+        assert second.tail(10) == _records(3)
+    finally:
+        second.close()
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "history.csv"
+    path.write_text("operation,operand1,operand2,result,timestamp\n" * 100)
+    with pytest.raises(sqlite3.DatabaseError):
+        SQLiteHistoryStore(path)
+
+
+def test_store_can_be_used_from_another_thread(store):
+    thread = threading.Thread(target=store.append, args=(_records(2),))
+    thread.start()
+    thread.join()
+    assert store.count() == 2
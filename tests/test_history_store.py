@@ -0,0 +1,89 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.calculation import Calculation
+from app.exceptions import OperationError
+from app.history_store import NAIVE_OFFSET, DecimalColumn, HistoryStore
+
+
+def test_roundtrip_preserves_calculations():
+    calcs = [
+        Calculation("Addition", Decimal("1.50"), Decimal("2"), timestamp=datetime.datetime(2024, 5, 1, 12, 30, 15, 123456)),
+        Calculation("Division", Decimal("1"), Decimal("3")),
+        Calculation("Power", Decimal("-2E+5"), Decimal("2")),
+    ]
+    store = HistoryStore(calcs)
+    assert len(store) == 3
+    assert list(store) == calcs
+    assert [calc.timestamp for calc in store] == [calc.timestamp for calc in calcs]
+    assert str(store[0].operand1) == "1.50"
+    assert store[-1].result == calcs[-1].result
+
+
+def test_rows_are_materialized_without_recomputing(monkeypatch):
+    store = HistoryStore([Calculation("Multiplication", Decimal("4"), Decimal("5"))])
+
+    def fail(self):
+        raise AssertionError("calculate() should not run")
+
+    monkeypatch.setattr(Calculation, "calculate", fail)
+    assert store[0].result == Decimal("20")
+
+
+def test_operation_codes_are_shared():
+    store = HistoryStore(Calculation("Addition", Decimal(i), Decimal(1)) for i in range(4))
+    store.append(Calculation("Subtraction", Decimal(1), Decimal(1)))
+    assert store.operation_names == ["Addition", "Subtraction"]
+    assert list(store.operations) == [0, 0, 0, 0, 1]
+    assert store.operation(-1) == "Subtraction"
+
+
+def test_index_out_of_range():
+    store = HistoryStore()
+    with pytest.raises(IndexError):
+        store[0]
+
+
+def test_too_many_operations():
+    store = HistoryStore()
+    store.operation_names = [str(i) for i in range(256)]
+    with pytest.raises(OperationError, match="at most 256"):
+        store.append(Calculation("Addition", Decimal(1), Decimal(1)))
+
+
+def test_nbytes_counts_packed_columns():
+    column = DecimalColumn()
+    column.append(Decimal("12.5"))
+    assert column.nbytes == 4 + 8
+    assert column.text(0) == "12.5"
+    assert len(column) == 1
+    store = HistoryStore([Calculation("Addition", Decimal("1"), Decimal("2"))])
+    # 1 op code + three 1-char values with offsets + 8-byte timestamp
+    assert store.nbytes == 1 + 3 * (1 + 8) + 8
+
+
+def test_records_are_stored_as_text():
+    record = ("Addition", "1.50", "-0", "1.50", "2024-05-01T12:30:15.123456")
+    store = HistoryStore()
+    store.append_record(record)
+    store.append(Calculation("Addition", Decimal("2"), Decimal("3"), timestamp=datetime.datetime(2024, 1, 1)))
+    assert store.operation_names == ["Addition"]
+    assert store.record(0) == record
+    assert store.record(1) == ("Addition", "2", "3", "5", "2024-01-01T00:00:00")
+    assert store[0].operand2 == Decimal("-0")
+
+
+def test_offset_aware_timestamps_keep_their_offset():
+    aware = datetime.datetime(2024, 1, 1, 10, tzinfo=datetime.timezone(datetime.timedelta(hours=-3)))
+    store = HistoryStore([Calculation("Addition", Decimal("1"), Decimal("2"), timestamp=datetime.datetime(2024, 1, 1))])
+    assert store.utc_offsets is None
+    store.append(Calculation("Addition", Decimal("1"), Decimal("2"), timestamp=aware))
+    store.append_record(("Addition", "1", "2", "3", "2024-01-01T10:00:00"))
+    assert list(store.utc_offsets) == [NAIVE_OFFSET, -3 * 3600, NAIVE_OFFSET]
+    assert store[1].timestamp == aware
+    assert store[1].timestamp.utcoffset() == datetime.timedelta(hours=-3)
+    assert store.record(1)[4] == "2024-01-01T10:00:00-03:00"
+    assert store.timestamp(0).tzinfo is None
+    assert store.nbytes == 3 + 3 * 3 * (1 + 8) + 3 * (8 + 4)
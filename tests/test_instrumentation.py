@@ -0,0 +1,38 @@
+import json
+from unittest.mock import patch
+
+from app.instrumentation import StageHistogram, StageTimer
+
+
+def test_histogram_summary():
+    histogram = StageHistogram()
+    assert histogram.percentile(0.5) == 0
+    assert histogram.summary()['mean_ns'] == 0
+    for duration in (100, 200, 300, 5000):
+        histogram.record(duration)
+    summary = histogram.summary()
+    assert (summary['count'], summary['total_ns'], summary['mean_ns']) == (4, 5600, 1400)
+    assert (summary['min_ns'], summary['max_ns']) == (100, 5000)
+    assert summary['p50_ns'] == 255
+    assert summary['p99_ns'] == 5000
+    assert summary['buckets'] == {'127': 1, '255': 1, '511': 1, '8191': 1}
+
+
+def test_timer_laps_and_total(tmp_path):
+    timer = StageTimer()
+    with patch('app.instrumentation.time.perf_counter_ns', side_effect=[1000, 1300, 1800, 2000]):
+        timer.start()
+        timer.lap('validate')
+        timer.lap('execute')
+        timer.stop()
+    stats = timer.stats()
+    assert list(stats) == ['validate', 'execute', 'total']
+    assert stats['validate']['total_ns'] == 300
+    assert stats['execute']['total_ns'] == 500
+    assert stats['total']['total_ns'] == 1000
+
+    path = tmp_path / "stats.json"
+    timer.dump(path)
+    assert json.loads(path.read_text(encoding='utf-8'))['total']['count'] == 1
+    timer.reset()
+    assert timer.stats() == {}
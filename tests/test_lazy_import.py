@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+from app.lazy_import import LazyModule
+
+# Budget for importing the REPL module, in microseconds (-X importtime units)
+IMPORT_BUDGET_US = 500_000
+
+
+def test_module_is_imported_on_first_use():
+    module = LazyModule('json')
+    assert not module.loaded
+    assert repr(module) == "LazyModule('json', not loaded)"
+    assert module.available()
+    assert module.dumps([1]) == "[1]"
+    assert module.loaded
+    assert repr(module) == "LazyModule('json', loaded)"
+
+
+def test_missing_module_is_not_available():
+    assert not LazyModule('no_such_module_for_tests').available()
+
+
+def test_repl_import_skips_heavy_dependencies():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app.calculator_repl'],
+        capture_output=True, text=True, check=True
+    )
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line and 'cumulative' not in line:
+            _, cumulative, name = line.split('|')
+            timings[name.strip()] = int(cumulative)
+    assert 'app.calculator_repl' in timings
+    assert 'pandas' not in timings
+    assert 'dotenv' not in timings
+    assert timings['app.calculator_repl'] < IMPORT_BUDGET_US
@@ -0,0 +1,102 @@
+import dataclasses
+import logging
+import threading
+
+import pytest
+
+from app.calculator_config import CalculatorConfig
+from app.logging_setup import DeferredQueueHandler, configure_logging, shutdown_logging
+
+
+class ThreadRecorder:
+    """Log argument that remembers which threads formatted it."""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread())
+        return "recorded"
+
+
+def make_config(log_file, **kwargs):
+    config = CalculatorConfig(**kwargs)
+    config.paths = dataclasses.replace(config.paths, log_file=log_file)
+    return config
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    yield
+    shutdown_logging()
+    logging.basicConfig(handlers=[logging.NullHandler()], level=logging.WARNING, force=True)
+
+
+def test_sync_mode_writes_on_calling_thread(tmp_path):
+    log_file = tmp_path / "sync.log"
+    configure_logging(make_config(log_file, log_mode='sync'))
+    argument = ThreadRecorder()
+    logging.info("value: %s", argument)
+
+    root = logging.getLogger()
+    assert [type(handler) for handler in root.handlers] == [logging.FileHandler]
+    assert root.level == logging.INFO
+    assert argument.threads == [threading.current_thread()]
+    assert " - INFO - value: recorded" in log_file.read_text()
+
+
+def test_queue_mode_formats_on_listener_thread(tmp_path):
+    log_file = tmp_path / "queue.log"
+    configure_logging(make_config(log_file, log_mode='queue'))
+    argument = ThreadRecorder()
+    logging.info("value: %s", argument)
+    shutdown_logging()
+
+    assert len(argument.threads) == 1
+    assert argument.threads[0] is not threading.current_thread()
+    assert " - INFO - value: recorded" in log_file.read_text()
+
+
+def test_shutdown_switches_to_synchronous_writes(tmp_path):
+    log_file = tmp_path / "queue.log"
+    configure_logging(make_config(log_file, log_mode='queue'))
+    assert isinstance(logging.getLogger().handlers[0], DeferredQueueHandler)
+    shutdown_logging()
+    shutdown_logging()
+
+    assert [type(handler) for handler in logging.getLogger().handlers] == [logging.FileHandler]
+    logging.warning("after shutdown")
+    assert "after shutdown" in log_file.read_text()
+
+
+def test_disabled_level_skips_formatting(tmp_path):
+    log_file = tmp_path / "gated.log"
+    configure_logging(make_config(log_file, log_mode='queue', log_level='WARNING'))
+    argument = ThreadRecorder()
+    logging.info("value: %s", argument)
+    logging.warning("kept")
+    shutdown_logging()
+
+    assert argument.threads == []
+    assert "value" not in log_file.read_text()
+    assert "kept" in log_file.read_text()
+
+
+def test_reconfigure_drains_previous_listener(tmp_path):
+    first, second = tmp_path / "first.log", tmp_path / "second.log"
+    configure_logging(make_config(first, log_mode='queue'))
+    logging.info("to first")
+    configure_logging(make_config(second, log_mode='queue'))
+    logging.info("to second")
+    shutdown_logging()
+
+    assert "to first" in first.read_text()
+    assert "to second" not in first.read_text()
+    assert "to second" in second.read_text()
+
+
+def test_deferred_queue_handler_keeps_arguments():
+    handler = DeferredQueueHandler(None)
+    record = logging.LogRecord("root", logging.INFO, __file__, 1, "x=%s", (1,), None)
+    assert handler.prepare(record) is record
+    assert (record.msg, record.args) == ("x=%s", (1,))
@@ -10,3 +10,33 @@ def test_memento_roundtrip():
 
     assert round_tripped.history[0] == c
     assert "CalculatorMemento" in repr(round_tripped)
+
+
+def test_memento_roundtrip_keeps_configured_precision_results(caplog):
+    from app.decimal_math import decimal_power, decimal_root
+
+    root = Calculation("Root", Decimal("2"), Decimal("3"), result=decimal_root(Decimal("2"), Decimal("3"), 10))
+    power = Calculation("Power", Decimal("2"), Decimal("0.5"), result=decimal_power(Decimal("2"), Decimal("0.5"), 10))
+    snap = Memento(history=[root, power])
+    round_tripped = Memento.from_dict(snap.to_dict())
+
+    assert [str(c.result) for c in round_tripped.history] == [str(root.result), str(power.result)]
+    assert str(round_tripped.history[0].result) == "1.25992105"
+    assert round_tripped.history[0].timestamp == root.timestamp
+    assert "differs" not in caplog.text
+
+
+def test_history_delta_revert_and_apply():
+    from app.calculator_memento import HistoryDelta
+    from app.history_buffer import HistoryBuffer
+
+    old = Calculation("Addition", Decimal("1"), Decimal("1"))
+    kept = Calculation("Addition", Decimal("2"), Decimal("2"))
+    new = Calculation("Addition", Decimal("3"), Decimal("3"))
+    history = HistoryBuffer(2, [kept, new])
+    delta = HistoryDelta(appended=[new], evicted=[old])
+
+    delta.revert(history)
+    assert history == [old, kept]
+    delta.apply(history)
+    assert history == [kept, new]
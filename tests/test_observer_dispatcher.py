@@ -0,0 +1,162 @@
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.history import HistoryObserver
+from app.observer_dispatcher import BackgroundDispatcher
+
+
+class RecordingObserver(HistoryObserver):
+    def __init__(self):
+        self.seen = []
+        self.threads = set()
+
+    def update(self, calculation):
+        self.seen.append(calculation)
+        self.threads.add(threading.current_thread().name)
+
+
+class BlockingObserver(HistoryObserver):
+    """Holds the worker thread until released."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.seen = []
+
+    def update(self, calculation):
+        self.started.set()
+        self.release.wait(5)
+        self.seen.append(calculation)
+
+
+class FailingObserver(HistoryObserver):
+    def update(self, calculation):
+        raise RuntimeError("boom")
+
+
+def test_events_delivered_in_order_on_worker_thread(make_calculation):
+    observer = RecordingObserver()
+    dispatcher = BackgroundDispatcher([observer])
+    calcs = [make_calculation(i, 0) for i in range(5)]
+    dispatcher.submit(calcs[0])
+    dispatcher.submit_batch(calcs[1:])
+    dispatcher.flush()
+    assert observer.seen == calcs
+    assert observer.threads == {"observer-dispatch"}
+    dispatcher.close()
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError, match="Unknown backpressure policy"):
+        BackgroundDispatcher([], policy="spill")
+
+
+def test_drop_policy_discards_when_full(make_calculation):
+    observer = BlockingObserver()
+    dispatcher = BackgroundDispatcher([observer], maxsize=1, policy='drop')
+    dispatcher.submit(make_calculation(0, 0))
+    assert observer.started.wait(5)
+    dispatcher.submit(make_calculation(1, 0))  # fills the queue
+    dispatcher.submit(make_calculation(2, 0))  # dropped
+    assert dispatcher.dropped == 1
+    observer.release.set()
+    dispatcher.close()
+    assert [c.operand1 for c in observer.seen] == [Decimal(0), Decimal(1)]
+
+
+def test_sync_policy_delivers_inline_when_full(make_calculation):
+    blocker = BlockingObserver()
+    recorder = RecordingObserver()
+    dispatcher = BackgroundDispatcher([blocker, recorder], maxsize=1, policy='sync')
+    dispatcher.submit(make_calculation(0, 0))
+    assert blocker.started.wait(5)
+    dispatcher.submit(make_calculation(1, 0))  # fills the queue
+    blocker.release.set()  # let the inline delivery through
+    dispatcher.submit(make_calculation(2, 0))  # delivered on this thread
+    dispatcher.close()
+    assert dispatcher.dropped == 0
+    assert threading.current_thread().name in recorder.threads
+    assert len(recorder.seen) == 3
+
+
+def test_sync_policy_keeps_order_without_overlap(make_calculation):
+    class SlowObserver(HistoryObserver):
+        def __init__(self):
+            self.seen = []
+            self.active = 0
+            self.overlaps = 0
+
+        def update(self, calculation):
+            self.active += 1
+            if self.active > 1:
+                self.overlaps += 1
+            time.sleep(0.001)
+            self.seen.append(calculation.operand1)
+            self.active -= 1
+
+    observer = SlowObserver()
+    dispatcher = BackgroundDispatcher([observer], maxsize=1, policy='sync')
+    for i in range(20):
+        dispatcher.submit(make_calculation(i, 0))
+    dispatcher.close()
+    assert observer.seen == [Decimal(i) for i in range(20)]
+    assert observer.overlaps == 0
+
+
+def test_observer_errors_are_logged(caplog, make_calculation):
+    recorder = RecordingObserver()
+    dispatcher = BackgroundDispatcher([FailingObserver(), recorder])
+    dispatcher.submit(make_calculation(0, 0))
+    dispatcher.flush()
+    assert dispatcher.errors == 1
+    assert "Observer FailingObserver failed: boom" in caplog.text
+    assert len(recorder.seen) == 1
+    dispatcher.close()
+
+
+def test_flush_from_worker_thread_returns(make_calculation):
+    observers = []
+    dispatcher = BackgroundDispatcher(observers)
+
+    class FlushingObserver(HistoryObserver):
+        flushed = False
+
+        def update(self, calculation):
+            dispatcher.flush()
+            FlushingObserver.flushed = True
+
+    observers.append(FlushingObserver())
+    dispatcher.submit(make_calculation(0, 0))
+    dispatcher.flush()
+    assert FlushingObserver.flushed
+    dispatcher.close()
+
+
+def test_close_is_idempotent_and_later_events_are_synchronous(make_calculation):
+    observer = RecordingObserver()
+    dispatcher = BackgroundDispatcher([observer])
+    dispatcher.close()
+    dispatcher.close()
+    dispatcher.submit(make_calculation(0, 0))
+    assert len(observer.seen) == 1
+    assert observer.threads == {threading.current_thread().name}
+
+
+def test_callbacks_run_on_worker_in_order_and_errors_are_logged(caplog, make_calculation):
+    observer = RecordingObserver()
+    dispatcher = BackgroundDispatcher([observer])
+    ran = []
+    dispatcher.submit(make_calculation(0, 0))
+    dispatcher.submit_call(lambda: ran.append((len(observer.seen), threading.current_thread().name)))
+    dispatcher.submit_call(lambda: 1 / 0)
+    dispatcher.flush()
+    assert ran == [(1, "observer-dispatch")]
+    assert dispatcher.errors == 1
+    assert "Observer callback failed" in caplog.text
+
+    dispatcher.close()
+    dispatcher.submit_call(lambda: ran.append(threading.current_thread().name))
+    assert ran[-1] == threading.current_thread().name
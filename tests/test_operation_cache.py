@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+from app.operation_cache import OperationCache
+
+
+def test_hits_and_misses():
+    cache = OperationCache(2)
+    assert cache.get("a") is None
+    cache.put("a", Decimal(1))
+    assert cache.get("a") == Decimal(1)
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 2}
+
+
+def test_least_recently_used_is_evicted():
+    cache = OperationCache(2)
+    cache.put("a", Decimal(1))
+    cache.put("b", Decimal(2))
+    cache.get("a")
+    cache.put("c", Decimal(3))
+    assert cache.get("b") is None
+    assert cache.get("a") == Decimal(1)
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_clear_resets_counters():
+    cache = OperationCache(1)
+    cache.put("a", Decimal(1))
+    cache.get("a")
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 1}
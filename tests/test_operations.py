@@ -244,4 +244,14 @@ class TestOperationFactory:
             pass
 
         with pytest.raises(TypeError, match="Operation class must inherit"):
-            OperationFactory.register_operation("invalid", InvalidOperation)
\ No newline at end of file
+            OperationFactory.register_operation("invalid", InvalidOperation)
+
+def test_power_rejects_fractional_exponent_of_negative_base():
+    with pytest.raises(ValidationError, match="Fractional exponents"):
+        Power().execute(Decimal("-8"), Decimal("0.5"))
+
+
+def test_power_and_root_honor_precision():
+    assert Power(precision=5).execute(Decimal("2"), Decimal("0.5")) == Decimal("1.4142")
+    assert Root(precision=5).execute(Decimal("2"), Decimal("2")) == Decimal("1.4142")
+    assert OperationFactory.create_operation("root", precision=3).precision == 3
@@ -0,0 +1,66 @@
+from decimal import Decimal, localcontext
+
+import pytest
+
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError, ValidationError
+from app.operations import Division, Operation, Power
+from app.parallel import _evaluate_chunk, evaluate_parallel
+
+
+class Exploding(Operation):
+    def execute(self, a, b):
+        raise ArithmeticError("overflow")
+
+
+@pytest.fixture
+def config():
+    return CalculatorConfig(max_input_value=1000)
+
+
+def test_evaluate_chunk_reports_global_indexes(config):
+    rows = _evaluate_chunk(Power, 5, 28, config, 10, [("2", "0.5"), (3, 2)])
+    assert rows == [(Decimal(2), Decimal("0.5"), Decimal("1.4142")), (Decimal(3), Decimal(2), Decimal(9))]
+    with pytest.raises(ValidationError, match="Pair 11: Invalid number format: x"):
+        _evaluate_chunk(Power, None, 28, config, 10, [(1, 1), ("x", 1)])
+    with pytest.raises(OperationError, match="Operation failed for pair 3: overflow"):
+        _evaluate_chunk(Exploding, None, 28, config, 3, [(1, 1)])
+
+
+def test_evaluate_chunk_uses_parent_context_precision(config):
+    rows = _evaluate_chunk(Division, None, 5, config, 0, [(1, 3)])
+    assert rows[0][2] == Decimal("0.33333")
+
+
+def test_evaluate_parallel_preserves_order(config):
+    pairs = [(i, 7) for i in range(50)]
+    with localcontext() as ctx:
+        ctx.prec = 6
+        rows = evaluate_parallel(Division(), pairs, config, workers=2, chunk_size=7)
+        assert [row[2] for row in rows] == [Decimal(i) / Decimal(7) for i in range(50)]
+    assert rows[1][2] == Decimal("0.142857")
+
+
+def test_evaluate_parallel_raises_first_failure(config):
+    pairs = [(1, 1)] * 20 + [(1, 0)] + [("x", 1)] * 20
+    with pytest.raises(ValidationError, match="Pair 20: Division by zero"):
+        evaluate_parallel(Division(), pairs, config, workers=2)
+
+
+@pytest.mark.parametrize("available, expected", [
+    (['fork', 'spawn', 'forkserver'], 'forkserver'),
+    (['spawn'], 'spawn'),
+])
+def test_evaluate_parallel_never_forks_the_caller(config, monkeypatch, available, expected):
+    import multiprocessing
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: available)
+    get_context = multiprocessing.get_context
+    requested = []
+
+    def tracking_get_context(method=None):
+        requested.append(method)
+        return get_context(method)
+
+    monkeypatch.setattr(multiprocessing, "get_context", tracking_get_context)
+    assert len(evaluate_parallel(Division(), [(1, 2)] * 4, config, workers=2)) == 4
+    assert requested == [expected]
@@ -209,7 +209,7 @@ def test_redo_after_clear(mock_input, capsys):
 # -----------------------------------------------------------------------------
 
 @patch("builtins.input", side_effect=["add", "1", "2", "exit"])
-@patch("app.calculation.CalculationFactory.create", side_effect=Exception("Boom"))
+@patch("app.calculation.CalculationFactory.resolve_operation", side_effect=Exception("Boom"))
 def test_calculation_factory_failure(mock_create, mock_input, capsys):
     repl.calculator_repl()
     captured = capsys.readouterr()
@@ -259,3 +259,22 @@ def test_help_command_shows_commands(mock_input, capsys):
     repl.calculator_repl()
     captured = capsys.readouterr()
     assert "Available commands" in captured.out
+
+
+# -----------------------------------------------------------------------------
+# 🧪 Single Evaluation Per Command
+# -----------------------------------------------------------------------------
+
+@patch("builtins.input", side_effect=["power", "2", "10", "exit"])
+@patch("app.calculator.Calculator.load_history")
+def test_arithmetic_command_evaluates_once(mock_load, mock_input, capsys):
+    from app.calculation import Calculation
+    from app.operations import Power
+
+    with patch.object(Power, "execute", autospec=True, side_effect=Power.execute) as execute_spy, \
+         patch.object(Calculation, "calculate", autospec=True) as calculate_spy:
+        repl.calculator_repl()
+
+    assert execute_spy.call_count == 1
+    calculate_spy.assert_not_called()
+    assert "Result: 1024" in capsys.readouterr().out